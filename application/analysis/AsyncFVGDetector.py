@@ -1,33 +1,40 @@
 import asyncio
 import logging
-import time
-from typing import List, Set, Dict, Optional
-from collections import deque
+from typing import Any, List, Set, Dict, Optional
+
+import numpy as np
 
 from domain.ports.EventBus import EventBus
+from domain.ports.MarketDataFeed import MarketDataFeed, MarketStream
+from domain.services.BatchDetectors import detect_fvgs
+from domain.services.ColumnarRingBuffer import CandleWindow
+from domain.services.PriceTicks import TickScale, tick_scale
+from domain.services.ZoneRegistry import DEFAULT_MAX_AGE, DEFAULT_MAX_ZONES, ZoneRegistry
 from domain.entities.FairValueGap import AsyncFairValueGap, FVGData
+from application.analysis.AsyncZoneMonitor import AsyncZoneMonitor
+from application.analysis.FVGFillScorer import FVGFillScorer
 from domain.events.FVGEvent import FVGEvent
 
-# --- Placeholder Definitions ---
-
-class Candle:
-    def __init__(self, high, low, close, open, timestamp):
-        self.high = high
-        self.low = low
-        self.close = close
-        self.open = open
-        self.timestamp = timestamp
-
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# --- End of Placeholder Definitions ---
-
 
 class AsyncFVGDetector:
-    def __init__(self, event_bus: EventBus):
+    def __init__(self, event_bus: EventBus, market_data: MarketDataFeed, zone_monitor: AsyncZoneMonitor,
+                 fill_threshold: float = 0.95, fill_publish_delta: float = 0.1,
+                 max_zones: int = DEFAULT_MAX_ZONES, max_zone_age: Optional[float] = DEFAULT_MAX_AGE,
+                 fill_scorer: Optional[FVGFillScorer] = None):
+        self.fill_threshold = fill_threshold
+        self.fill_publish_delta = fill_publish_delta
+        self.max_zones = max_zones
+        self.max_zone_age = max_zone_age
         self.event_bus = event_bus
-        self.active_gaps: Dict[str, List[AsyncFairValueGap]] = {}
+        self.market_data = market_data
+        self.zone_monitor = zone_monitor
+        # symbol_timeframe별 갭 레지스트리 (채워진/만료된 갭은 아카이브로)
+        self.active_gaps: Dict[str, ZoneRegistry] = {}
+        # 모든 갭의 채움 확률을 배치로 평가하는 공용 스코어러
+        self.fill_scorer = fill_scorer or FVGFillScorer()
         self._detection_tasks: Set[asyncio.Task] = set()
 
     async def start_multi_timeframe_detection(self, symbols: List[str], timeframes: List[str]):
@@ -38,50 +45,107 @@ class AsyncFVGDetector:
                     self._detect_fvg_continuously(symbol, timeframe)
                 )
                 self._detection_tasks.add(task)
+        self._detection_tasks.add(asyncio.create_task(self.fill_scorer.run()))
+
+    def _registry(self, key: str) -> ZoneRegistry:
+        registry = self.active_gaps.get(key)
+        if registry is None:
+            registry = self.active_gaps[key] = ZoneRegistry(self.max_zones, self.max_zone_age)
+        return registry
+
+    async def _track(self, key: str, gap: AsyncFairValueGap, now: float):
+        """갭을 모니터와 레지스트리에 등록 - 상한 초과로 만료된 갭은 모니터에서 해제"""
+        registry = self._registry(key)
+        await self.zone_monitor.register(gap.symbol, gap, registry.close)
+        self.fill_scorer.mark(gap)
+        expired = registry.add(gap, now)
+        for zone in expired:
+            self.zone_monitor.unregister(zone.symbol, zone)
+        self.fill_scorer.forget({zone.entity_id for zone in expired})
+
+    async def seed_history(self, symbol: str, timeframe: str, candles: CandleWindow):
+        """
+        백필 캔들에서 배치로 FVG를 찾아 이후 캔들로 아직 채워지지 않은 갭만 등록
+        (과거 갭의 이벤트는 발행하지 않음, 복원된 갭은 유지)
+        """
+        scale = tick_scale(symbol)
+        key = f"{symbol}_{timeframe}"
+        registry = self._registry(key)
+
+        def find_open_gaps():
+            gaps = detect_fvgs(candles.high, candles.low, candles.timestamp / 1000, scale)
+            high_ticks = np.rint(candles.high / scale.tick_size).astype(np.int64)
+            low_ticks = np.rint(candles.low / scale.tick_size).astype(np.int64)
+            open_gaps = []
+            for row in gaps.tolist():
+                index, _, gap_high, gap_low, timestamp = row
+                gap = AsyncFairValueGap(FVGData(gap_high, gap_low, timestamp), self.event_bus, symbol, timeframe,
+                                        self.fill_threshold, self.fill_publish_delta, self.fill_scorer)
+                # 이후 캔들 범위가 채움 임계 가격과 갭 상단 사이를 지났으면 이미 채워진 갭
+                fill_ticks = gap.gap_low_ticks + gap.gap_size_ticks * self.fill_threshold
+                later = slice(index + 1, None)
+                filled = np.any((high_ticks[later] >= fill_ticks) & (low_ticks[later] <= gap.gap_high_ticks))
+                if not filled and gap.entity_id not in registry:
+                    open_gaps.append(gap)
+            return open_gaps
+
+        for gap in await asyncio.get_running_loop().run_in_executor(None, find_open_gaps):
+            await self._track(key, gap, gap.creation_time)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Active gaps per symbol_timeframe as detached records (StateSnapshotter provider)."""
+        return {key: [gap.__getstate__() for gap in gaps if gap.is_active] for key, gaps in self.active_gaps.items()}
+
+    async def restore_state(self, sections: Dict[str, Any]):
+        """스냅샷의 갭을 복원하고 존 모니터에 다시 등록"""
+        for key, states in sections.items():
+            for state in states:
+                gap = AsyncFairValueGap.from_state(state, self.event_bus, self.fill_scorer)
+                await self._track(key, gap, gap.creation_time)
 
     async def _get_candle_stream(self, symbol: str, timeframe: str):
-        # Placeholder for a real-time candle data stream
-        while True:
-            await asyncio.sleep(1) # Simulate receiving a new candle every second
-            yield Candle(high=105, low=95, close=102, open=98, timestamp=time.time())
-
-    async def _detect_three_candle_fvg(self, last_three_candles: List[Candle]) -> Optional[FVGData]:
-        """3-캔들 패턴에서 FVG 탐지"""
-        if len(last_three_candles) < 3:
+        # Shared per-symbol feed; only closed candles are relevant for FVG detection
+        async for candle in self.market_data.stream(symbol, MarketStream.kline(timeframe)):
+            if candle.is_closed:
+                yield candle
+
+    async def _detect_three_candle_fvg(self, candles: CandleWindow, scale: TickScale) -> Optional[FVGData]:
+        """3-캔들 패턴에서 FVG 탐지 (틱 단위 비교 - 한 틱 미만의 갭은 무시)"""
+        if len(candles) < 3:
             return None
 
-        first_candle, _, third_candle = last_three_candles
+        first_high, third_high = scale.to_ticks(float(candles.high[-3])), scale.to_ticks(float(candles.high[-1]))
+        first_low, third_low = scale.to_ticks(float(candles.low[-3])), scale.to_ticks(float(candles.low[-1]))
+        third_timestamp = int(candles.timestamp[-1]) / 1000
 
         # Bullish FVG: first candle's high is lower than third candle's low
-        if first_candle.high < third_candle.low:
+        if first_high < third_low:
             logger.info("Bullish FVG detected.")
-            return FVGData(high=third_candle.low, low=first_candle.high, timestamp=third_candle.timestamp)
+            return FVGData(high=scale.to_price(third_low), low=scale.to_price(first_high), timestamp=third_timestamp)
 
         # Bearish FVG: first candle's low is higher than third candle's high
-        if first_candle.low > third_candle.high:
+        if first_low > third_high:
             logger.info("Bearish FVG detected.")
-            return FVGData(high=first_candle.low, low=third_candle.high, timestamp=third_candle.timestamp)
+            return FVGData(high=scale.to_price(first_low), low=scale.to_price(third_high), timestamp=third_timestamp)
 
         return None
 
     async def _detect_fvg_continuously(self, symbol: str, timeframe: str):
         """지속적인 FVG 탐지"""
-        candle_buffer = deque(maxlen=3)
+        history = self.market_data.candle_history(symbol, timeframe)
+        scale = tick_scale(symbol)
+        key = f"{symbol}_{timeframe}"
 
         async for candle in self._get_candle_stream(symbol, timeframe):
-            candle_buffer.append(candle)
+            candles = history.window(3, until=candle.sequence)
 
-            if len(candle_buffer) == 3:
-                fvg_data = await self._detect_three_candle_fvg(list(candle_buffer))
+            if len(candles) == 3:
+                fvg_data = await self._detect_three_candle_fvg(candles, scale)
 
                 if fvg_data:
-                    gap = AsyncFairValueGap(fvg_data, self.event_bus)
-                    await gap.start_monitoring()
-
-                    key = f"{symbol}_{timeframe}"
-                    if key not in self.active_gaps:
-                        self.active_gaps[key] = []
-                    self.active_gaps[key].append(gap)
+                    gap = AsyncFairValueGap(fvg_data, self.event_bus, symbol, timeframe,
+                                            self.fill_threshold, self.fill_publish_delta, self.fill_scorer)
+                    await self._track(key, gap, gap.creation_time)
 
                     await self.event_bus.publish(FVGEvent(
                         event_type="NEW_FVG_DETECTED",
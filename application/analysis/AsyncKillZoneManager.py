@@ -1,9 +1,10 @@
 import asyncio
 import logging
 import datetime
-from typing import Dict, Set, Any
+from typing import Dict, Set, Any, Optional
 import pytz # Dependency to be added to requirements.txt
 
+from domain.ports.Clock import Clock, SystemClock
 from domain.ports.EventBus import EventBus
 from domain.events.KillZoneEvent import KillZoneEvent
 from domain.events.MacroTimeEvent import MacroTimeEvent
@@ -23,8 +24,9 @@ logging.basicConfig(level=logging.INFO)
 
 
 class AsyncKillZoneManager:
-    def __init__(self, event_bus: EventBus):
+    def __init__(self, event_bus: EventBus, clock: Optional[Clock] = None):
         self.event_bus = event_bus
+        self.clock = clock or SystemClock()
         self.kill_zones = {
             "LONDON": {"start": "17:00", "end": "20:00", "timezone": "Asia/Seoul"},
             "NEW_YORK": {"start": "22:30", "end": "01:30", "timezone": "Asia/Seoul"}
@@ -64,7 +66,7 @@ class AsyncKillZoneManager:
         tz = pytz.timezone(zone_config["timezone"])
         while True:
             try:
-                current_time = datetime.datetime.now(tz)
+                current_time = self.clock.now(tz)
                 zone_state = await self._calculate_zone_state(zone_name, current_time)
 
                 # Zone 상태 변화 감지
@@ -103,17 +105,19 @@ class AsyncKillZoneManager:
         """Macro Time 20분 사이클 모니터링"""
         while True:
             try:
-                current_time = datetime.datetime.now()
+                current_time = self.clock.now()
                 macro_cycle_position = await self._calculate_macro_cycle_position(current_time)
 
                 # 20분 사이클 내에서의 위치와 예상 행동 패턴 분석
                 cycle_analysis = await self._analyze_macro_cycle_behavior(macro_cycle_position)
 
+                # 최신 사이클 상태만 의미 있으므로 대기 중인 이전 업데이트를 대체
                 await self.event_bus.publish(MacroTimeEvent(
                     event_type="MACRO_CYCLE_UPDATE",
                     cycle_position=macro_cycle_position,
-                    analysis=cycle_analysis
-                ))
+                    analysis=cycle_analysis,
+                    timestamp=current_time
+                ), coalesce_key="macro_cycle")
 
                 await asyncio.sleep(60)  # 1분마다 갱신
 
@@ -1,121 +1,177 @@
 import asyncio
 import logging
-from typing import List, Set, Dict
-from collections import deque
+from typing import Any, List, Set, Dict, Optional, Tuple
+
+import numpy as np
 
 from domain.ports.EventBus import EventBus
+from domain.ports.MarketDataFeed import MarketDataFeed, MarketStream
+from domain.ports.OrderBook import OrderBookSource
+from domain.entities.EntityId import make_entity_id
 from domain.entities.LiquidityPool import AsyncLiquidityPool, LiquidityType
+from domain.services.SwingPointDetector import SwingPointDetector, SwingType
+from domain.services.EqualLevelIndex import EqualLevelIndex
+from domain.services.ColumnarRingBuffer import CandleWindow
+from domain.services.PriceTicks import tick_scale
+from domain.services.ZoneRegistry import DEFAULT_MAX_AGE, DEFAULT_MAX_ZONES, ZoneRegistry
 from domain.events.LiquidityEvent import LiquidityEvent
+from application.analysis.AsyncZoneMonitor import AsyncZoneMonitor
+from application.analysis.CrossSymbolCorrelation import ClosedBarObserver, CrossSymbolCorrelation
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 class AsyncLiquidityDetector:
-    def __init__(self, event_bus: EventBus, tolerance_percent: float = 0.1):
+    def __init__(self, event_bus: EventBus, market_data: MarketDataFeed, zone_monitor: AsyncZoneMonitor,
+                 tolerance_percent: float = 0.1, swing_strength: int = 2, max_levels: int = 20000,
+                 max_zones: int = DEFAULT_MAX_ZONES, max_zone_age: Optional[float] = DEFAULT_MAX_AGE,
+                 order_books: Optional[OrderBookSource] = None,
+                 correlation: Optional[ClosedBarObserver] = None):
         self.tolerance = tolerance_percent
+        self.swing_strength = swing_strength
+        self.max_levels = max_levels
+        self.max_zones = max_zones
+        self.max_zone_age = max_zone_age
         self.event_bus = event_bus
-        self.active_pools: Dict[str, List[AsyncLiquidityPool]] = {}
+        self.market_data = market_data
+        self.zone_monitor = zone_monitor
+        # 심볼별 공유 로컬 오더북 - 풀이 접근 시 호가 잔량을 조회
+        self.order_books = order_books
+        # 심볼 간 수익률/유동성 근접도 롤링 상관관계 (막대마다 증분 갱신)
+        self.correlation = correlation or CrossSymbolCorrelation(event_bus)
+        # 심볼별 풀 레지스트리 - 풀 id가 (틱 레벨, 종류)에서 결정되므로 중복 확인은 O(1) 조회
+        self.active_pools: Dict[str, ZoneRegistry] = {}
+        # 심볼별 스윙 탐지기와 Equal Highs/Lows 인덱스 (스냅샷 대상)
+        self._levels: Dict[str, Tuple[SwingPointDetector, EqualLevelIndex, EqualLevelIndex]] = {}
         self._detection_tasks: Set[asyncio.Task] = set()
 
-    async def start_multi_symbol_detection(self, symbols: List[str]):
+    async def start_multi_symbol_detection(self, symbols: List[str], timeframe: str = "1m"):
         """다중 심볼 유동성 탐지 시작"""
         for symbol in symbols:
-            task = asyncio.create_task(self._detect_liquidity_continuously(symbol))
+            task = asyncio.create_task(self._detect_liquidity_continuously(symbol, timeframe))
             self._detection_tasks.add(task)
 
-        # 심볼 간 유동성 상관관계 분석 태스크 (as per prompt)
-        if "BTCUSDT" in symbols and "ETHUSDT" in symbols:
-             correlation_task = asyncio.create_task(self._analyze_cross_symbol_liquidity())
-             self._detection_tasks.add(correlation_task)
-
-    async def _get_price_stream(self, symbol: str):
-        # Placeholder for a real-time price update stream
-        price = 100.0
-        while True:
-            # Simulate some price movement
-            price += 0.1 * (-1 if asyncio.get_event_loop().time() % 2 > 1 else 1)
-            yield {'price': price, 'timestamp': asyncio.get_event_loop().time()}
-            await asyncio.sleep(0.1)
-
-    async def _find_equal_highs_async(self, price_history: List[dict]) -> List[float]:
-        # Placeholder for complex logic to find equal highs
-        # This would typically involve looking for multiple tops at similar price levels
-        if len(price_history) > 20 and price_history[-1]['price'] > 105:
-             return [105.0]
-        return []
-
-    async def _find_equal_lows_async(self, price_history: List[dict]) -> List[float]:
-        # Placeholder for complex logic to find equal lows
-        if len(price_history) > 20 and price_history[-1]['price'] < 95:
-            return [95.0]
-        return []
-
-    def _pool_exists(self, symbol: str, price_level: float, pool_type: LiquidityType) -> bool:
-        if key := self.active_pools.get(symbol):
-            for pool in key:
-                if pool.price_level == price_level and pool.pool_type == pool_type and not pool.is_swept:
-                    return True
-        return False
+        # 심볼 간 상관관계는 각 심볼의 마감 캔들로 갱신
+        if len(symbols) > 1:
+            self.correlation.track(symbols)
+
+    def _level_state(self, symbol: str) -> Tuple[SwingPointDetector, EqualLevelIndex, EqualLevelIndex]:
+        state = self._levels.get(symbol)
+        if state is None:
+            state = self._levels[symbol] = (
+                SwingPointDetector(self.swing_strength),
+                EqualLevelIndex(self.tolerance, self.max_levels, use_high=True),
+                EqualLevelIndex(self.tolerance, self.max_levels, use_high=False),
+            )
+        return state
+
+    async def seed_history(self, symbol: str, candles: CandleWindow):
+        """
+        백필 캔들로 스윙/Equal 레벨 인덱스를 채움. 과거에 완성된 레벨은 풀로
+        만들지 않음 (이후 가격으로 이미 스윕되었을 수 있음)
+        """
+        swings, equal_highs, equal_lows = self._level_state(symbol)
+        pending = swings.state()[1]
+        last = pending[-1][2] if pending else None
+        rows = zip(candles.high.tolist(), candles.low.tolist(), (candles.timestamp / 1000).tolist())
+
+        def apply():
+            for high, low, timestamp in rows:
+                if last is not None and timestamp <= last:
+                    continue
+                for swing in swings.update(high, low, timestamp):
+                    index = equal_highs if swing.kind == SwingType.HIGH else equal_lows
+                    index.add(swing.price, swing.timestamp)
+
+        await asyncio.get_running_loop().run_in_executor(None, apply)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Active pools and swing/equal-level state per symbol (StateSnapshotter provider)."""
+        sections = {}
+        for symbol, pools in self.active_pools.items():
+            sections[f"{symbol}/pools"] = [pool.__getstate__() for pool in pools if pool.is_active]
+        for symbol, (swings, equal_highs, equal_lows) in self._levels.items():
+            sections[f"{symbol}/levels"] = (swings.state(), equal_highs.state(), equal_lows.state())
+        return sections
+
+    async def restore_state(self, sections: Dict[str, Any]):
+        """스냅샷의 풀과 레벨 인덱스를 복원하고 풀을 존 모니터에 다시 등록"""
+        for name, state in sections.items():
+            symbol, kind = name.rsplit("/", 1)
+            if kind == "levels":
+                swings, highs, lows = state
+                self._levels[symbol] = (
+                    SwingPointDetector.from_state(self.swing_strength, swings),
+                    EqualLevelIndex.from_state(highs, self.tolerance, self.max_levels, use_high=True),
+                    EqualLevelIndex.from_state(lows, self.tolerance, self.max_levels, use_high=False),
+                )
+            elif kind == "pools":
+                for pool_state in state:
+                    pool = AsyncLiquidityPool.from_state(pool_state, self.event_bus, self.order_books)
+                    await self._track(pool, pool.creation_time)
+
+    async def _get_candle_stream(self, symbol: str, timeframe: str):
+        # Shared per-symbol feed; swings are only confirmed on closed candles
+        async for candle in self.market_data.stream(symbol, MarketStream.kline(timeframe)):
+            if candle.is_closed:
+                yield candle
+
+    def _registry(self, symbol: str) -> ZoneRegistry:
+        registry = self.active_pools.get(symbol)
+        if registry is None:
+            registry = self.active_pools[symbol] = ZoneRegistry(self.max_zones, self.max_zone_age)
+        return registry
+
+    def _pool_exists(self, symbol: str, level_ticks: int, pool_type: LiquidityType) -> bool:
+        registry = self.active_pools.get(symbol)
+        pool = registry.get(make_entity_id("POOL", symbol, pool_type, level_ticks)) if registry else None
+        return pool is not None and pool.is_active
+
+    async def _track(self, pool: AsyncLiquidityPool, now: float):
+        """풀을 모니터와 레지스트리에 등록 - 상한 초과로 만료된 풀은 모니터에서 해제"""
+        registry = self._registry(pool.symbol)
+        await self.zone_monitor.register(pool.symbol, pool, registry.close)
+        for expired in registry.add(pool, now):
+            self.zone_monitor.unregister(expired.symbol, expired)
 
     async def _add_pool(self, symbol: str, pool: AsyncLiquidityPool):
-        if symbol not in self.active_pools:
-            self.active_pools[symbol] = []
-        self.active_pools[symbol].append(pool)
+        await self._track(pool, pool.creation_time)
         logger.info(f"New liquidity pool added for {symbol} at {pool.price_level} ({pool.pool_type})")
-        await self.event_bus.publish(LiquidityEvent(event_type="NEW_POOL_DETECTED", pool=pool))
-
-
-    async def _detect_liquidity_continuously(self, symbol: str):
-        """지속적인 유동성 탐지"""
-        price_history = deque(maxlen=200)  # 최근 200개 가격 포인트
-
-        async for price_update in self._get_price_stream(symbol):
-            price_history.append(price_update)
-
-            if len(price_history) >= 50:  # 최소 50개 데이터 점이 있을 때
-                # 비동기로 Equal Highs/Lows 탐지
-                equal_highs = await self._find_equal_highs_async(list(price_history))
-                equal_lows = await self._find_equal_lows_async(list(price_history))
-
-                # 새로운 유동성 풀 생성 및 모니터링 시작
-                for high_level in equal_highs:
-                    if not self._pool_exists(symbol, high_level, LiquidityType.BSL):
-                        pool = AsyncLiquidityPool(high_level, LiquidityType.BSL, self.event_bus)
-                        await pool.start_monitoring()
-                        await self._add_pool(symbol, pool)
-
-                for low_level in equal_lows:
-                    if not self._pool_exists(symbol, low_level, LiquidityType.SSL):
-                        pool = AsyncLiquidityPool(low_level, LiquidityType.SSL, self.event_bus)
-                        await pool.start_monitoring()
-                        await self._add_pool(symbol, pool)
-
-    async def _calculate_liquidity_correlation(self, btc_pools, eth_pools) -> dict:
-        # Placeholder for correlation logic
-        await asyncio.sleep(10) # Simulate complex calculation
-        return {'correlation_strength': 0.8, 'details': '...'}
-
-
-    async def _analyze_cross_symbol_liquidity(self):
-        """심볼 간 유동성 상관관계 분석"""
-        while True:
-            try:
-                btc_pools = self.active_pools.get("BTCUSDT", [])
-                eth_pools = self.active_pools.get("ETHUSDT", [])
-
-                if btc_pools and eth_pools:
-                    # BTC와 ETH 유동성 레벨 간 상관관계 분석
-                    correlation_data = await self._calculate_liquidity_correlation(btc_pools, eth_pools)
-
-                    if correlation_data.get('correlation_strength', 0) > 0.7:
-                        await self.event_bus.publish(LiquidityEvent(
-                            event_type="HIGH_CORRELATION_DETECTED",
-                            correlation_data=correlation_data
-                        ))
-                        logger.info("High liquidity correlation detected between BTC and ETH.")
-
-                await asyncio.sleep(60)  # 1분마다 상관관계 분석
-
-            except Exception as e:
-                logger.error(f"Cross-symbol liquidity analysis error: {e}")
-                await asyncio.sleep(30)
+        await self.event_bus.publish(LiquidityEvent(event_type="NEW_POOL_DETECTED", pool=pool, symbol=symbol))
+
+
+    async def _detect_liquidity_continuously(self, symbol: str, timeframe: str):
+        """
+        지속적인 유동성 탐지 - 캔들 마감 시 스윙 확정, 허용오차 버킷에 해싱하여
+        두 번째 터치에서 Equal Highs(BSL)/Equal Lows(SSL) 풀 생성
+        """
+        scale = tick_scale(symbol)
+        async for candle in self._get_candle_stream(symbol, timeframe):
+            # 복원된 상태가 있으면 이어서 사용
+            swings, equal_highs, equal_lows = self._level_state(symbol)
+            for swing in swings.update(candle.high, candle.low, candle.timestamp):
+                if swing.kind == SwingType.HIGH:
+                    level, pool_type = equal_highs.add(swing.price, swing.timestamp), LiquidityType.BSL
+                else:
+                    level, pool_type = equal_lows.add(swing.price, swing.timestamp), LiquidityType.SSL
+
+                # 새로운 유동성 풀 생성 및 모니터링 시작 (스윕된 레벨은 다음 터치에서 다시 풀이 됨)
+                if level is not None and not self._pool_exists(symbol, scale.to_ticks(level.price), pool_type):
+                    pool = AsyncLiquidityPool(level.price, pool_type, self.event_bus, symbol, candle.timestamp,
+                                              self.order_books)
+                    await self._add_pool(symbol, pool)
+
+            await self.correlation.observe(symbol, candle.timestamp, candle.close,
+                                           self._pool_distance(symbol, candle.close))
+
+    def _pool_distance(self, symbol: str, price: float) -> Optional[float]:
+        """Distance from price to the nearest active pool level, in percent; None without pools."""
+        registry = self.active_pools.get(symbol)
+        if not registry or price <= 0:
+            return None
+        levels = np.fromiter((pool.level_ticks for pool in registry if pool.is_active), dtype=np.int64)
+        if not len(levels):
+            return None
+        scale = tick_scale(symbol)
+        nearest = int(np.abs(levels - scale.to_ticks(price)).min())
+        return nearest * scale.tick_size / price * 100
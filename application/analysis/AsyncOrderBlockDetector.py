@@ -1,20 +1,33 @@
 import asyncio
 import logging
-import time
-from typing import List, Set, Dict
-from collections import deque
+from typing import Any, List, Set, Dict, Optional
+
+import numpy as np
 
 from domain.ports.EventBus import EventBus
-from domain.entities.OrderBlock import AsyncOrderBlock, Candle, OrderBlockType
+from domain.ports.MarketDataFeed import MarketDataFeed, MarketStream
+from domain.services.BatchDetectors import detect_order_blocks
+from domain.services.ColumnarRingBuffer import CandleWindow
+from domain.services.ZoneRegistry import DEFAULT_MAX_AGE, DEFAULT_MAX_ZONES, ZoneRegistry
+from domain.entities.OrderBlock import AsyncOrderBlock, OrderBlockType
 from domain.events.OrderBlockEvent import OrderBlockEvent
+from application.analysis.AsyncZoneMonitor import AsyncZoneMonitor
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 class AsyncOrderBlockDetector:
-    def __init__(self, event_bus: EventBus):
+    def __init__(self, event_bus: EventBus, market_data: MarketDataFeed, zone_monitor: AsyncZoneMonitor,
+                 validity_delta: float = 0.1,
+                 max_zones: int = DEFAULT_MAX_ZONES, max_zone_age: Optional[float] = DEFAULT_MAX_AGE):
+        self.validity_delta = validity_delta
+        self.max_zones = max_zones
+        self.max_zone_age = max_zone_age
         self.event_bus = event_bus
-        self.active_blocks: Dict[str, List[AsyncOrderBlock]] = {}
+        self.market_data = market_data
+        self.zone_monitor = zone_monitor
+        # symbol_timeframe별 블록 레지스트리 (무효화/만료된 블록은 아카이브로)
+        self.active_blocks: Dict[str, ZoneRegistry] = {}
         self._detection_tasks: Set[asyncio.Task] = set()
 
     async def start_continuous_detection(self, symbols: List[str], timeframes: List[str]):
@@ -26,22 +39,64 @@ class AsyncOrderBlockDetector:
                 )
                 self._detection_tasks.add(task)
 
+    def _registry(self, key: str) -> ZoneRegistry:
+        registry = self.active_blocks.get(key)
+        if registry is None:
+            registry = self.active_blocks[key] = ZoneRegistry(self.max_zones, self.max_zone_age)
+        return registry
+
+    async def _track(self, key: str, block: AsyncOrderBlock, now: float):
+        """블록을 모니터와 레지스트리에 등록 - 상한 초과로 만료된 블록은 모니터에서 해제"""
+        registry = self._registry(key)
+        await self.zone_monitor.register(block.symbol, block, registry.close)
+        for expired in registry.add(block, now):
+            self.zone_monitor.unregister(expired.symbol, expired)
+
+    async def seed_history(self, symbol: str, timeframe: str, candles: CandleWindow):
+        """
+        백필 캔들에서 배치로 Order Block을 찾아 이후 캔들에 관통되지 않은 블록만 등록
+        (과거 블록의 이벤트는 발행하지 않음, 복원된 블록은 유지)
+        """
+        key = f"{symbol}_{timeframe}"
+        registry = self._registry(key)
+        blocks = detect_order_blocks(candles.high, candles.low, candles.timestamp)
+        # 각 캔들 이후의 최저가 (배치 탐지기의 블록은 모두 강세 - 하단 아래로 관통되면 무효)
+        later_low = np.minimum.accumulate(candles.low[::-1])[::-1]
+        for index in blocks['index'].tolist():
+            block = AsyncOrderBlock(candles.candle(index), OrderBlockType.BULLISH, self.event_bus, symbol, timeframe,
+                                    self.validity_delta)
+            broken = index + 1 < len(candles) and block.is_broken_by(block.scale.to_ticks(float(later_low[index + 1])))
+            if block.entity_id not in registry and not broken:
+                await self._track(key, block, block.creation_time)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Active blocks per symbol_timeframe as detached records (StateSnapshotter provider)."""
+        return {key: [block.__getstate__() for block in blocks if block.is_active]
+                for key, blocks in self.active_blocks.items()}
+
+    async def restore_state(self, sections: Dict[str, Any]):
+        """스냅샷의 Order Block을 복원하고 존 모니터에 다시 등록"""
+        for key, states in sections.items():
+            for state in states:
+                block = AsyncOrderBlock.from_state(state, self.event_bus)
+                await self._track(key, block, block.creation_time)
+
     async def _get_candle_stream(self, symbol: str, timeframe: str):
-        # Placeholder for a real-time candle data stream
-        # This would typically connect to a WebSocket feed
-        while True:
-            await asyncio.sleep(1) # Simulate receiving a new candle every second
-            yield Candle(high=105, low=95, timestamp=time.time())
+        # Shared per-symbol feed; order blocks are only evaluated on closed candles
+        async for candle in self.market_data.stream(symbol, MarketStream.kline(timeframe)):
+            if candle.is_closed:
+                yield candle
 
-    async def _detect_new_order_blocks(self, candle_buffer: List[Candle]) -> List[AsyncOrderBlock]:
+    async def _detect_new_order_blocks(self, symbol: str, timeframe: str, candles: CandleWindow) -> List[AsyncOrderBlock]:
         # Placeholder for the actual detection logic
         # This would analyze the candle patterns to find order blocks
         new_blocks = []
         # Simulate finding a new block occasionally
-        if len(candle_buffer) > 5 and len(candle_buffer) % 10 == 0:
-            new_candle = candle_buffer[-1]
+        if len(candles) > 5 and len(candles) % 10 == 0:
+            new_candle = candles.candle(-1)
             # Create a dummy block for demonstration
-            block = AsyncOrderBlock(new_candle, OrderBlockType.BULLISH, self.event_bus)
+            block = AsyncOrderBlock(new_candle, OrderBlockType.BULLISH, self.event_bus, symbol, timeframe,
+                                    self.validity_delta)
             new_blocks.append(block)
             logger.info(f"New Order Block detected at {new_candle.high}")
         return new_blocks
@@ -49,24 +104,23 @@ class AsyncOrderBlockDetector:
 
     async def _detect_order_blocks_continuously(self, symbol: str, timeframe: str):
         """지속적인 Order Block 탐지"""
-        candle_buffer = deque(maxlen=100)
+        history = self.market_data.candle_history(symbol, timeframe)
 
         async for candle in self._get_candle_stream(symbol, timeframe):
-            candle_buffer.append(candle)
+            # 공유 링 버퍼에서 현재 캔들까지의 최근 100개 (복사 없음)
+            candles = history.window(100, until=candle.sequence)
 
             # 비동기로 Order Block 탐지
-            new_blocks = await self._detect_new_order_blocks(list(candle_buffer))
+            new_blocks = await self._detect_new_order_blocks(symbol, timeframe, candles)
 
             for block in new_blocks:
-                await block.start_monitoring()
-                key = f"{symbol}_{timeframe}"
-                if key not in self.active_blocks:
-                    self.active_blocks[key] = []
-                self.active_blocks[key].append(block)
+                await self._track(f"{symbol}_{timeframe}", block, block.creation_time)
 
                 # 새로운 Order Block 이벤트 발행
                 await self.event_bus.publish(OrderBlockEvent(
                     event_type="NEW_ORDER_BLOCK",
                     order_block=block,
-                    data={'symbol': symbol, 'timeframe': timeframe}
+                    data={'symbol': symbol, 'timeframe': timeframe},
+                    symbol=symbol,
+                    timeframe=timeframe
                 ))
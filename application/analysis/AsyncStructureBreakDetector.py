@@ -1,23 +1,30 @@
 import asyncio
-from typing import Dict
+from typing import Any, Dict, List, Optional
 
 from domain.ports.EventBus import EventBus
+from domain.ports.MarketDataFeed import CandleHistorySource, MarketDataFeed
 from domain.entities.MarketStructure import AsyncMarketStructure
+from domain.services.ColumnarRingBuffer import CandleWindow
 
 class AsyncStructureBreakDetector:
-    def __init__(self, event_bus: EventBus): # Depends on the interface
+    def __init__(self, event_bus: EventBus, market_data: MarketDataFeed,
+                 gap_source: Optional[CandleHistorySource] = None): # Depends on the interface
         self.event_bus = event_bus
-        self.timeframe_structures: Dict[str, AsyncMarketStructure] = {}
+        # gap_source를 주면 캔들 스트림 공백을 과거 봉으로 채움
+        self.market_structure = AsyncMarketStructure(event_bus, market_data, gap_source=gap_source)
 
-    async def start_multi_timeframe_detection(self):
+    async def seed_history(self, symbol: str, timeframe: str, candles: CandleWindow):
+        await self.market_structure.seed_history(symbol, timeframe, candles)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        return self.market_structure.snapshot_state()
+
+    async def restore_state(self, sections: Dict[str, Any]):
+        await self.market_structure.restore_state(sections)
+
+    async def start_multi_timeframe_detection(self, symbols: List[str], timeframes: List[str]):
         """멀티 타임프레임 구조 탐지 시작"""
-        # This is a placeholder implementation.
-        # In a real system, this detector would subscribe to candle events
-        # and use the AsyncMarketStructure entity to perform analysis.
-        # For now, we'll just log that it's running.
-        print("AsyncStructureBreakDetector started.")
-        # The logic from the prompt was flawed because the detector
-        # shouldn't be starting the entity's real-time analysis directly.
-        # The orchestrator should do that.
-        # This class should receive data and use the entity for calculations.
-        await asyncio.sleep(3600) # Sleep for a long time
+        # The entity keeps one streaming structure engine per symbol/timeframe
+        # and publishes BOS_DETECTED / CHOCH_DETECTED as candles close.
+        await self.market_structure.start_real_time_analysis(symbols, timeframes)
+        await self.market_structure.wait_for_analysis()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from domain.ports.MarketDataFeed import MarketDataFeed, MarketStream
+from domain.services.PriceTicks import convert_ticks, scale_for, tick_scale
+from domain.services.ZoneTriggerIndex import ZoneTriggerIndex
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+class AsyncZoneMonitor:
+    """
+    Drives every Order Block, FVG and Liquidity Pool of a symbol from one price
+    stream. Zones are passive records; on each price update only the zones whose
+    trigger levels were crossed get their `on_price_update` called.
+
+    Trade prices are converted to the symbol's integer ticks on arrival; the
+    trigger index, the zones and the last prices only ever see ticks.
+
+    A zone registered with `on_close` gets it called once, with the zone,
+    when an update ends it (filled, swept, invalidated), so its owner can
+    retire it without scanning.
+    """
+
+    def __init__(self, market_data: MarketDataFeed):
+        self.market_data = market_data
+        self._indexes: Dict[str, ZoneTriggerIndex] = {}
+        self._last_prices: Dict[str, int] = {}
+        self._monitoring_tasks: Dict[str, asyncio.Task] = {}
+        self._on_close: Dict[int, Callable[[Any], None]] = {}
+
+    async def register(self, symbol: str, zone: Any, on_close: Optional[Callable[[Any], None]] = None):
+        """존 등록 - 심볼별 가격 스트림은 첫 등록 시 시작"""
+        index = self._indexes.setdefault(symbol, ZoneTriggerIndex())
+        index.add(zone)
+        if on_close is not None:
+            self._on_close[id(zone)] = on_close
+
+        if symbol not in self._monitoring_tasks:
+            self._monitoring_tasks[symbol] = asyncio.create_task(self._monitor_symbol(symbol))
+
+        # 이미 가격이 존 경계를 넘어선 상태일 수 있으므로 즉시 평가
+        last_price = self._last_prices.get(symbol)
+        if last_price is not None:
+            await self._evaluate(index, zone, last_price)
+
+    def unregister(self, symbol: str, zone: Any):
+        index = self._indexes.get(symbol)
+        if index is not None:
+            index.remove(zone)
+        self._on_close.pop(id(zone), None)
+
+    def zone_count(self, symbol: str) -> int:
+        index = self._indexes.get(symbol)
+        return len(index) if index is not None else 0
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Last traded price per symbol, as (ticks, tick size) (StateSnapshotter provider)."""
+        return {symbol: (price, tick_scale(symbol).tick_size) for symbol, price in self._last_prices.items()}
+
+    async def restore_state(self, sections: Dict[str, Any]):
+        # 다음 체결가와의 사이에서 교차한 존이 평가되도록 마지막 가격 복원 (틱 크기가 바뀌었으면 변환)
+        for symbol, price in sections.items():
+            current = tick_scale(symbol)
+            ticks, tick_size = price if isinstance(price, tuple) else (price, current.tick_size)
+            self._last_prices.setdefault(symbol, convert_ticks(ticks, scale_for(tick_size), current))
+
+    async def _evaluate(self, index: ZoneTriggerIndex, zone: Any, price_ticks: int):
+        try:
+            await zone.on_price_update(price_ticks)
+        except Exception as e:
+            logger.error(f"Zone update error for {type(zone).__name__}: {e}")
+        if not zone.is_active:
+            index.remove(zone)
+            on_close = self._on_close.pop(id(zone), None)
+            if on_close is not None:
+                on_close(zone)
+
+    async def on_price(self, symbol: str, price: float):
+        """가격 업데이트 - 틱으로 변환 후 경계를 교차한 존만 상태 전이"""
+        price_ticks = tick_scale(symbol).to_ticks(price)
+        previous = self._last_prices.get(symbol)
+        self._last_prices[symbol] = price_ticks
+        index = self._indexes.get(symbol)
+        if previous is None or index is None:
+            return
+
+        for zone in index.crossed(previous, price_ticks):
+            await self._evaluate(index, zone, price_ticks)
+
+    async def _monitor_symbol(self, symbol: str):
+        """심볼별 단일 가격 모니터링 태스크"""
+        while True:
+            try:
+                async for tick in self.market_data.stream(symbol, MarketStream.TRADE):
+                    await self.on_price(symbol, tick.price)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Zone monitoring error for {symbol}: {e}")
+                await asyncio.sleep(1)
+
+    async def stop(self):
+        tasks = list(self._monitoring_tasks.values())
+        self._monitoring_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,142 @@
+import bisect
+import logging
+import math
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.ports.EventBus import EventBus
+from domain.events.LiquidityEvent import LiquidityEvent
+from domain.services.RollingCorrelation import CorrelationRegime, CorrelationRegimeTracker, RollingCorrelation
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+REGIME_NAMES = {CorrelationRegime.INVERSE: "INVERSE", CorrelationRegime.NEUTRAL: "NEUTRAL",
+                CorrelationRegime.HIGH: "HIGH"}
+
+
+class CorrelationMode:
+    # Log return of the close over the previous bar
+    RETURNS = "returns"
+    # Distance of the close to the symbol's nearest active liquidity pool, in percent
+    PROXIMITY = "proximity"
+    ALL = (RETURNS, PROXIMITY)
+
+
+class ClosedBarObserver(ABC):
+    """Receives every tracked symbol's closed bars from the liquidity detector."""
+
+    @abstractmethod
+    def track(self, symbols: Sequence[str]):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def observe(self, symbol: str, timestamp: float, close: float, proximity: Optional[float]):
+        """A closed bar and its close's distance to the nearest liquidity pool, in percent (None without pools)."""
+        raise NotImplementedError
+
+
+class CrossSymbolCorrelation(ClosedBarObserver):
+    """
+    Rolling correlations between every pair of a set of symbols, per closed
+    bar, in both CorrelationModes.
+
+    Symbols report their closed bars through observe(); a bar becomes one
+    row of each mode's RollingCorrelation once every tracked symbol has
+    reported it, or once two newer bars are pending (a symbol without the
+    bar counts as missing for it). Each row updates the co-moment matrices
+    in O(N^2) and classifies every pair's regime: a pair entering or leaving
+    HIGH/INVERSE is published as CORRELATION_REGIME_CHANGE, and every
+    `publish_every` rows the `top_k` pairs at or above `threshold` are
+    published as HIGH_CORRELATION_DETECTED.
+    """
+
+    def __init__(self, event_bus: EventBus, window: int = 240, top_k: int = 10, threshold: float = 0.7,
+                 exit_threshold: float = 0.5, publish_every: int = 60, min_periods: Optional[int] = None):
+        self.event_bus = event_bus
+        self.top_k = top_k
+        self.threshold = threshold
+        self.publish_every = publish_every
+        self.engines = {mode: RollingCorrelation(window, min_periods) for mode in CorrelationMode.ALL}
+        self.regimes = {mode: CorrelationRegimeTracker(threshold, exit_threshold) for mode in CorrelationMode.ALL}
+        self.rows_committed = 0
+        self.late_bars = 0
+        self._symbols: List[str] = []
+        # 막대 시각 -> 심볼별 (수익률, 근접도), 대기 중인 시각은 정렬된 목록으로 유지
+        self._pending: Dict[float, Dict[str, Tuple[float, float]]] = {}
+        self._pending_times: List[float] = []
+        self._last_close: Dict[str, float] = {}
+        self._committed_until = -math.inf
+
+    def track(self, symbols: Sequence[str]):
+        for symbol in symbols:
+            if symbol not in self._symbols:
+                self._symbols.append(symbol)
+                for engine in self.engines.values():
+                    engine.index(symbol)
+
+    async def observe(self, symbol: str, timestamp: float, close: float, proximity: Optional[float]):
+        """Records a tracked symbol's closed bar; commits the bars it completes."""
+        if symbol not in self._symbols:
+            return
+        last_close = self._last_close.get(symbol)
+        self._last_close[symbol] = close
+        if timestamp <= self._committed_until:
+            self.late_bars += 1
+            return
+
+        log_return = math.log(close / last_close) if last_close and close > 0 else math.nan
+        observed = self._pending.get(timestamp)
+        if observed is None:
+            observed = self._pending[timestamp] = {}
+            # 막대는 대부분 시각 순으로 도착하므로 삽입은 보통 끝에
+            bisect.insort(self._pending_times, timestamp)
+        observed[symbol] = (log_return, math.nan if proximity is None else proximity)
+
+        # 모든 심볼이 보고했거나 더 새로운 막대가 둘 이상 쌓인 막대까지 시각 순서로 반영.
+        # 마지막 두 막대 이전은 모두 후자이므로 마지막 두 막대만 확인
+        times = self._pending_times
+        ready = len(times) - 3
+        for i in range(max(len(times) - 2, 0), len(times)):
+            if len(self._pending[times[i]]) == len(self._symbols):
+                ready = i
+        if ready >= 0:
+            committed, self._pending_times = times[:ready + 1], times[ready + 1:]
+            for bar_time in committed:
+                await self._commit(bar_time, self._pending.pop(bar_time))
+
+    async def _commit(self, timestamp: float, observed: Dict[str, Tuple[float, float]]):
+        self._committed_until = timestamp
+        self.rows_committed += 1
+        for column, mode in enumerate(CorrelationMode.ALL):
+            engine = self.engines[mode]
+            row = np.full(len(engine), np.nan)
+            for symbol, values in observed.items():
+                row[engine.index(symbol)] = values[column]
+            engine.update(row)
+
+            corr = engine.matrix()
+            for first, second, previous, regime, correlation in self.regimes[mode].update(corr, engine.names):
+                await self.event_bus.publish(LiquidityEvent(
+                    event_type="CORRELATION_REGIME_CHANGE",
+                    correlation_data={'mode': mode, 'pair': [first, second], 'correlation': correlation,
+                                      'regime': REGIME_NAMES[regime], 'previous': REGIME_NAMES[previous],
+                                      'bar_time': timestamp}
+                ))
+
+            if self.rows_committed % self.publish_every == 0:
+                pairs = engine.top_pairs(self.top_k, self.threshold, corr)
+                if pairs:
+                    await self.event_bus.publish(LiquidityEvent(
+                        event_type="HIGH_CORRELATION_DETECTED",
+                        correlation_data={'mode': mode, 'window': engine.window, 'bar_time': timestamp,
+                                          'pairs': [{'pair': [first, second], 'correlation': correlation}
+                                                    for first, second, correlation in pairs]}
+                    ))
+                    logger.info(f"{len(pairs)} highly correlated pairs ({mode}), strongest {pairs[0]}")
+
+    def stats(self) -> Dict[str, int]:
+        return {'symbols': len(self._symbols), 'rows': self.rows_committed, 'late_bars': self.late_bars,
+                'pending_bars': len(self._pending)}
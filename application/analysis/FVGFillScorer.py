@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import heapq
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from domain.entities.FairValueGap import AsyncFairValueGap, MLModel
+from domain.ports.Clock import Clock, SystemClock
+from domain.services.Timeframe import timeframe_seconds
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Columns of the feature matrix, in order. Age is the bit length of the
+# number of bars since creation (0, 1, 2, 2, 3, 3, 3, 3, 4, ...), so a gap's
+# age feature changes a logarithmic number of times over its life.
+FILL_FEATURES = ('gap_size', 'fill_percentage', 'age_bucket')
+
+FeatureRow = Tuple[float, float, int]
+
+
+@functools.lru_cache(maxsize=None)
+def load_fill_model() -> MLModel:
+    """The fill-probability model, loaded once per process and shared by every scorer."""
+    return MLModel()
+
+
+class FVGFillScorer:
+    """
+    Fill probability of every open FVG of the process, scored in batches.
+
+    A gap is marked dirty when it is created or its fill changes
+    (AsyncFairValueGap calls mark()), and again when its age bucket is due
+    to change, from a heap of bucket boundaries. The scorer wakes at most
+    once per `interval`, builds the feature rows of the dirty gaps, drops
+    those equal to the row each gap was last scored with, and runs one
+    vectorized predict_batch for the rest in the default executor. Cost
+    follows the number of gaps whose features changed, and an idle market
+    costs nothing.
+    """
+
+    def __init__(self, model: Optional[MLModel] = None, interval: float = 1.0,
+                 min_change: float = 0.05, clock: Optional[Clock] = None):
+        self.model = model or load_fill_model()
+        self.interval = interval
+        self.min_change = min_change
+        self.clock = clock or SystemClock()
+        self.batches = 0
+        self.rows_scored = 0
+        self.rows_skipped = 0
+        self._dirty: Dict[int, AsyncFairValueGap] = {}
+        self._scored: Dict[int, FeatureRow] = {}
+        # (다음 나이 버킷 경계 시각, id) 힙과 갭별 최신 경계
+        self._due: List[Tuple[float, int]] = []
+        self._next_due: Dict[int, Tuple[float, AsyncFairValueGap]] = {}
+        self._wakeup = asyncio.Event()
+
+    def mark(self, gap: AsyncFairValueGap):
+        """다음 배치에서 재평가할 갭 등록"""
+        self._dirty[gap.entity_id] = gap
+        self._wakeup.set()
+
+    def forget(self, entity_ids: Set[int]):
+        for entity_id in entity_ids:
+            self._scored.pop(entity_id, None)
+            self._dirty.pop(entity_id, None)
+            self._next_due.pop(entity_id, None)
+
+    def _features(self, gap: AsyncFairValueGap, now: float) -> FeatureRow:
+        bars = max(0, int((now - gap.creation_time) // timeframe_seconds(gap.timeframe)))
+        return gap.gap_size, gap.fill_percentage, bars.bit_length()
+
+    def _schedule(self, gap: AsyncFairValueGap, age_bucket: int):
+        # 나이 버킷이 바뀌는 시각 (봉 수가 2^bucket에 도달)
+        due = gap.creation_time + (1 << age_bucket) * timeframe_seconds(gap.timeframe)
+        scheduled = self._next_due.get(gap.entity_id)
+        if scheduled is None or scheduled[0] != due:
+            self._next_due[gap.entity_id] = (due, gap)
+            heapq.heappush(self._due, (due, gap.entity_id))
+
+    def _pop_due(self, now: float):
+        while self._due and self._due[0][0] <= now:
+            due, entity_id = heapq.heappop(self._due)
+            scheduled = self._next_due.get(entity_id)
+            if scheduled is not None and scheduled[0] == due:
+                del self._next_due[entity_id]
+                self._dirty[entity_id] = scheduled[1]
+
+    async def score(self) -> int:
+        """Scores the dirty gaps whose features changed. Returns rows scored."""
+        now = self.clock.time()
+        self._pop_due(now)
+        dirty, self._dirty = self._dirty, {}
+        gaps, rows = [], []
+        for entity_id, gap in dirty.items():
+            if not gap.is_active:
+                self.forget({entity_id})
+                continue
+            row = self._features(gap, now)
+            self._schedule(gap, row[2])
+            if self._scored.get(entity_id) == row:
+                self.rows_skipped += 1
+                continue
+            gaps.append(gap)
+            rows.append(row)
+        if not rows:
+            return 0
+
+        features = np.array(rows, dtype=np.float64)
+        loop = asyncio.get_running_loop()
+        probabilities = await loop.run_in_executor(None, self.model.predict_batch, features)
+        for gap, row, probability in zip(gaps, rows, probabilities.tolist()):
+            self._scored[gap.entity_id] = row
+            if abs(probability - gap.fill_probability) > self.min_change:
+                gap.fill_probability = probability
+        self.batches += 1
+        self.rows_scored += len(rows)
+        return len(rows)
+
+    async def run(self):
+        """더티 갭이 생기거나 나이 버킷 경계가 오면 interval 동안 모아서 한 번에 평가 (백그라운드 코루틴)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            timer = None
+            if self._due:
+                timer = loop.call_later(max(0.0, self._due[0][0] - self.clock.time()), self._wakeup.set)
+            await self._wakeup.wait()
+            if timer is not None:
+                timer.cancel()
+            await asyncio.sleep(self.interval)
+            self._wakeup.clear()
+            try:
+                await self.score()
+            except Exception as e:
+                logger.error(f"FVG fill scoring failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {'batches': self.batches, 'rows_scored': self.rows_scored, 'rows_skipped': self.rows_skipped,
+                'tracked': len(self._scored), 'scheduled': len(self._due)}
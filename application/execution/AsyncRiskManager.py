@@ -2,6 +2,7 @@ import asyncio
 import logging
 
 from domain.ports.EventBus import EventBus
+from domain.events.RiskEvent import RiskEvent
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -13,12 +14,13 @@ class AsyncRiskManager:
 
     async def start_risk_monitoring(self):
         logger.info("Risk Manager started.")
-        while True:
-            # This would monitor account equity, drawdown, margin, etc.
-            await asyncio.sleep(1)
+        # This would monitor account equity, drawdown, margin, etc., driven by
+        # account and order events. Until then, idle until cancelled.
+        await asyncio.get_running_loop().create_future()
 
     async def emergency_close_all_positions(self):
         logger.warning("EMERGENCY: Closing all positions!")
+        await self.event_bus.publish(RiskEvent(event_type="EMERGENCY_CLOSE_ALL"))
         # Logic to quickly liquidate all open positions would go here.
         await asyncio.sleep(0.5)
         logger.warning("All positions closed.")
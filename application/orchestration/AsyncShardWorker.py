@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import socket
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+
+from infrastructure.messaging.EventBus import AsyncEventBus
+from infrastructure.messaging.ShardChannel import ShardChannel, ShardMessage
+from infrastructure.data.CandleArchive import AsyncArchiveWriter, CandleArchive
+from infrastructure.data.MarketDataHub import MarketDataHub
+from infrastructure.data.StateSnapshot import StateSnapshotter
+from infrastructure.binance.KlineBackfill import BinanceRestClient, KlineBackfill, RequestWeightLimiter
+from application.analysis.AsyncZoneMonitor import AsyncZoneMonitor
+from application.analysis.AsyncStructureBreakDetector import AsyncStructureBreakDetector
+from application.analysis.AsyncOrderBlockDetector import AsyncOrderBlockDetector
+from application.analysis.AsyncLiquidityDetector import AsyncLiquidityDetector
+from application.analysis.AsyncFVGDetector import AsyncFVGDetector
+from application.analysis.CrossSymbolCorrelation import ClosedBarObserver
+from application.orchestration.TradingParameters import TradingParameters
+from application.orchestration.HistorySeeding import backfill_timeframes, seed_detectors
+from domain.ports.EventBus import OverflowPolicy
+from domain.services.PriceTicks import register_tick_sizes
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# Events the main process (coordinator, risk manager, order manager) consumes.
+# Zone telemetry such as BLOCK_TOUCHED or FVG_PARTIAL_FILL stays inside the shard.
+DEFAULT_FORWARD_TOPICS = [
+    "NEW_ORDER_BLOCK",
+    "BLOCK_INVALIDATED",
+    "NEW_FVG_DETECTED",
+    "FVG_FILLED",
+    "NEW_POOL_DETECTED",
+    "LIQUIDITY_SWEPT",
+    "HIGH_CORRELATION_DETECTED",
+    "CORRELATION_REGIME_CHANGE",
+    "BOS_DETECTED",
+    "CHOCH_DETECTED",
+]
+
+
+def partition_symbols(symbols: List[str], num_shards: int) -> List[List[str]]:
+    """Stable symbol -> shard assignment (crc32), independent of list order and process hash seed."""
+    shards: List[List[str]] = [[] for _ in range(num_shards)]
+    for symbol in sorted(symbols):
+        shards[zlib.crc32(symbol.encode()) % num_shards].append(symbol)
+    return shards
+
+
+class AsyncShardWorker:
+    """
+    Runs the detectors of a subset of symbols in its own process, with a local
+    event bus, market data hub and zone monitor. Events matching
+    `forward_topics` are sent to the main process over the shard channel.
+    """
+
+    def __init__(self, shard_id: int, config: Dict[str, Any]):
+        self.shard_id = shard_id
+        self.symbols: List[str] = config['symbols']
+        self.order_block_timeframes: List[str] = config['order_block_timeframes']
+        self.fvg_timeframes: List[str] = config['fvg_timeframes']
+        self.structure_timeframes: List[str] = config.get('structure_timeframes', [])
+        self.forward_topics: List[str] = config.get('forward_topics', DEFAULT_FORWARD_TOPICS)
+        self.health_interval: float = config.get('health_interval', 30.0)
+        # 메인 프로세스가 거래소에서 받은 틱 크기 (존 생성 전에 등록)
+        register_tick_sizes(config.get('tick_sizes', {}))
+        params: TradingParameters = config.get('parameters') or TradingParameters()
+        archive_dir = config.get('archive_dir')
+
+        self.event_bus = AsyncEventBus()
+        # 샤드마다 자기 심볼의 파티션에만 기록
+        archive = AsyncArchiveWriter(CandleArchive(archive_dir)) if archive_dir else None
+        self.market_data_hub = MarketDataHub(archive=archive)
+        self.zone_monitor = AsyncZoneMonitor(self.market_data_hub)
+        self.backfill_bars: int = config.get('backfill_bars', 500)
+        self.backfill = None
+        if config.get('rest_url'):
+            limiter = RequestWeightLimiter(config.get('rest_weight_limit', 5000))
+            self.backfill = KlineBackfill(BinanceRestClient(config['rest_url'], limiter),
+                                          CandleArchive(archive_dir) if archive_dir else None)
+        # 백필 클라이언트로 캔들 스트림 공백을 채움
+        self.market_structure_detector = AsyncStructureBreakDetector(self.event_bus, self.market_data_hub,
+                                                                     gap_source=self.backfill)
+        self.order_block_detector = AsyncOrderBlockDetector(self.event_bus, self.market_data_hub, self.zone_monitor,
+                                                            params.order_block_validity_delta)
+        self.liquidity_detector = AsyncLiquidityDetector(
+            self.event_bus, self.market_data_hub, self.zone_monitor, params.liquidity_tolerance_percent,
+            correlation=_ClosedBarForwarder(self))
+        self.fvg_detector = AsyncFVGDetector(self.event_bus, self.market_data_hub, self.zone_monitor,
+                                             params.fvg_fill_threshold, params.fvg_fill_publish_delta)
+        self.state_snapshotter = None
+        if config.get('snapshot_path'):
+            self.state_snapshotter = StateSnapshotter(config['snapshot_path'], {
+                'market_data': self.market_data_hub,
+                'structure': self.market_structure_detector,
+                'liquidity': self.liquidity_detector,
+                'fvg': self.fvg_detector,
+                'order_blocks': self.order_block_detector,
+                'zones': self.zone_monitor,
+            }, config.get('snapshot_interval', 30.0))
+        self._channel: ShardChannel = None
+
+    async def _forward_event(self, event: Any):
+        await self._channel.send_event(event)
+
+    async def _report_health(self):
+        """워커 상태를 메인 프로세스에 주기적으로 보고"""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self._channel.send(ShardMessage.HEALTH, {
+                'shard_id': self.shard_id,
+                'backlog': self.event_bus.backlog(),
+                'events_forwarded': self._channel.events_sent,
+                'feeds': self.market_data_hub.stats(),
+            })
+
+    async def _backfill_history(self):
+        timeframes = backfill_timeframes(self.structure_timeframes, self.order_block_timeframes, self.fvg_timeframes)
+        try:
+            windows = await self.backfill.fetch(self.symbols, timeframes, self.backfill_bars)
+        except Exception as e:
+            logger.error(f"Shard {self.shard_id} backfill failed, starting without history: {e}")
+            return
+        await seed_detectors(windows, self.market_data_hub, self.market_structure_detector,
+                             self.liquidity_detector, self.fvg_detector, self.order_block_detector,
+                             self.structure_timeframes, self.fvg_timeframes, self.order_block_timeframes)
+
+    async def run(self, sock: socket.socket):
+        """샤드 실행 - 메인 프로세스가 STOP을 보내거나 연결이 끊길 때까지"""
+        self._channel = await ShardChannel.open(sock)
+        # 전달 이벤트는 전략 입력이므로 버리지 않고 채널이 밀리면 발행자가 대기
+        for topic in self.forward_topics:
+            await self.event_bus.subscribe(topic, self._forward_event, maxsize=10000,
+                                           overflow=OverflowPolicy.BLOCK)
+
+        tasks = []
+        if self.state_snapshotter is not None:
+            await self.state_snapshotter.restore()
+        if self.backfill is not None:
+            await self._backfill_history()
+        # 시딩이 끝난 뒤부터 주기적 스냅샷
+        if self.state_snapshotter is not None:
+            tasks.append(asyncio.create_task(self.state_snapshotter.run()))
+        tasks += [
+            asyncio.create_task(self.event_bus.process_events()),
+            asyncio.create_task(self.market_structure_detector.start_multi_timeframe_detection(self.symbols, self.structure_timeframes)),
+            asyncio.create_task(self.order_block_detector.start_continuous_detection(self.symbols, self.order_block_timeframes)),
+            asyncio.create_task(self.liquidity_detector.start_multi_symbol_detection(self.symbols)),
+            asyncio.create_task(self.fvg_detector.start_multi_timeframe_detection(self.symbols, self.fvg_timeframes)),
+            asyncio.create_task(self._report_health()),
+        ]
+        logger.info(f"Shard {self.shard_id} started for {self.symbols}")
+
+        try:
+            async for kind, _ in self._channel:
+                if kind == ShardMessage.STOP:
+                    break
+        finally:
+            if self.state_snapshotter is not None:
+                await self.state_snapshotter.snapshot()
+            await self.zone_monitor.stop()
+            await self.market_data_hub.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.backfill is not None:
+                self.backfill.client.close()
+            await self._channel.close()
+            logger.info(f"Shard {self.shard_id} stopped.")
+
+
+class _ClosedBarForwarder(ClosedBarObserver):
+    """
+    Sends the shard's closed bars to the main process, whose single
+    CrossSymbolCorrelation covers the pairs that span shards.
+    """
+
+    def __init__(self, worker: AsyncShardWorker):
+        self._worker = worker
+
+    def track(self, symbols: Sequence[str]):
+        pass  # 메인 프로세스가 전체 심볼을 추적
+
+    async def observe(self, symbol: str, timestamp: float, close: float, proximity: Optional[float]):
+        await self._worker._channel.send(ShardMessage.BAR, [symbol, timestamp, close, proximity])
+
+
+def run_shard_worker(shard_id: int, config: Dict[str, Any], sock: socket.socket):
+    """Process entry point of a shard worker."""
+    try:
+        asyncio.run(AsyncShardWorker(shard_id, config).run(sock))
+    except KeyboardInterrupt:
+        pass
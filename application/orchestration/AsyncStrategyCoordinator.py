@@ -15,5 +15,5 @@ class AsyncStrategyCoordinator:
         logger.info("Strategy Coordinator started.")
         # In a real implementation, this would subscribe to various signal events
         # and apply a weighting/logic system to them.
-        while True:
-            await asyncio.sleep(1)
+        # Nothing to poll until then; idle until cancelled instead of waking every second.
+        await asyncio.get_running_loop().create_future()
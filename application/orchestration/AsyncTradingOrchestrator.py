@@ -1,38 +1,145 @@
 import asyncio
 import logging
-from typing import Set
+import multiprocessing
+import socket
+from typing import Any, Dict, List, Optional, Set
 import psutil # Dependency to be added
 
+from domain.ports.Clock import Clock, SystemClock
 from infrastructure.messaging.EventBus import AsyncEventBus
+from infrastructure.messaging.ShardChannel import ShardChannel, ShardMessage
+from infrastructure.data.CandleArchive import AsyncArchiveWriter, CandleArchive
+from infrastructure.data.MarketDataHub import MarketDataHub
+from infrastructure.data.StateSnapshot import StateSnapshotter
+from infrastructure.binance.KlineBackfill import BinanceRestClient, KlineBackfill, RequestWeightLimiter
+from infrastructure.binance.LocalOrderBook import OrderBookManager
+from application.analysis.AsyncZoneMonitor import AsyncZoneMonitor
 from application.analysis.AsyncStructureBreakDetector import AsyncStructureBreakDetector
 from application.analysis.AsyncOrderBlockDetector import AsyncOrderBlockDetector
 from application.analysis.AsyncLiquidityDetector import AsyncLiquidityDetector
 from application.analysis.AsyncFVGDetector import AsyncFVGDetector
+from application.analysis.FVGFillScorer import FVGFillScorer
+from application.analysis.CrossSymbolCorrelation import CrossSymbolCorrelation
 from application.strategies.AsyncTimeBasedStrategy import AsyncTimeBasedStrategy
 from application.orchestration.AsyncStrategyCoordinator import AsyncStrategyCoordinator
 from application.execution.AsyncRiskManager import AsyncRiskManager
 from infrastructure.binance.AsyncOrderManager import AsyncOrderManager
+from application.orchestration.AsyncShardWorker import partition_symbols, run_shard_worker
+from application.orchestration.TradingParameters import TradingParameters
+from application.orchestration.HistorySeeding import backfill_timeframes, load_tick_sizes, seed_detectors
+from domain.services.PriceTicks import tick_sizes
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 
 class AsyncTradingOrchestrator:
-    """메인 거래 오케스트레이터 - 모든 비동기 컴포넌트 조정"""
-
-    def __init__(self):
-        self.event_bus = AsyncEventBus()
-        self.market_structure_detector = AsyncStructureBreakDetector(self.event_bus)
-        self.order_block_detector = AsyncOrderBlockDetector(self.event_bus)
-        self.liquidity_detector = AsyncLiquidityDetector(self.event_bus)
-        self.fvg_detector = AsyncFVGDetector(self.event_bus)
-        self.time_strategy = AsyncTimeBasedStrategy(self.event_bus)
+    """
+    메인 거래 오케스트레이터 - 모든 비동기 컴포넌트 조정
+
+    With num_shards > 1 the symbol universe is partitioned across worker
+    processes (AsyncShardWorker), each running its own detectors and local bus.
+    Cross-shard events are relayed onto this process's bus, where the strategy
+    coordinator, risk manager and order manager run, and the shards' closed
+    bars feed the one CrossSymbolCorrelation here. Local order books
+    (order_books) are only supported in a single process: the liquidity
+    pools that query them live in the shards.
+
+    Time-driven components read the injected Clock, and the market data hub
+    can be injected with its own source, so the same orchestrator replays
+    recorded data on virtual time (infrastructure.replay.ReplayEngine). A replay
+    passes close_on_shutdown=False: it holds no exchange orders or positions,
+    so shutdown skips cancelling and flattening them.
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None,
+                 order_block_timeframes: Optional[List[str]] = None,
+                 fvg_timeframes: Optional[List[str]] = None,
+                 structure_timeframes: Optional[List[str]] = None,
+                 num_shards: int = 1,
+                 event_bus: Optional[AsyncEventBus] = None,
+                 market_data_hub: Optional[MarketDataHub] = None,
+                 clock: Optional[Clock] = None,
+                 parameters: Optional[TradingParameters] = None,
+                 archive_dir: Optional[str] = None,
+                 snapshot_path: Optional[str] = None,
+                 snapshot_interval: float = 30.0,
+                 rest_url: Optional[str] = None,
+                 backfill_bars: int = 500,
+                 order_books: Optional[OrderBookManager] = None,
+                 close_on_shutdown: bool = True):
+        self.symbols = symbols or ["BTCUSDT", "ETHUSDT"]
+        self.order_block_timeframes = order_block_timeframes or ["5m", "15m", "1h"]
+        self.fvg_timeframes = fvg_timeframes or ["1m", "5m", "15m"]
+        self.structure_timeframes = structure_timeframes or ["5m", "15m", "1h"]
+        self.num_shards = num_shards
+        self.parameters = parameters or TradingParameters()
+        params = self.parameters
+
+        # RemoteEventBus를 주입하면 다른 호스트의 노드와 이벤트 공유
+        self.event_bus = event_bus or AsyncEventBus()
+        # 리플레이 시 가상 시계와 기록된 데이터 소스를 주입
+        self.clock = clock or SystemClock()
+        # archive_dir를 주면 마감된 캔들/체결을 디스크 아카이브에 기록
+        self.archive_dir = archive_dir
+        archive = AsyncArchiveWriter(CandleArchive(archive_dir)) if archive_dir else None
+        self.market_data_hub = market_data_hub or MarketDataHub(clock=self.clock, archive=archive)
+        self.zone_monitor = AsyncZoneMonitor(self.market_data_hub)
+        # 로컬 오더북을 주면 유동성 풀이 심볼별 공유 호가창을 조회 (단일 프로세스 모드)
+        if order_books is not None and num_shards > 1:
+            raise ValueError("order_books needs num_shards <= 1: shard workers cannot query this process's books")
+        self.order_books = order_books
+        # 종료 시 미체결 주문 취소와 포지션 청산 여부 (리플레이에서는 끔)
+        self.close_on_shutdown = close_on_shutdown
+
+        # rest_url을 주면 시작 시 최근 캔들을 백필 (archive_dir가 있으면 로컬 캐시로 사용)
+        # 실행 중에는 캔들 스트림 공백을 채우는 데 사용
+        self.rest_url = rest_url
+        self.backfill_bars = backfill_bars
+        self.backfill: Optional[KlineBackfill] = None
+        if rest_url and num_shards <= 1:
+            self.backfill = KlineBackfill(BinanceRestClient(rest_url),
+                                          CandleArchive(archive_dir) if archive_dir else None, self.clock)
+        self.market_structure_detector = AsyncStructureBreakDetector(self.event_bus, self.market_data_hub,
+                                                                     gap_source=self.backfill)
+        self.order_block_detector = AsyncOrderBlockDetector(self.event_bus, self.market_data_hub, self.zone_monitor,
+                                                            params.order_block_validity_delta)
+        # 심볼 간 상관관계는 이 프로세스 하나에서 계산 (샤드 모드에서는 샤드가 마감 봉을 전달)
+        self.correlation = CrossSymbolCorrelation(self.event_bus, threshold=params.correlation_threshold)
+        self.liquidity_detector = AsyncLiquidityDetector(self.event_bus, self.market_data_hub, self.zone_monitor,
+                                                         params.liquidity_tolerance_percent,
+                                                         order_books=self.order_books,
+                                                         correlation=self.correlation)
+        self.fvg_detector = AsyncFVGDetector(self.event_bus, self.market_data_hub, self.zone_monitor,
+                                             params.fvg_fill_threshold, params.fvg_fill_publish_delta,
+                                             fill_scorer=FVGFillScorer(clock=self.clock))
+        self.time_strategy = AsyncTimeBasedStrategy(self.event_bus, self.clock, params.time_suitability_threshold)
         self.strategy_coordinator = AsyncStrategyCoordinator(self.event_bus)
         self.risk_manager = AsyncRiskManager(self.event_bus)
         self.order_manager = AsyncOrderManager(self.event_bus)
 
+        # snapshot_path를 주면 탐지기 상태를 주기적으로 저장하고 시작 시 복원
+        # (샤드 모드에서는 워커마다 자기 파일)
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.state_snapshotter: Optional[StateSnapshotter] = None
+        if snapshot_path and num_shards <= 1:
+            self.state_snapshotter = StateSnapshotter(snapshot_path, {
+                'market_data': self.market_data_hub,
+                'structure': self.market_structure_detector,
+                'liquidity': self.liquidity_detector,
+                'fvg': self.fvg_detector,
+                'order_blocks': self.order_block_detector,
+                'zones': self.zone_monitor,
+            }, snapshot_interval, self.clock)
+
         self._main_tasks: Set[asyncio.Task] = set()
         self._is_running = False
+        self._shard_processes: List[multiprocessing.Process] = []
+        self._shard_channels: List[ShardChannel] = []
+        self._shard_health: Dict[int, Dict[str, Any]] = {}
+        # 스트림별 직전 점검 시점의 누적 드롭 수
+        self._feed_dropped: Dict[str, int] = {}
 
     async def start_trading_system(self):
         """전체 거래 시스템 시작"""
@@ -44,12 +151,38 @@ class AsyncTradingOrchestrator:
             event_bus_task = asyncio.create_task(self.event_bus.process_events())
             self._main_tasks.add(event_bus_task)
 
+            # 존 가격은 틱 단위이므로 존 복원/생성 전에 거래소 틱 크기 로드
+            if self.rest_url:
+                await load_tick_sizes(self.rest_url, self.symbols)
+
+            # 저장된 상태로 웜 스타트
+            if self.state_snapshotter is not None:
+                await self.state_snapshotter.restore()
+
+            # 탐지기가 실시간 데이터를 구독하기 전에 히스토리 백필 및 시딩
+            if self.backfill is not None:
+                await self._backfill_history()
+
+            # 시딩이 끝난 뒤부터 주기적 스냅샷 (시딩 중인 상태를 저장하지 않도록)
+            if self.state_snapshotter is not None:
+                self._main_tasks.add(asyncio.create_task(self.state_snapshotter.run()))
+
+            if self.order_books is not None:
+                self._main_tasks.add(asyncio.create_task(self.order_books.run(self.symbols)))
+
+            # 탐지기 시작 (샤드 모드에서는 워커 프로세스에서 실행)
+            if self.num_shards > 1:
+                components_tasks = await self._start_shards()
+            else:
+                components_tasks = [
+                    asyncio.create_task(self.market_structure_detector.start_multi_timeframe_detection(self.symbols, self.structure_timeframes)),
+                    asyncio.create_task(self.order_block_detector.start_continuous_detection(self.symbols, self.order_block_timeframes)),
+                    asyncio.create_task(self.liquidity_detector.start_multi_symbol_detection(self.symbols)),
+                    asyncio.create_task(self.fvg_detector.start_multi_timeframe_detection(self.symbols, self.fvg_timeframes)),
+                ]
+
             # 각 컴포넌트 시작
-            components_tasks = [
-                asyncio.create_task(self.market_structure_detector.start_multi_timeframe_detection()),
-                asyncio.create_task(self.order_block_detector.start_continuous_detection(["BTCUSDT", "ETHUSDT"], ["5m", "15m", "1h"])),
-                asyncio.create_task(self.liquidity_detector.start_multi_symbol_detection(["BTCUSDT", "ETHUSDT"])),
-                asyncio.create_task(self.fvg_detector.start_multi_timeframe_detection(["BTCUSDT", "ETHUSDT"], ["1m", "5m", "15m"])),
+            components_tasks += [
                 asyncio.create_task(self.time_strategy.start_time_based_analysis()),
                 asyncio.create_task(self.strategy_coordinator.start_strategy_coordination()),
                 asyncio.create_task(self.risk_manager.start_risk_monitoring()),
@@ -70,6 +203,88 @@ class AsyncTradingOrchestrator:
             logger.error(f"Critical error in trading system orchestrator: {e}", exc_info=True)
             await self.shutdown()
 
+    async def _backfill_history(self):
+        timeframes = backfill_timeframes(self.structure_timeframes, self.order_block_timeframes, self.fvg_timeframes)
+        try:
+            windows = await self.backfill.fetch(self.symbols, timeframes, self.backfill_bars)
+        except Exception as e:
+            logger.error(f"Backfill failed, starting without history: {e}")
+            return
+        await seed_detectors(windows, self.market_data_hub, self.market_structure_detector,
+                             self.liquidity_detector, self.fvg_detector, self.order_block_detector,
+                             self.structure_timeframes, self.fvg_timeframes, self.order_block_timeframes)
+
+    async def _start_shards(self) -> List[asyncio.Task]:
+        """심볼을 워커 프로세스에 분할하고 샤드 이벤트 중계 시작"""
+        context = multiprocessing.get_context("spawn")
+        relay_tasks = []
+        # 샤드를 넘나드는 심볼 쌍까지 한 상관관계 엔진에서 계산
+        if len(self.symbols) > 1:
+            self.correlation.track(self.symbols)
+        for shard_id, shard_symbols in enumerate(partition_symbols(self.symbols, self.num_shards)):
+            if not shard_symbols:
+                continue
+            parent_sock, child_sock = socket.socketpair()
+            config = {
+                'symbols': shard_symbols,
+                'order_block_timeframes': self.order_block_timeframes,
+                'fvg_timeframes': self.fvg_timeframes,
+                'structure_timeframes': self.structure_timeframes,
+                'parameters': self.parameters,
+                'archive_dir': self.archive_dir,
+                'snapshot_path': f"{self.snapshot_path}.shard{shard_id}" if self.snapshot_path else None,
+                'snapshot_interval': self.snapshot_interval,
+                'rest_url': self.rest_url,
+                'backfill_bars': self.backfill_bars,
+                # 샤드들이 같은 IP의 요청 가중치 한도를 나눠 씀
+                'rest_weight_limit': RequestWeightLimiter().limit // self.num_shards,
+                'tick_sizes': {symbol: size for symbol, size in tick_sizes().items() if symbol in shard_symbols},
+            }
+            process = context.Process(
+                target=run_shard_worker, args=(shard_id, config, child_sock),
+                name=f"shard-{shard_id}", daemon=True
+            )
+            process.start()
+            child_sock.close()
+
+            channel = await ShardChannel.open(parent_sock)
+            self._shard_processes.append(process)
+            self._shard_channels.append(channel)
+            relay_tasks.append(asyncio.create_task(self._relay_shard_events(shard_id, channel)))
+            logger.info(f"Shard {shard_id} (pid {process.pid}) started for {shard_symbols}")
+        return relay_tasks
+
+    async def _relay_shard_events(self, shard_id: int, channel: ShardChannel):
+        """샤드에서 온 이벤트를 메인 이벤트 버스로 재발행"""
+        async for kind, payload in channel:
+            if kind == ShardMessage.EVENTS:
+                for event in payload:
+                    await self.event_bus.publish(event)
+            elif kind == ShardMessage.BAR:
+                await self.correlation.observe(*payload)
+            elif kind == ShardMessage.HEALTH:
+                self._shard_health[shard_id] = payload
+
+        if self._is_running:
+            logger.error(f"Shard {shard_id} disconnected.")
+
+    async def _stop_shards(self):
+        for channel in self._shard_channels:
+            try:
+                await channel.send(ShardMessage.STOP)
+            except (ConnectionError, OSError):
+                pass
+            await channel.close()
+
+        loop = asyncio.get_running_loop()
+        for process in self._shard_processes:
+            await loop.run_in_executor(None, process.join, 5)
+            if process.is_alive():
+                logger.warning(f"Shard process {process.name} did not stop; terminating.")
+                process.terminate()
+        self._shard_channels.clear()
+        self._shard_processes.clear()
+
     async def shutdown(self):
         """시스템 우아한 종료"""
         if not self._is_running:
@@ -78,11 +293,23 @@ class AsyncTradingOrchestrator:
         logger.info("Shutting down trading system...")
         self._is_running = False
 
-        # 모든 진행 중인 주문 취소
-        await self.order_manager.cancel_all_orders()
+        if self.close_on_shutdown:
+            # 모든 진행 중인 주문 취소
+            await self.order_manager.cancel_all_orders()
 
-        # 모든 포지션 청산 (선택적)
-        await self.risk_manager.emergency_close_all_positions()
+            # 모든 포지션 청산 (선택적)
+            await self.risk_manager.emergency_close_all_positions()
+
+        # 샤드 워커, 존 모니터링 및 마켓 데이터 업스트림 종료
+        await self._stop_shards()
+        if self.state_snapshotter is not None:
+            await self.state_snapshotter.snapshot()
+        await self.zone_monitor.stop()
+        if self.order_books is not None:
+            await self.order_books.close()
+        await self.market_data_hub.close()
+        if self.backfill is not None:
+            self.backfill.client.close()
 
         # 태스크 정리
         for task in self._main_tasks:
@@ -113,10 +340,28 @@ class AsyncTradingOrchestrator:
                 if memory_usage > 1000:  # 1GB 초과 시 경고
                     logger.warning(f"High memory usage: {memory_usage:.2f} MB")
 
-                # 이벤트 큐 크기 체크
-                queue_size = self.event_bus.event_queue.qsize()
-                if queue_size > 1000:
-                    logger.warning(f"Event queue backlog: {queue_size}")
+                # 구독자별 메일박스 적체 체크
+                for subscriber, depth in self.event_bus.queue_depths().items():
+                    if depth > 500:
+                        logger.warning(f"Event backlog for {subscriber}: {depth}")
+
+                # 샤드 워커 상태 체크
+                for process in self._shard_processes:
+                    if not process.is_alive():
+                        logger.error(f"Shard process {process.name} is not running (exit code {process.exitcode})")
+                for shard_id, health in self._shard_health.items():
+                    if health['backlog'] > 500:
+                        logger.warning(f"Event backlog in shard {shard_id}: {health['backlog']}")
+
+                # 마켓 데이터 피드 지연 체크
+                for stream, stats in self.market_data_hub.stats().items():
+                    if stats['last_lag'] > 1.0:  # 1초 초과 지연 시 경고
+                        logger.warning(f"Feed lag on {stream}: {stats['last_lag']:.3f}s (max {stats['max_lag']:.3f}s)")
+                    dropped = stats['dropped'] - self._feed_dropped.get(stream, 0)
+                    self._feed_dropped[stream] = stats['dropped']
+                    if dropped > 0:
+                        logger.warning(f"Slow consumers on {stream}: {dropped} messages dropped since last check "
+                                       f"({stats['dropped']} total)")
 
                 # API 연결 상태 체크
                 api_health = await self._check_api_health()
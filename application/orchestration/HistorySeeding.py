@@ -0,0 +1,67 @@
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+from domain.services.ColumnarRingBuffer import CandleWindow
+from domain.services.PriceTicks import register_tick_sizes
+from domain.services.Timeframe import timeframe_seconds
+from infrastructure.binance.KlineBackfill import BinanceRestClient
+from infrastructure.data.MarketDataHub import MarketDataHub
+from application.analysis.AsyncStructureBreakDetector import AsyncStructureBreakDetector
+from application.analysis.AsyncLiquidityDetector import AsyncLiquidityDetector
+from application.analysis.AsyncFVGDetector import AsyncFVGDetector
+from application.analysis.AsyncOrderBlockDetector import AsyncOrderBlockDetector
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Timeframe the liquidity detector confirms swings on
+LIQUIDITY_TIMEFRAME = "1m"
+
+
+def backfill_timeframes(*timeframe_lists: Sequence[str]) -> List[str]:
+    """Every timeframe the detectors use, plus the liquidity timeframe, shortest first."""
+    timeframes = {LIQUIDITY_TIMEFRAME}
+    for timeframe_list in timeframe_lists:
+        timeframes.update(timeframe_list)
+    return sorted(timeframes, key=timeframe_seconds)
+
+
+async def load_tick_sizes(rest_url: str, symbols: Sequence[str]):
+    """
+    거래소의 심볼별 틱 크기를 등록 - 존이 생성/복원되기 전에 호출.
+    실패하면 기본 틱 크기로 계속 진행
+    """
+    client = BinanceRestClient(rest_url, max_concurrency=1)
+    try:
+        tick_sizes = await client.get_tick_sizes(symbols)
+    except Exception as e:
+        logger.error(f"Could not load tick sizes, using defaults: {e}")
+        return
+    finally:
+        client.close()
+    register_tick_sizes(tick_sizes)
+    logger.info(f"Loaded tick sizes for {len(tick_sizes)} symbols.")
+
+
+async def seed_detectors(windows: Dict[Tuple[str, str], CandleWindow], market_data_hub: MarketDataHub,
+                         structure_detector: AsyncStructureBreakDetector, liquidity_detector: AsyncLiquidityDetector,
+                         fvg_detector: AsyncFVGDetector, order_block_detector: AsyncOrderBlockDetector,
+                         structure_timeframes: Sequence[str], fvg_timeframes: Sequence[str],
+                         order_block_timeframes: Sequence[str]):
+    """
+    백필 캔들로 공유 히스토리와 탐지기를 채움 - 탐지기가 실시간 구독을 시작하기
+    전에 호출. 구조 엔진과 FVG/Order Block 레지스트리는 배치 탐지기로 한 번에 구성
+    """
+    for (symbol, timeframe), candles in windows.items():
+        if not len(candles):
+            continue
+        market_data_hub.seed_history(symbol, timeframe, candles)
+        if timeframe in structure_timeframes:
+            await structure_detector.seed_history(symbol, timeframe, candles)
+        if timeframe in fvg_timeframes:
+            await fvg_detector.seed_history(symbol, timeframe, candles)
+        if timeframe in order_block_timeframes:
+            await order_block_detector.seed_history(symbol, timeframe, candles)
+        if timeframe == LIQUIDITY_TIMEFRAME:
+            await liquidity_detector.seed_history(symbol, candles)
+    logger.info(f"Seeded detectors with {sum(map(len, windows.values()))} backfilled candles.")
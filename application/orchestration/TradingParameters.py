@@ -0,0 +1,30 @@
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict
+
+
+@dataclass(frozen=True)
+class TradingParameters:
+    """
+    Tunable thresholds of the detectors and strategies, in one picklable
+    record so that shard workers and parameter sweeps get the same values.
+    Defaults are the values the components were originally written with.
+    """
+    # Equal highs/lows closer than this percentage form one liquidity pool
+    liquidity_tolerance_percent: float = 0.1
+    # Fill fraction at which a fair value gap counts as filled
+    fvg_fill_threshold: float = 0.95
+    # Minimum fill change that publishes an FVG_PARTIAL_FILL update
+    fvg_fill_publish_delta: float = 0.1
+    # Minimum validity change that publishes a VALIDITY_UPDATED update
+    order_block_validity_delta: float = 0.1
+    # Suitability score above which a HIGH_PROBABILITY_TIME signal is sent
+    time_suitability_threshold: float = 0.7
+    # Correlation at which a symbol pair enters the HIGH (or, negated, INVERSE) regime
+    correlation_threshold: float = 0.7
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def names(cls):
+        return [f.name for f in fields(cls)]
@@ -1,8 +1,9 @@
 import asyncio
 import logging
 import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
+from domain.ports.Clock import Clock, SystemClock
 from domain.ports.EventBus import EventBus
 from application.analysis.AsyncKillZoneManager import AsyncKillZoneManager
 from domain.events.KillZoneEvent import KillZoneEvent
@@ -31,9 +32,11 @@ logging.basicConfig(level=logging.INFO)
 
 
 class AsyncTimeBasedStrategy:
-    def __init__(self, event_bus: EventBus):
+    def __init__(self, event_bus: EventBus, clock: Optional[Clock] = None, suitability_threshold: float = 0.7):
         self.event_bus = event_bus
-        self.kill_zone_manager = AsyncKillZoneManager(event_bus)
+        self.suitability_threshold = suitability_threshold
+        self.clock = clock or SystemClock()
+        self.kill_zone_manager = AsyncKillZoneManager(event_bus, self.clock)
         self.time_based_signals: Dict[str, List[TimeBasedSignal]] = {}
 
     async def start_time_based_analysis(self):
@@ -82,12 +85,12 @@ class AsyncTimeBasedStrategy:
         """시간 기반 거래 시그널 생성"""
         while True:
             try:
-                current_time = datetime.datetime.now()
+                current_time = self.clock.now()
 
                 # 현재 시간대의 거래 적합성 평가
                 trading_suitability = await self._evaluate_time_suitability(current_time)
 
-                if trading_suitability.score > 0.7:
+                if trading_suitability.score > self.suitability_threshold:
                     signal = TimeBasedSignal(
                         timestamp=current_time,
                         suitability_score=trading_suitability.score,
@@ -97,7 +100,8 @@ class AsyncTimeBasedStrategy:
 
                     await self.event_bus.publish(TimeBasedSignalEvent(
                         event_type="HIGH_PROBABILITY_TIME",
-                        signal=signal
+                        signal=signal,
+                        timestamp=current_time
                     ))
                     logger.info(f"High probability time signal generated: {signal.recommended_action}")
 
@@ -0,0 +1,11 @@
+import hashlib
+
+
+def make_entity_id(kind: str, *parts) -> int:
+    """
+    Stable 64-bit id of a zone, derived from what defines it (kind, symbol,
+    timeframe, origin time, levels) instead of object identity, so the same
+    zone has the same id in every process and after a restart.
+    """
+    key = "|".join([kind, *map(repr, parts)]).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
@@ -1,9 +1,13 @@
-import asyncio
 import logging
-from typing import Optional, Any
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 from domain.ports.EventBus import EventBus
 from domain.events.FVGEvent import FVGEvent
+from domain.entities.EntityId import make_entity_id
+from domain.entities.ZoneLifecycle import ZoneLifecycle
+from domain.services.PriceTicks import TickScale, convert_ticks, scale_for, tick_scale
 
 # --- Placeholder Definitions ---
 
@@ -19,6 +23,10 @@ class MLModel:
         # Simulate a prediction
         return 0.65 # e.g., 65% probability
 
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        # One probability per feature row
+        return np.full(len(features), 0.65)
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
@@ -26,88 +34,120 @@ logging.basicConfig(level=logging.INFO)
 
 
 class AsyncFairValueGap:
-    def __init__(self, gap_data: FVGData, event_bus: EventBus):
-        self.gap_high = gap_data.high
-        self.gap_low = gap_data.low
-        self.gap_size = gap_data.high - gap_data.low
+    def __init__(self, gap_data: FVGData, event_bus: EventBus, symbol: str = "", timeframe: str = "",
+                 fill_threshold: float = 0.95, publish_delta: float = 0.1, fill_scorer: Optional[Any] = None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        # 가격은 심볼 틱 단위 정수로 보관 (비교가 정확하고 해시 가능), 생성 시점의 틱 크기와 함께
+        scale = tick_scale(symbol)
+        self.tick_size = scale.tick_size
+        self.gap_high_ticks = scale.to_ticks(gap_data.high)
+        self.gap_low_ticks = scale.to_ticks(gap_data.low)
+        self.gap_size_ticks = self.gap_high_ticks - self.gap_low_ticks
         self.creation_time = gap_data.timestamp
         self.fill_percentage = 0.0
         self.is_filled = False
+        self.lifecycle = ZoneLifecycle.ACTIVE
+        self.fill_threshold = fill_threshold
+        self.publish_delta = publish_delta
+        self.entity_id = make_entity_id("FVG", symbol, timeframe, self.creation_time,
+                                        self.gap_low_ticks, self.gap_high_ticks)
         self.event_bus = event_bus
-        self._fill_probability = 0.0
-        self._monitoring_task: Optional[asyncio.Task] = None
-        self._ml_probability_model = MLModel() # Placeholder model
-
-    async def start_monitoring(self):
-        """FVG 모니터링 시작"""
-        self._monitoring_task = asyncio.create_task(self._monitor_gap_filling())
-
-    async def _get_current_price(self) -> float:
-        # Placeholder for getting live price data
-        await asyncio.sleep(0.1)
-        # Simulate price moving into the gap
-        return self.gap_low + (self.gap_size * (asyncio.get_event_loop().time() % 10) / 10)
-
-    async def _calculate_fill_percentage(self, current_price: float) -> float:
-        if current_price <= self.gap_low:
+        # 채움 확률은 프로세스 공용 스코어러(FVGFillScorer)가 배치로 갱신
+        self.fill_scorer = fill_scorer
+        self.fill_probability = 0.0
+
+    def __getstate__(self):
+        # Sent across processes as a detached record; the bus stays behind
+        state = self.__dict__.copy()
+        state['event_bus'] = None
+        state['fill_scorer'] = None
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], event_bus: EventBus,
+                   fill_scorer: Optional[Any] = None) -> "AsyncFairValueGap":
+        """Rebuilds a live gap from its __getstate__ record (state snapshot restore)."""
+        gap = cls.__new__(cls)
+        gap.__dict__.update(state)
+        gap.event_bus = event_bus
+        gap.fill_scorer = fill_scorer
+        # 저장 후 심볼 틱 크기가 바뀌었으면 경계를 새 틱 단위로 변환
+        current = tick_scale(gap.symbol)
+        saved = scale_for(state.get('tick_size', current.tick_size))
+        gap.gap_high_ticks = convert_ticks(gap.gap_high_ticks, saved, current)
+        gap.gap_low_ticks = convert_ticks(gap.gap_low_ticks, saved, current)
+        gap.gap_size_ticks = gap.gap_high_ticks - gap.gap_low_ticks
+        gap.tick_size = current.tick_size
+        return gap
+
+    @property
+    def is_active(self) -> bool:
+        return self.lifecycle == ZoneLifecycle.ACTIVE
+
+    def expire(self):
+        """Ends the zone without an outcome (zone registry age/count cap)."""
+        if self.is_active:
+            self.lifecycle = ZoneLifecycle.EXPIRED
+
+    @property
+    def scale(self) -> TickScale:
+        return scale_for(self.tick_size)
+
+    @property
+    def gap_high(self) -> float:
+        return self.scale.to_price(self.gap_high_ticks)
+
+    @property
+    def gap_low(self) -> float:
+        return self.scale.to_price(self.gap_low_ticks)
+
+    @property
+    def gap_size(self) -> float:
+        return self.scale.to_price(self.gap_size_ticks)
+
+    def trigger_levels(self) -> List[int]:
+        # Gap edges, every 10% fill step and the completion threshold, in ticks
+        fractions = [step / 10 for step in range(11)] + [self.fill_threshold]
+        return [self.gap_low_ticks + round(self.gap_size_ticks * fraction) for fraction in fractions]
+
+    async def _calculate_fill_percentage(self, price_ticks: int) -> float:
+        if price_ticks <= self.gap_low_ticks:
             return 0.0
-        if current_price >= self.gap_high:
+        if price_ticks >= self.gap_high_ticks:
             return 1.0
-        return (current_price - self.gap_low) / self.gap_size
-
-    def _get_features(self) -> Any:
-        # Placeholder for gathering features for the ML model
-        return {
-            'gap_size': self.gap_size,
-            'time_since_creation': asyncio.get_event_loop().time() - self.creation_time
-        }
-
-    async def _calculate_fill_probability(self) -> float:
-        """채움 확률 계산 (머신러닝 모델 활용)"""
-        # In a real system, this might be a more complex async operation
-        # e.g., calling a separate prediction service
-        loop = asyncio.get_event_loop()
-        features = self._get_features()
-        return await loop.run_in_executor(
-            None, self._ml_probability_model.predict, features
-        )
-
-    async def _monitor_gap_filling(self):
-        """갭 채움 모니터링"""
-        while not self.is_filled:
-            try:
-                current_price = await self._get_current_price()
-
-                # 갭 내부 가격 진입 확인
-                if self.gap_low <= current_price <= self.gap_high:
-                    old_fill_percentage = self.fill_percentage
-                    self.fill_percentage = await self._calculate_fill_percentage(current_price)
-
-                    if abs(self.fill_percentage - old_fill_percentage) > 0.1:
-                        await self.event_bus.publish(FVGEvent(
-                            event_type="FVG_PARTIAL_FILL",
-                            gap=self,
-                            fill_percentage=self.fill_percentage
-                        ))
-
-                    # 완전 채움 확인
-                    if self.fill_percentage >= 0.95:  # 95% 이상 채워지면 완료로 간주
-                        self.is_filled = True
-                        await self.event_bus.publish(FVGEvent(
-                            event_type="FVG_FILLED",
-                            gap=self
-                        ))
-                        break
-
-                # 채움 확률 실시간 갱신
-                new_probability = await self._calculate_fill_probability()
-                if abs(new_probability - self._fill_probability) > 0.05:
-                    self._fill_probability = new_probability
-                    # Optionally publish an event for probability change
-                    # logger.info(f"FVG fill probability updated to {new_probability:.2f}")
-
-                await asyncio.sleep(0.1)
-
-            except Exception as e:
-                logger.error(f"FVG monitoring error: {e}")
-                await asyncio.sleep(1)
+        return (price_ticks - self.gap_low_ticks) / self.gap_size_ticks
+
+    async def on_price_update(self, price_ticks: int):
+        """갭 채움 처리 (가격 트리거 인덱스에서 경계 교차 시 호출, 가격은 틱 단위)"""
+        if not self.is_active:
+            return
+
+        # 갭 내부 가격 진입 확인
+        if self.gap_low_ticks <= price_ticks <= self.gap_high_ticks:
+            old_fill_percentage = self.fill_percentage
+            self.fill_percentage = await self._calculate_fill_percentage(price_ticks)
+            # 채움이 바뀐 갭만 확률 재평가 대상
+            if self.fill_scorer is not None and self.fill_percentage != old_fill_percentage:
+                self.fill_scorer.mark(self)
+
+            if abs(self.fill_percentage - old_fill_percentage) > self.publish_delta:
+                await self.event_bus.publish(FVGEvent(
+                    event_type="FVG_PARTIAL_FILL",
+                    gap=self,
+                    symbol=self.symbol,
+                    timeframe=self.timeframe,
+                    fill_percentage=self.fill_percentage
+                ), coalesce_key=self.entity_id)
+
+            # 완전 채움 확인
+            if self.fill_percentage >= self.fill_threshold:  # 임계값(기본 95%) 이상 채워지면 완료로 간주
+                self.is_filled = True
+                self.lifecycle = ZoneLifecycle.FILLED
+                await self.event_bus.publish(FVGEvent(
+                    event_type="FVG_FILLED",
+                    gap=self,
+                    symbol=self.symbol,
+                    timeframe=self.timeframe
+                ))
+                return
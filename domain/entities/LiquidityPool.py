@@ -1,9 +1,12 @@
-import asyncio
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from domain.ports.EventBus import EventBus
+from domain.ports.OrderBook import BookSide, OrderBookSource, OrderBookView
 from domain.events.LiquidityEvent import LiquidityEvent
+from domain.entities.EntityId import make_entity_id
+from domain.entities.ZoneLifecycle import ZoneLifecycle
+from domain.services.PriceTicks import TickScale, convert_ticks, scale_for, tick_scale
 
 # --- Placeholder Definitions ---
 
@@ -15,9 +18,7 @@ class TouchPoint:
     # Represents a point where price touched the liquidity level
     pass
 
-class OrderBook:
-    # Represents the current order book state
-    pass
+APPROACH_DISTANCE = 0.5
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -26,74 +27,116 @@ logging.basicConfig(level=logging.INFO)
 
 
 class AsyncLiquidityPool:
-    def __init__(self, price_level: float, pool_type: LiquidityType, event_bus: EventBus):
-        self.price_level = price_level
+    def __init__(self, price_level: float, pool_type: LiquidityType, event_bus: EventBus, symbol: str = "",
+                 creation_time: float = 0.0, order_books: Optional[OrderBookSource] = None):
+        self.symbol = symbol
+        self.creation_time = creation_time
+        # 레벨과 접근 거리는 심볼 틱 단위 정수 (생성 시점의 틱 크기를 함께 보관)
+        scale = tick_scale(symbol)
+        self.tick_size = scale.tick_size
+        self.level_ticks = scale.to_ticks(price_level)
+        self.approach_ticks = scale.to_ticks(APPROACH_DISTANCE)
         self.pool_type = pool_type
         self.touch_points: List[TouchPoint] = []
         self.importance_score = 0.0
+        # 접근 시 레벨 근처에 쌓인 반대편 호가 수량
+        self.resting_size = 0.0
         self.is_swept = False
+        self.lifecycle = ZoneLifecycle.ACTIVE
+        self.entity_id = make_entity_id("POOL", symbol, pool_type, self.level_ticks)
         self.event_bus = event_bus
-        self._monitoring_task: Optional[asyncio.Task] = None
-
-    async def start_monitoring(self):
-        """유동성 풀 모니터링 시작"""
-        self._monitoring_task = asyncio.create_task(self._monitor_liquidity_interactions())
-
-    async def _get_current_price(self) -> float:
-        # Placeholder for getting live price data
-        await asyncio.sleep(0.05) # High frequency check
-        return self.price_level + 0.1 # Simulate price moving near the pool
-
-    async def _get_current_order_book(self) -> OrderBook:
-        # Placeholder for getting live order book data
-        await asyncio.sleep(0.01)
-        return OrderBook()
-
-    def _is_price_approaching(self, price: float) -> bool:
+        self.order_books = order_books
+
+    def __getstate__(self):
+        # Sent across processes as a detached record; the bus and order books stay behind
+        state = self.__dict__.copy()
+        state['event_bus'] = None
+        state['order_books'] = None
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], event_bus: EventBus,
+                   order_books: Optional[OrderBookSource] = None) -> "AsyncLiquidityPool":
+        """Rebuilds a live pool from its __getstate__ record (state snapshot restore)."""
+        pool = cls.__new__(cls)
+        pool.resting_size = 0.0
+        pool.__dict__.update(state)
+        pool.event_bus = event_bus
+        pool.order_books = order_books
+        # 저장 후 심볼 틱 크기가 바뀌었으면 레벨을 새 틱 단위로 변환
+        current = tick_scale(pool.symbol)
+        saved = scale_for(state.get('tick_size', current.tick_size))
+        if saved is not current:
+            pool.level_ticks = convert_ticks(pool.level_ticks, saved, current)
+            pool.approach_ticks = current.to_ticks(APPROACH_DISTANCE)
+        pool.tick_size = current.tick_size
+        return pool
+
+    @property
+    def is_active(self) -> bool:
+        return self.lifecycle == ZoneLifecycle.ACTIVE
+
+    def expire(self):
+        """Ends the zone without an outcome (zone registry age/count cap)."""
+        if self.is_active:
+            self.lifecycle = ZoneLifecycle.EXPIRED
+
+    @property
+    def scale(self) -> TickScale:
+        return scale_for(self.tick_size)
+
+    @property
+    def price_level(self) -> float:
+        return self.scale.to_price(self.level_ticks)
+
+    def trigger_levels(self) -> List[int]:
+        # Entering/leaving the approach band and crossing the level itself, in ticks
+        return [self.level_ticks - self.approach_ticks, self.level_ticks, self.level_ticks + self.approach_ticks]
+
+    def _get_current_order_book(self) -> Optional[OrderBookView]:
+        # Shared local book of the symbol, None until it is in sync
+        return self.order_books.book(self.symbol) if self.order_books is not None else None
+
+    def _is_price_approaching(self, price_ticks: int) -> bool:
         # Simple logic to check if price is near the pool
-        return abs(self.price_level - price) < 0.5
+        return abs(self.level_ticks - price_ticks) < self.approach_ticks
 
-    async def _handle_liquidity_approach(self, current_price: float, order_book: OrderBook):
-        # Placeholder for logic when price approaches the pool
-        print(f"Price {current_price} approaching liquidity pool at {self.price_level}")
-        # In a real implementation, this would analyze order book depth, etc.
-        pass
+    async def _handle_liquidity_approach(self, price_ticks: int, order_book: Optional[OrderBookView]):
+        print(f"Price {self.scale.to_price(price_ticks)} approaching liquidity pool at {self.price_level}")
+        if order_book is not None:
+            # BSL 위로는 매도 호가, SSL 아래로는 매수 호가가 가격을 받아냄
+            side = BookSide.ASK if self.pool_type == LiquidityType.BSL else BookSide.BID
+            self.resting_size = order_book.size_within(side, self.level_ticks, self.approach_ticks)
 
-    async def _detect_liquidity_sweep(self, current_price: float) -> Optional[dict]:
+    async def _detect_liquidity_sweep(self, price_ticks: int) -> Optional[dict]:
         # Placeholder for sweep detection logic
         # A sweep happens when price moves just beyond the level and then reverses
-        if self.pool_type == LiquidityType.BSL and current_price > self.price_level:
+        if self.pool_type == LiquidityType.BSL and price_ticks > self.level_ticks:
             print(f"Potential BSL sweep at {self.price_level}")
-            return {'sweep_price': current_price}
-        if self.pool_type == LiquidityType.SSL and current_price < self.price_level:
+            return {'sweep_price': self.scale.to_price(price_ticks)}
+        if self.pool_type == LiquidityType.SSL and price_ticks < self.level_ticks:
             print(f"Potential SSL sweep at {self.price_level}")
-            return {'sweep_price': current_price}
+            return {'sweep_price': self.scale.to_price(price_ticks)}
         return None
 
-    async def _monitor_liquidity_interactions(self):
-        """유동성 상호작용 모니터링"""
-        while not self.is_swept:
-            try:
-                current_price = await self._get_current_price()
-                order_book = await self._get_current_order_book()
-
-                # 가격이 유동성 레벨에 접근했는지 확인
-                if self._is_price_approaching(current_price):
-                    await self._handle_liquidity_approach(current_price, order_book)
-
-                # 유동성 사냥 탐지
-                sweep_detected = await self._detect_liquidity_sweep(current_price)
-                if sweep_detected:
-                    self.is_swept = True
-                    await self.event_bus.publish(LiquidityEvent(
-                        event_type="LIQUIDITY_SWEPT",
-                        pool=self,
-                        sweep_data=sweep_detected
-                    ))
-                    break # Stop monitoring after a sweep
-
-                await asyncio.sleep(0.05)  # 50ms마다 체크 (고빈도)
-
-            except Exception as e:
-                logger.error(f"Liquidity monitoring error: {e}")
-                await asyncio.sleep(1)
+    async def on_price_update(self, price_ticks: int):
+        """유동성 상호작용 처리 (가격 트리거 인덱스에서 경계 교차 시 호출, 가격은 틱 단위)"""
+        if not self.is_active:
+            return
+
+        # 가격이 유동성 레벨에 접근했는지 확인
+        if self._is_price_approaching(price_ticks):
+            order_book = self._get_current_order_book()
+            await self._handle_liquidity_approach(price_ticks, order_book)
+
+        # 유동성 사냥 탐지
+        sweep_detected = await self._detect_liquidity_sweep(price_ticks)
+        if sweep_detected:
+            self.is_swept = True
+            self.lifecycle = ZoneLifecycle.SWEPT
+            await self.event_bus.publish(LiquidityEvent(
+                event_type="LIQUIDITY_SWEPT",
+                pool=self,
+                sweep_data=sweep_detected,
+                symbol=self.symbol
+            ))
@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class Candle:
+    """단일 캔들 (kline) - 피드에서 한 번만 디코딩되어 모든 탐지기가 공유"""
+    high: float
+    low: float
+    timestamp: float  # 캔들 시작 시각 (epoch seconds)
+    open: float = 0.0
+    close: float = 0.0
+    volume: float = 0.0
+    is_closed: bool = True
+    # 공유 히스토리 내 순번 - 피드가 전달 시 기록 (ColumnarRingBuffer.append_row)
+    sequence: Optional[int] = field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class PriceTick:
+    """단일 체결 가격 업데이트"""
+    price: float
+    timestamp: float
+    quantity: float = 0.0
@@ -1,45 +1,93 @@
 import asyncio
 import logging
-from typing import List, Set, Optional, Dict
-from collections import deque
+from typing import Any, List, Optional, Set, Dict, Tuple
+
+import numpy as np
 
 # Import from our new modules
 # Assuming the project root is in the PYTHONPATH
 from domain.ports.EventBus import EventBus
+from domain.ports.MarketDataFeed import CandleHistorySource, MarketDataFeed, MarketStream
 from domain.events.MarketEvents import MarketStructureEvent
+from domain.entities.MarketData import Candle
+from domain.services.SwingPointDetector import SwingPoint
+from domain.services.MarketStructureEngine import MarketStructureEngine
+from domain.services.BatchDetectors import structure_state
+from domain.services.Timeframe import timeframe_seconds
+from domain.services.ColumnarRingBuffer import CandleWindow
 
-# --- Placeholder Definitions (to be moved later) ---
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
 
-class SwingPoint:
-    pass
 
-class TrendDirection:
-    UNKNOWN = "UNKNOWN"
-    BULLISH = "BULLISH"
-    BEARISH = "BEARISH"
+class AsyncMarketStructure:
+    """
+    Market structure of every analysed symbol/timeframe. Each closed candle is
+    applied inline to that pair's MarketStructureEngine. When the stream skips
+    bars, the missing ones are fetched from `gap_source` and applied (in an
+    executor) before the candle that revealed the gap; without a source the
+    engine continues across the gap.
+    """
+
+    def __init__(self, event_bus: EventBus, market_data: MarketDataFeed, swing_strength: int = 2,
+                 gap_source: Optional[CandleHistorySource] = None): # Depends on the interfaces
+        self.event_bus = event_bus
+        self.market_data = market_data
+        self.swing_strength = swing_strength
+        self.gap_source = gap_source
+        self.engines: Dict[Tuple[str, str], MarketStructureEngine] = {}
+        self._analysis_tasks: Set[asyncio.Task] = set()
 
-class Candle:
-    pass
+    def swing_highs(self, symbol: str, timeframe: str) -> List[SwingPoint]:
+        return list(self._engine(symbol, timeframe).swing_highs)
 
-class BOS:
-    pass
+    def swing_lows(self, symbol: str, timeframe: str) -> List[SwingPoint]:
+        return list(self._engine(symbol, timeframe).swing_lows)
 
-class CHoCH:
-    pass
+    def current_trend(self, symbol: str, timeframe: str) -> str:
+        return self._engine(symbol, timeframe).current_trend
 
-logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+    def _engine(self, symbol: str, timeframe: str) -> MarketStructureEngine:
+        key = (symbol, timeframe)
+        engine = self.engines.get(key)
+        if engine is None:
+            engine = self.engines[key] = MarketStructureEngine(self.swing_strength)
+        return engine
 
-# --- End of Placeholder Definitions ---
+    async def seed_history(self, symbol: str, timeframe: str, candles: CandleWindow):
+        """
+        백필 캔들 중 엔진이 아직 보지 않은 것을 적용 (과거 BOS/CHoCH는 발행하지 않음).
+        새 엔진은 배치 탐지기로 한 번에 구성
+        """
+        engine = self.engines.get((symbol, timeframe))
+        if engine is None or engine.last_timestamp is None:
+            columns = candles.high, candles.low, candles.close, candles.timestamp / 1000
 
+            def build():
+                state = structure_state(*columns, strength=self.swing_strength)
+                return MarketStructureEngine.from_state(state, self.swing_strength)
 
-class AsyncMarketStructure:
-    def __init__(self, event_bus: EventBus): # Depends on the interface
-        self.swing_highs: List[SwingPoint] = []
-        self.swing_lows: List[SwingPoint] = []
-        self.current_trend: TrendDirection = TrendDirection.UNKNOWN
-        self.event_bus = event_bus
-        self._analysis_tasks: Set[asyncio.Task] = set()
+            self.engines[(symbol, timeframe)] = await asyncio.get_running_loop().run_in_executor(None, build)
+            return
+
+        start = int(np.searchsorted(candles.timestamp, round(engine.last_timestamp * 1000), side='right'))
+        highs, lows, closes = candles.high[start:].tolist(), candles.low[start:].tolist(), candles.close[start:].tolist()
+        timestamps = (candles.timestamp[start:] / 1000).tolist()
+
+        def apply():
+            for high, low, close, timestamp in zip(highs, lows, closes, timestamps):
+                engine.update(high, low, close, timestamp)
+
+        await asyncio.get_running_loop().run_in_executor(None, apply)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Engine state per symbol/timeframe (StateSnapshotter provider)."""
+        return {f"{symbol}/{timeframe}": engine.state() for (symbol, timeframe), engine in self.engines.items()}
+
+    async def restore_state(self, sections: Dict[str, Any]):
+        for name, state in sections.items():
+            symbol, timeframe = name.rsplit("/", 1)
+            self.engines[(symbol, timeframe)] = MarketStructureEngine.from_state(state, self.swing_strength)
 
     async def start_real_time_analysis(self, symbols: List[str], timeframes: List[str]):
         """실시간 다중 심볼/시간대 구조 분석 시작"""
@@ -50,62 +98,54 @@ class AsyncMarketStructure:
                 )
                 self._analysis_tasks.add(task)
 
+    async def wait_for_analysis(self):
+        """Waits on the tasks started by start_real_time_analysis (they run until cancelled)."""
+        await asyncio.gather(*self._analysis_tasks)
+
     async def _get_candle_stream(self, symbol: str, timeframe: str):
-        # This is a placeholder async generator
-        # In a real implementation, this would connect to a WebSocket
-        for i in range(10):
-            await asyncio.sleep(1)
-            yield Candle() # Yielding a dummy Candle object
+        # Shared per-symbol feed; structure is only updated on closed candles
+        async for candle in self.market_data.stream(symbol, MarketStream.kline(timeframe)):
+            if candle.is_closed:
+                yield candle
 
     async def _continuous_structure_analysis(self, symbol: str, timeframe: str):
         """지속적인 구조 분석 (백그라운드 코루틴)"""
+        interval = timeframe_seconds(timeframe)
         while True:
             try:
                 # WebSocket에서 실시간 캔들 데이터 수신
                 async for candle in self._get_candle_stream(symbol, timeframe):
-                    # BOS 탐지
-                    bos_result = await self._detect_break_of_structure_async(candle)
-                    if bos_result:
-                        await self.event_bus.publish(MarketStructureEvent(
-                            symbol=symbol, timeframe=timeframe,
-                            event_type="BOS_DETECTED", data=bos_result
-                        ))
+                    engine = self._engine(symbol, timeframe)
+                    last_timestamp = engine.last_timestamp
+                    if last_timestamp is not None and candle.timestamp <= last_timestamp:
+                        continue  # 재전송된 캔들
 
-                    # CHoCH 탐지
-                    choch_result = await self._detect_change_of_character_async(candle)
-                    if choch_result:
+                    # 피드 공백 - 빠진 봉을 먼저 채워 적용
+                    if last_timestamp is not None and candle.timestamp - last_timestamp > interval:
+                        await self._refill_gap(symbol, timeframe, candle, last_timestamp, interval)
+
+                    # BOS/CHoCH 탐지 (증분 갱신, 이벤트 루프에서 바로 처리)
+                    for result in engine.update(candle.high, candle.low, candle.close, candle.timestamp):
                         await self.event_bus.publish(MarketStructureEvent(
                             symbol=symbol, timeframe=timeframe,
-                            event_type="CHOCH_DETECTED", data=choch_result
+                            event_type=result.event_type, data=result
                         ))
 
             except Exception as e:
                 logger.error(f"Structure analysis error for {symbol}_{timeframe}: {e}")
                 await asyncio.sleep(5)  # 에러 복구 대기
 
-    def _calculate_bos(self, candle: Candle) -> Optional[BOS]:
-        # Placeholder for CPU-intensive calculation
-        print("Calculating BOS...")
-        return BOS() # Dummy result
-
-    async def _detect_break_of_structure_async(self, candle: Candle) -> Optional[BOS]:
-        """비동기 BOS 탐지"""
-        # CPU 집약적 작업을 executor에서 실행
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, self._calculate_bos, candle
-        )
-
-    def _calculate_choch(self, candle: Candle) -> Optional[CHoCH]:
-        # Placeholder for CPU-intensive calculation
-        print("Calculating CHoCH...")
-        return CHoCH() # Dummy result
-
-    async def _detect_change_of_character_async(self, candle: Candle) -> Optional[CHoCH]:
-        """비동기 CHoCH 탐지"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, self._calculate_choch, candle
-        )
-
-
+    async def _refill_gap(self, symbol: str, timeframe: str, candle: Candle, last_timestamp: float, interval: int):
+        """빠진 봉을 gap_source에서 받아 엔진에 적용 (과거 BOS/CHoCH는 발행하지 않음)"""
+        missing = round((candle.timestamp - last_timestamp) / interval) - 1
+        if self.gap_source is None:
+            logger.warning(f"Candle gap on {symbol} {timeframe}: {missing} bars missing; continuing across it.")
+            return
+        try:
+            candles = await self.gap_source.candles(symbol, timeframe, last_timestamp + interval,
+                                                    candle.timestamp - interval)
+        except Exception as e:
+            logger.error(f"Refilling {missing} missing {symbol} {timeframe} bars failed: {e}")
+            return
+        logger.warning(f"Candle gap on {symbol} {timeframe}: refilled {len(candles)} of {missing} missing bars.")
+        await self.seed_history(symbol, timeframe, candles)
@@ -5,15 +5,13 @@ from typing import List, Optional, Dict, Set, Any
 # Assuming EventBus interface is what we need
 from domain.ports.EventBus import EventBus
 from domain.events.OrderBlockEvent import OrderBlockEvent
+from domain.entities.MarketData import Candle
+from domain.entities.EntityId import make_entity_id
+from domain.entities.ZoneLifecycle import ZoneLifecycle
+from domain.services.PriceTicks import TickScale, convert_ticks, scale_for, tick_scale
 
 # --- Placeholder Definitions (to be moved or implemented) ---
 
-class Candle:
-    def __init__(self, high: float, low: float, timestamp: float):
-        self.high = high
-        self.low = low
-        self.timestamp = timestamp
-
 class OrderBlockType:
     BULLISH = "BULLISH"
     BEARISH = "BEARISH"
@@ -25,37 +23,91 @@ logging.basicConfig(level=logging.INFO)
 
 
 class AsyncOrderBlock:
-    def __init__(self, candle: Candle, block_type: OrderBlockType, event_bus: EventBus):
+    def __init__(self, candle: Candle, block_type: OrderBlockType, event_bus: EventBus,
+                 symbol: str = "", timeframe: str = "", validity_delta: float = 0.1):
+        self.symbol = symbol
+        self.timeframe = timeframe
         self.origin_candle = candle
-        self.high = candle.high
-        self.low = candle.low
+        # 블록 경계는 심볼 틱 단위 정수 (생성 시점의 틱 크기를 함께 보관)
+        scale = tick_scale(symbol)
+        self.tick_size = scale.tick_size
+        self.high_ticks = scale.to_ticks(candle.high)
+        self.low_ticks = scale.to_ticks(candle.low)
         self.block_type = block_type
         self.validity_score = 0.0
         self.touch_count = 0
         self.creation_time = candle.timestamp
         self.event_bus = event_bus
-        self._monitoring_task: Optional[asyncio.Task] = None
-        self.is_invalidated = False # Added for loop control
-
-    async def start_monitoring(self):
-        """Order Block 모니터링 시작"""
-        self._monitoring_task = asyncio.create_task(self._monitor_price_action())
-
-    async def _get_current_price(self) -> float:
-        # Placeholder for getting live price data
-        await asyncio.sleep(0.1)
-        return (self.high + self.low) / 2 # Simulate price moving around the block
-
-    def is_price_in_block(self, price: float) -> bool:
-        return self.low <= price <= self.high
-
-    async def _handle_block_touch(self, current_price: float):
+        self.is_invalidated = False
+        self.lifecycle = ZoneLifecycle.ACTIVE
+        self.validity_delta = validity_delta
+        self.entity_id = make_entity_id("OB", symbol, timeframe, self.creation_time, block_type,
+                                        self.low_ticks, self.high_ticks)
+
+    def __getstate__(self):
+        # Sent across processes as a detached record; the bus stays behind
+        state = self.__dict__.copy()
+        state['event_bus'] = None
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], event_bus: EventBus) -> "AsyncOrderBlock":
+        """Rebuilds a live block from its __getstate__ record (state snapshot restore)."""
+        block = cls.__new__(cls)
+        block.__dict__.update(state)
+        block.event_bus = event_bus
+        # 저장 후 심볼 틱 크기가 바뀌었으면 경계를 새 틱 단위로 변환
+        current = tick_scale(block.symbol)
+        saved = scale_for(state.get('tick_size', current.tick_size))
+        block.high_ticks = convert_ticks(block.high_ticks, saved, current)
+        block.low_ticks = convert_ticks(block.low_ticks, saved, current)
+        block.tick_size = current.tick_size
+        return block
+
+    @property
+    def is_active(self) -> bool:
+        return self.lifecycle == ZoneLifecycle.ACTIVE
+
+    def expire(self):
+        """Ends the zone without an outcome (zone registry age/count cap)."""
+        if self.is_active:
+            self.lifecycle = ZoneLifecycle.EXPIRED
+
+    @property
+    def scale(self) -> TickScale:
+        return scale_for(self.tick_size)
+
+    @property
+    def high(self) -> float:
+        return self.scale.to_price(self.high_ticks)
+
+    @property
+    def low(self) -> float:
+        return self.scale.to_price(self.low_ticks)
+
+    def trigger_levels(self) -> List[int]:
+        # Touches can only begin when price crosses one of the block edges
+        return [self.low_ticks, self.high_ticks]
+
+    def is_price_in_block(self, price_ticks: int) -> bool:
+        return self.low_ticks <= price_ticks <= self.high_ticks
+
+    def is_broken_by(self, price_ticks: int) -> bool:
+        # 강세 블록은 하단 아래, 약세 블록은 상단 위로 관통되면 무효
+        if self.block_type == OrderBlockType.BULLISH:
+            return price_ticks < self.low_ticks
+        return price_ticks > self.high_ticks
+
+    async def _handle_block_touch(self, price_ticks: int):
         # Placeholder for logic when price touches the block
-        print(f"Price {current_price} touched Order Block.")
+        touch_price = self.scale.to_price(price_ticks)
+        print(f"Price {touch_price} touched Order Block.")
         await self.event_bus.publish(OrderBlockEvent(
             event_type="BLOCK_TOUCHED",
             order_block=self,
-            data={'touch_price': current_price}
+            data={'touch_price': touch_price},
+            symbol=self.symbol,
+            timeframe=self.timeframe
         ))
 
     def _calculate_validity_sync(self) -> float:
@@ -70,28 +122,33 @@ class AsyncOrderBlock:
             None, self._calculate_validity_sync
         )
 
-    async def _monitor_price_action(self):
-        """가격 반응 모니터링 (백그라운드 코루틴)"""
-        while not self.is_invalidated:
-            try:
-                current_price = await self._get_current_price()
-
-                if self.is_price_in_block(current_price):
-                    self.touch_count += 1
-                    await self._handle_block_touch(current_price)
-
-                # 유효성 점수 비동기 갱신
-                new_validity = await self._calculate_validity_async()
-                if abs(new_validity - self.validity_score) > 0.1:
-                    self.validity_score = new_validity
-                    await self.event_bus.publish(OrderBlockEvent(
-                        event_type="VALIDITY_UPDATED",
-                        order_block=self,
-                        data={'new_validity': new_validity}
-                    ))
-
-                await asyncio.sleep(0.1)  # 100ms마다 체크
-
-            except Exception as e:
-                logger.error(f"Order Block monitoring error: {e}")
-                await asyncio.sleep(1)
+    async def on_price_update(self, price_ticks: int):
+        """가격 반응 처리 (가격 트리거 인덱스에서 경계 교차 시 호출, 가격은 틱 단위)"""
+        if not self.is_active:
+            return
+        if self.is_broken_by(price_ticks):
+            self.is_invalidated = True
+            self.lifecycle = ZoneLifecycle.INVALIDATED
+            await self.event_bus.publish(OrderBlockEvent(
+                event_type="BLOCK_INVALIDATED",
+                order_block=self,
+                data={'break_price': self.scale.to_price(price_ticks)},
+                symbol=self.symbol,
+                timeframe=self.timeframe
+            ))
+            return
+        if self.is_price_in_block(price_ticks):
+            self.touch_count += 1
+            await self._handle_block_touch(price_ticks)
+
+            # 유효성 점수 비동기 갱신
+            new_validity = await self._calculate_validity_async()
+            if abs(new_validity - self.validity_score) > self.validity_delta:
+                self.validity_score = new_validity
+                await self.event_bus.publish(OrderBlockEvent(
+                    event_type="VALIDITY_UPDATED",
+                    order_block=self,
+                    data={'new_validity': new_validity},
+                    symbol=self.symbol,
+                    timeframe=self.timeframe
+                ), coalesce_key=self.entity_id)
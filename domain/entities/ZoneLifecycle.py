@@ -0,0 +1,14 @@
+class ZoneLifecycle:
+    """
+    States of an FVG, Order Block or Liquidity Pool. A zone starts ACTIVE and
+    ends in exactly one terminal state: its own outcome, or EXPIRED when the
+    zone registry drops it for age or count.
+    """
+    ACTIVE = "ACTIVE"
+    FILLED = "FILLED"            # FVG
+    INVALIDATED = "INVALIDATED"  # Order Block
+    SWEPT = "SWEPT"              # Liquidity Pool
+    EXPIRED = "EXPIRED"
+
+    # Archive codes (index = int8 code)
+    ALL = (ACTIVE, FILLED, INVALIDATED, SWEPT, EXPIRED)
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+# Detached zone state carried by events once they leave the process that owns
+# the live entity (decoded from the binary codec). Attribute names match the
+# live Async* entities, so consumers read either one the same way.
+
+
+@dataclass
+class FairValueGapRecord:
+    entity_id: int
+    gap_high: float
+    gap_low: float
+    creation_time: float
+    fill_percentage: float = 0.0
+    is_filled: bool = False
+    symbol: str = ""
+    timeframe: str = ""
+
+    @property
+    def is_active(self) -> bool:
+        return not self.is_filled
+
+
+@dataclass
+class OrderBlockRecord:
+    entity_id: int
+    high: float
+    low: float
+    block_type: str
+    creation_time: float
+    validity_score: float = 0.0
+    touch_count: int = 0
+    is_invalidated: bool = False
+    symbol: str = ""
+    timeframe: str = ""
+
+    @property
+    def is_active(self) -> bool:
+        return not self.is_invalidated
+
+
+@dataclass
+class LiquidityPoolRecord:
+    entity_id: int
+    price_level: float
+    pool_type: str
+    importance_score: float = 0.0
+    is_swept: bool = False
+    symbol: str = ""
+
+    @property
+    def is_active(self) -> bool:
+        return not self.is_swept
@@ -0,0 +1,11 @@
+class EventPriority:
+    """
+    Delivery lanes of the event bus, highest priority first.
+    Every event class declares its default lane as a `priority` class attribute.
+    """
+    EXECUTION = 0  # 주문 체결/취소 등 주문 경로
+    RISK = 1       # 리스크 경고, 긴급 청산
+    SIGNALS = 2    # 구조 변화, 시간 기반 시그널
+    ANALYTICS = 3  # 존 터치, 부분 채움 등 분석 텔레메트리
+
+    LANES = (EXECUTION, RISK, SIGNALS, ANALYTICS)
@@ -1,12 +1,21 @@
 from dataclasses import dataclass, field
 import time
-from typing import Any
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import make_topic
 
 @dataclass
 class FVGEvent:
+    priority: ClassVar[int] = EventPriority.ANALYTICS
+
     event_type: str
     gap: Any
     symbol: str = ""
     timeframe: str = ""
     fill_percentage: float = 0.0
     timestamp: float = field(default_factory=time.time)
+
+    @property
+    def topic(self) -> str:
+        return make_topic(self.event_type, self.symbol, self.timeframe)
@@ -1,10 +1,19 @@
 from dataclasses import dataclass, field
 import datetime
-from typing import Any
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import make_topic
 
 @dataclass
 class KillZoneEvent:
+    priority: ClassVar[int] = EventPriority.SIGNALS
+
     event_type: str # e.g., "ZONE_STATE_CHANGE"
     zone_name: str
     new_state: Any # Could be a simple string or a state object
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
+
+    @property
+    def topic(self) -> str:
+        return make_topic(self.event_type, self.zone_name)
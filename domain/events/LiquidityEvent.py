@@ -1,11 +1,21 @@
 from dataclasses import dataclass, field
 import time
-from typing import Any
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import make_topic
 
 @dataclass
 class LiquidityEvent:
+    priority: ClassVar[int] = EventPriority.ANALYTICS
+
     event_type: str
     pool: Any = None
     correlation_data: Any = None
     sweep_data: Any = None
+    symbol: str = ""
     timestamp: float = field(default_factory=time.time)
+
+    @property
+    def topic(self) -> str:
+        return make_topic(self.event_type, self.symbol)
@@ -1,9 +1,13 @@
 from dataclasses import dataclass, field
 import datetime
-from typing import Any
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
 
 @dataclass
 class MacroTimeEvent:
+    priority: ClassVar[int] = EventPriority.ANALYTICS
+
     event_type: str # e.g., "MACRO_CYCLE_UPDATE"
     cycle_position: Any
     analysis: Any
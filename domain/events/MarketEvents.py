@@ -1,11 +1,20 @@
 from dataclasses import dataclass, field
 import time
-from typing import Any
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import make_topic
 
 @dataclass
 class MarketStructureEvent:
+    priority: ClassVar[int] = EventPriority.SIGNALS
+
     symbol: str
     timeframe: str
     event_type: str  # e.g., "BOS_DETECTED", "CHOCH_DETECTED"
     data: Any
     timestamp: float = field(default_factory=time.time)
+
+    @property
+    def topic(self) -> str:
+        return make_topic(self.event_type, self.symbol, self.timeframe)
@@ -1,10 +1,21 @@
 from dataclasses import dataclass, field
 import time
-from typing import Any
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import make_topic
 
 @dataclass
 class OrderBlockEvent:
+    priority: ClassVar[int] = EventPriority.ANALYTICS
+
     event_type: str
     order_block: Any
     data: dict = field(default_factory=dict)
+    symbol: str = ""
+    timeframe: str = ""
     timestamp: float = field(default_factory=time.time)
+
+    @property
+    def topic(self) -> str:
+        return make_topic(self.event_type, self.symbol, self.timeframe)
@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+import time
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import make_topic
+
+@dataclass
+class OrderEvent:
+    priority: ClassVar[int] = EventPriority.EXECUTION
+
+    event_type: str # e.g., "ORDER_FILLED", "ORDER_CANCELLED"
+    symbol: str = ""
+    order_id: str = ""
+    data: Any = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def topic(self) -> str:
+        return make_topic(self.event_type, self.symbol)
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+import time
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import make_topic
+
+@dataclass
+class RiskEvent:
+    priority: ClassVar[int] = EventPriority.RISK
+
+    event_type: str # e.g., "RISK_LIMIT_BREACHED", "EMERGENCY_CLOSE"
+    symbol: str = ""
+    data: Any = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def topic(self) -> str:
+        return make_topic(self.event_type, self.symbol)
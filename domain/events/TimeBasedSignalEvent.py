@@ -1,9 +1,13 @@
 from dataclasses import dataclass, field
 import datetime
-from typing import Any
+from typing import Any, ClassVar
+
+from domain.events.EventPriority import EventPriority
 
 @dataclass
 class TimeBasedSignalEvent:
+    priority: ClassVar[int] = EventPriority.SIGNALS
+
     event_type: str # e.g., "HIGH_PROBABILITY_TIME"
     signal: Any
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
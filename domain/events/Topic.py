@@ -0,0 +1,33 @@
+from typing import Tuple
+
+SEPARATOR = "."
+WILDCARD = "*"
+
+
+def make_topic(event_type: str, *segments: str) -> str:
+    """
+    Builds a hierarchical topic such as "NEW_FVG_DETECTED.BTCUSDT.5m".
+    Segments stop at the first empty one, so an event without a symbol is
+    published on its bare event type.
+    """
+    parts = [event_type]
+    for segment in segments:
+        if not segment:
+            break
+        parts.append(segment)
+    return SEPARATOR.join(parts)
+
+
+def split_topic(topic: str) -> Tuple[str, ...]:
+    return tuple(topic.split(SEPARATOR))
+
+
+def topic_matches(pattern: Tuple[str, ...], topic: Tuple[str, ...]) -> bool:
+    """
+    A pattern matches every topic it is a prefix of; "*" matches any single
+    segment. "NEW_FVG_DETECTED" therefore receives every symbol and timeframe,
+    "NEW_FVG_DETECTED.BTCUSDT" only BTCUSDT, "*.BTCUSDT.5m" every BTCUSDT 5m event.
+    """
+    if len(pattern) > len(topic):
+        return False
+    return all(p == WILDCARD or p == t for p, t in zip(pattern, topic))
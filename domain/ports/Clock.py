@@ -0,0 +1,30 @@
+import datetime
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class Clock(ABC):
+    """
+    Defines the interface for reading the current time.
+    Time-driven components ask the injected clock instead of the system, so
+    the same code runs live and in a historical replay on virtual time.
+    Waiting is left to asyncio.sleep: in a replay the event loop itself
+    advances virtual time.
+    """
+
+    @abstractmethod
+    def time(self) -> float:
+        """Current Unix time in seconds."""
+        raise NotImplementedError
+
+    def now(self, tz: Optional[datetime.tzinfo] = None) -> datetime.datetime:
+        """Current time as a datetime, naive local time unless `tz` is given (like datetime.now)."""
+        return datetime.datetime.fromtimestamp(self.time(), tz)
+
+
+class SystemClock(Clock):
+    """Wall-clock time; the default for live trading."""
+
+    def time(self) -> float:
+        return time.time()
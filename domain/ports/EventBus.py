@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from typing import Any, Callable, Hashable, Optional
+
+
+class OverflowPolicy:
+    """What a subscriber's mailbox does when it is full."""
+    BLOCK = "block"              # publisher waits until the subscriber catches up (opt-in)
+    DROP_OLDEST = "drop_oldest"  # the oldest pending event is discarded
+    DROP_NEWEST = "drop_newest"  # the incoming event is discarded
+
 
 class EventBus(ABC):
     """
@@ -8,22 +16,33 @@ class EventBus(ABC):
     """
 
     @abstractmethod
-    async def publish(self, event: Any):
+    async def publish(self, event: Any, coalesce_key: Optional[Hashable] = None,
+                      priority: Optional[int] = None):
         """
         Publish an event to the bus.
 
         Args:
             event: The event object to publish.
+            coalesce_key: Identifies the entity a state update belongs to. A newer
+                event with the same (event_type, coalesce_key) replaces one that
+                is still pending, so only the latest state is delivered.
+            priority: EventPriority lane; defaults to the lane declared by the
+                event class.
         """
         raise NotImplementedError
 
     @abstractmethod
-    async def subscribe(self, event_type: str, handler: Callable):
+    async def subscribe(self, event_type: str, handler: Callable,
+                        maxsize: int = 1000, overflow: str = OverflowPolicy.DROP_OLDEST):
         """
-        Subscribe a handler to a specific event type.
+        Subscribe a handler to a specific event type or topic pattern.
 
         Args:
-            event_type: The type of event to subscribe to.
+            event_type: The type of event to subscribe to, optionally narrowed
+                to a topic such as "NEW_FVG_DETECTED.BTCUSDT.5m" ("*" matches
+                any single segment).
             handler: The coroutine function to handle the event.
+            maxsize: Capacity of the subscriber's own mailbox.
+            overflow: OverflowPolicy applied when the mailbox is full.
         """
         raise NotImplementedError
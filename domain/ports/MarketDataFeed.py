@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator
+
+from domain.services.ColumnarRingBuffer import CandleRingBuffer, CandleWindow
+
+
+class MarketStream:
+    """Stream type names, following the Binance stream naming convention."""
+    TRADE = "aggTrade"
+    # Order book diffs (depthUpdate events), consumed by the local order books
+    DEPTH = "depth@100ms"
+
+    @staticmethod
+    def kline(timeframe: str) -> str:
+        return f"kline_{timeframe}"
+
+
+class MarketDataFeed(ABC):
+    """
+    Defines the interface for a shared market data feed.
+    Detectors and entities depend on this abstraction instead of opening
+    their own exchange connections.
+    """
+
+    @abstractmethod
+    def stream(self, symbol: str, stream_type: str) -> AsyncIterator[Any]:
+        """
+        Iterate over decoded messages of one (symbol, stream type) pair.
+
+        Args:
+            symbol: The trading symbol, e.g. "BTCUSDT".
+            stream_type: The stream type, e.g. MarketStream.kline("5m").
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def candle_history(self, symbol: str, timeframe: str) -> CandleRingBuffer:
+        """
+        Shared columnar history of closed candles for (symbol, timeframe).
+        The feed appends each closed candle before delivering it to stream
+        consumers, so a consumer can read the window ending at its candle.
+        """
+        raise NotImplementedError
+
+
+class CandleHistorySource(ABC):
+    """Closed candles of a past time range, e.g. to refill a gap in a live stream."""
+
+    @abstractmethod
+    async def candles(self, symbol: str, timeframe: str, start: float, end: float) -> CandleWindow:
+        """Closed candles of (symbol, timeframe) opened in [start, end] (epoch seconds), oldest first."""
+        raise NotImplementedError
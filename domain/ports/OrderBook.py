@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class BookSide:
+    BID = "bid"
+    ASK = "ask"
+
+
+class OrderBookView(ABC):
+    """
+    Read side of a symbol's order book. Prices are in the symbol's ticks
+    (domain.services.PriceTicks), like zone levels.
+    """
+
+    @abstractmethod
+    def best_bid(self) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def best_ask(self) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def size_between(self, side: str, low_ticks: int, high_ticks: int) -> float:
+        """Total resting size of one side (BookSide) at prices in [low_ticks, high_ticks]."""
+        raise NotImplementedError
+
+    def size_within(self, side: str, level_ticks: int, ticks: int) -> float:
+        """Resting size of one side within `ticks` of a level."""
+        return self.size_between(side, level_ticks - ticks, level_ticks + ticks)
+
+
+class OrderBookSource(ABC):
+    """Shared per-symbol order books, so zones never request depth themselves."""
+
+    @abstractmethod
+    def book(self, symbol: str) -> Optional[OrderBookView]:
+        """The symbol's book while it is in sync with the exchange, else None."""
+        raise NotImplementedError
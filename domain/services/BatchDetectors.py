@@ -0,0 +1,194 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from domain.services.MarketStructureEngine import TrendDirection
+from domain.services.PriceTicks import TickScale
+from domain.services.SwingPointDetector import SwingPoint, SwingType
+
+# Vectorized counterparts of the streaming detectors, for backfill and bulk
+# re-analysis. Each takes whole OHLC columns (oldest first, e.g. the views of a
+# CandleRingBuffer or a candle archive) and returns a structured array with one
+# row per detection, identical to what the streaming code produces candle by
+# candle. Timestamps are passed through in the caller's unit.
+
+BULLISH = 1
+BEARISH = -1
+
+FVG_DTYPE = np.dtype([('index', np.int64), ('direction', np.int8),
+                      ('high', np.float64), ('low', np.float64), ('timestamp', np.float64)])
+
+ORDER_BLOCK_DTYPE = np.dtype([('index', np.int64), ('direction', np.int8),
+                              ('high', np.float64), ('low', np.float64), ('timestamp', np.float64)])
+
+SWING_DTYPE = np.dtype([('index', np.int64), ('confirmed_at', np.int64), ('direction', np.int8),
+                        ('price', np.float64), ('timestamp', np.float64)])
+
+BREAK_DTYPE = np.dtype([('index', np.int64), ('is_choch', np.bool_), ('direction', np.int8),
+                        ('level', np.float64), ('close', np.float64),
+                        ('timestamp', np.float64), ('swing_timestamp', np.float64)])
+
+TREND_BY_DIRECTION = {BULLISH: TrendDirection.BULLISH, BEARISH: TrendDirection.BEARISH}
+
+
+def detect_fvgs(high: np.ndarray, low: np.ndarray, timestamp: np.ndarray,
+                scale: Optional[TickScale] = None) -> np.ndarray:
+    """
+    Three-candle fair value gaps, as AsyncFVGDetector._detect_three_candle_fvg:
+    bullish when high[i-2] < low[i] (gap low[i]..high[i-2] reversed), bearish
+    when low[i-2] > high[i]. `index` is the third candle. With the symbol's
+    tick scale, prices are snapped to ticks first, like the streaming
+    detector, so sub-tick gaps are dropped.
+    """
+    if len(high) < 3:
+        return np.empty(0, dtype=FVG_DTYPE)
+    if scale is not None:
+        high = np.round(np.rint(high / scale.tick_size) * scale.tick_size, scale.decimals)
+        low = np.round(np.rint(low / scale.tick_size) * scale.tick_size, scale.decimals)
+    first_high, first_low = high[:-2], low[:-2]
+    third_high, third_low = high[2:], low[2:]
+    bullish = first_high < third_low
+    bearish = first_low > third_high
+
+    idx = np.flatnonzero(bullish | bearish)
+    result = np.empty(len(idx), dtype=FVG_DTYPE)
+    is_bullish = bullish[idx]
+    result['index'] = idx + 2
+    result['direction'] = np.where(is_bullish, BULLISH, BEARISH)
+    result['high'] = np.where(is_bullish, third_low[idx], first_low[idx])
+    result['low'] = np.where(is_bullish, first_high[idx], third_high[idx])
+    result['timestamp'] = timestamp[idx + 2]
+    return result
+
+
+def detect_order_blocks(high: np.ndarray, low: np.ndarray, timestamp: np.ndarray,
+                        lookback: int = 100) -> np.ndarray:
+    """
+    Order block candidates, as AsyncOrderBlockDetector._detect_new_order_blocks
+    over its `lookback`-candle window: a bullish block on the last candle
+    whenever the window holds more than 5 candles and a multiple of 10.
+    """
+    window_size = np.minimum(np.arange(1, len(high) + 1), lookback)
+    idx = np.flatnonzero((window_size > 5) & (window_size % 10 == 0))
+    result = np.empty(len(idx), dtype=ORDER_BLOCK_DTYPE)
+    result['index'] = idx
+    result['direction'] = BULLISH
+    result['high'] = high[idx]
+    result['low'] = low[idx]
+    result['timestamp'] = timestamp[idx]
+    return result
+
+
+def detect_swings(high: np.ndarray, low: np.ndarray, timestamp: np.ndarray, strength: int = 2) -> np.ndarray:
+    """
+    Swing points, as SwingPointDetector: above (below) the `strength` candles
+    before and not below (above) the `strength` candles after. Rows are in
+    streaming order: by confirmation candle, highs before lows.
+    """
+    width = 2 * strength + 1
+    if len(high) < width:
+        return np.empty(0, dtype=SWING_DTYPE)
+    highs = sliding_window_view(high, width)
+    lows = sliding_window_view(low, width)
+    middle_high, middle_low = highs[:, strength], lows[:, strength]
+    is_high = (middle_high > highs[:, :strength].max(axis=1)) & (middle_high >= highs[:, strength + 1:].max(axis=1))
+    is_low = (middle_low < lows[:, :strength].min(axis=1)) & (middle_low <= lows[:, strength + 1:].min(axis=1))
+
+    high_idx = np.flatnonzero(is_high) + strength
+    low_idx = np.flatnonzero(is_low) + strength
+    result = np.empty(len(high_idx) + len(low_idx), dtype=SWING_DTYPE)
+    result['index'] = np.concatenate([high_idx, low_idx])
+    result['direction'] = np.concatenate([np.full(len(high_idx), BULLISH), np.full(len(low_idx), BEARISH)])
+    result['price'] = np.concatenate([high[high_idx], low[low_idx]])
+    result['timestamp'] = timestamp[result['index']]
+    result['confirmed_at'] = result['index'] + strength
+    # stable sort keeps highs ahead of lows confirmed on the same candle
+    return result[np.argsort(result['confirmed_at'], kind='stable')]
+
+
+def _first_breaks(close: np.ndarray, swings: np.ndarray, direction: int) -> np.ndarray:
+    """
+    A swing stays the unbroken one from its confirmation candle until the next
+    swing of the same side is confirmed; it is broken by the first close beyond
+    it in that span. Returns (swing row, breaking candle) pairs.
+    """
+    n = len(close)
+    if not len(swings):
+        return np.empty((0, 2), dtype=np.int64)
+    starts = swings['confirmed_at']
+    ends = np.append(starts[1:], n)
+    lengths = ends - starts
+    # active swing level for every candle of every span
+    candle = np.arange(starts[0], n)
+    level = np.repeat(swings['price'], lengths)
+    beyond = close[candle] > level if direction == BULLISH else close[candle] < level
+
+    hits = np.flatnonzero(beyond)
+    span = np.searchsorted(starts, candle[hits], side='right') - 1
+    first_span, first_hit = np.unique(span, return_index=True)
+    return np.column_stack([first_span, candle[hits[first_hit]]])
+
+
+def label_structure(high: np.ndarray, low: np.ndarray, close: np.ndarray, timestamp: np.ndarray,
+                    strength: int = 2) -> np.ndarray:
+    """
+    BOS/CHoCH labels, as MarketStructureEngine: a break in the direction of the
+    previous break (or the first one) is a BOS, otherwise a CHoCH. Rows are in
+    streaming order: by breaking candle, bullish before bearish.
+    """
+    swings = detect_swings(high, low, timestamp, strength)
+    swing_highs = swings[swings['direction'] == BULLISH]
+    swing_lows = swings[swings['direction'] == BEARISH]
+    high_breaks = _first_breaks(close, swing_highs, BULLISH)
+    low_breaks = _first_breaks(close, swing_lows, BEARISH)
+
+    result = np.empty(len(high_breaks) + len(low_breaks), dtype=BREAK_DTYPE)
+    broken = np.concatenate([swing_highs[high_breaks[:, 0]], swing_lows[low_breaks[:, 0]]])
+    result['index'] = np.concatenate([high_breaks[:, 1], low_breaks[:, 1]])
+    result['direction'] = broken['direction']
+    result['level'] = broken['price']
+    result['swing_timestamp'] = broken['timestamp']
+    result = result[np.lexsort((-result['direction'], result['index']))]
+
+    result['close'] = close[result['index']]
+    result['timestamp'] = timestamp[result['index']]
+    previous = np.roll(result['direction'], 1)
+    result['is_choch'] = previous != result['direction']
+    if len(result):
+        result['is_choch'][0] = False
+    return result
+
+
+def _swing_point(row: np.void) -> SwingPoint:
+    kind = SwingType.HIGH if row['direction'] == BULLISH else SwingType.LOW
+    return SwingPoint(kind, float(row['price']), float(row['timestamp']), int(row['index']))
+
+
+def structure_state(high: np.ndarray, low: np.ndarray, close: np.ndarray, timestamp: np.ndarray,
+                    strength: int = 2, max_swings: int = 50) -> Dict[str, Any]:
+    """
+    The state a fresh MarketStructureEngine reaches after streaming these
+    candles, in MarketStructureEngine.state() form (for from_state): the last
+    `max_swings` swings of each side, the trend of the last break, the latest
+    swing of each side unless a close broke it, and the swing detector's
+    pending window.
+    """
+    swings = detect_swings(high, low, timestamp, strength)
+    breaks = label_structure(high, low, close, timestamp, strength)
+
+    state: Dict[str, Any] = {
+        'current_trend': TREND_BY_DIRECTION[int(breaks['direction'][-1])] if len(breaks) else TrendDirection.UNKNOWN,
+        'last_timestamp': float(timestamp[-1]) if len(timestamp) else None,
+    }
+    for direction, side in ((BULLISH, 'high'), (BEARISH, 'low')):
+        rows = swings[swings['direction'] == direction]
+        state[f'swing_{side}s'] = [_swing_point(row) for row in rows[-max_swings:]]
+        # 마지막 스윙의 확정 이후 같은 방향 돌파가 없으면 아직 유효
+        broken = len(rows) and np.any((breaks['direction'] == direction) & (breaks['index'] >= rows[-1]['confirmed_at']))
+        state[f'unbroken_{side}'] = _swing_point(rows[-1]) if len(rows) and not broken else None
+
+    start = max(len(high) - (2 * strength + 1), 0)
+    window = [(float(high[i]), float(low[i]), float(timestamp[i]), i) for i in range(start, len(high))]
+    state['swings'] = (len(high), window)
+    return state
@@ -0,0 +1,88 @@
+import math
+from typing import List, Optional
+
+from domain.entities.MarketData import Candle
+from domain.services.Timeframe import bar_open_time, timeframe_seconds
+
+
+class CandleAggregator:
+    """
+    Rolls a base candle stream (e.g. 1m klines, in-progress and closed) up into
+    one higher timeframe, bar boundaries aligned like the exchange's own.
+
+    Every base update yields the updated higher-timeframe bar: in progress
+    (is_closed=False) until the base candle that ends the bar closes, then
+    closed. If the stream skips past the end of a bar, that bar is closed with
+    what it has before the next one starts.
+    """
+
+    def __init__(self, timeframe: str, base_timeframe: str = "1m"):
+        self.timeframe = timeframe
+        self.base_timeframe = base_timeframe
+        self.period = timeframe_seconds(timeframe)
+        self.base_period = timeframe_seconds(base_timeframe)
+        if self.period <= self.base_period or self.period % self.base_period:
+            raise ValueError(f"Cannot aggregate {base_timeframe} candles into {timeframe}")
+        self._bar_open: Optional[float] = None
+        self._last_closed_bar: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        self._open = 0.0
+        self._close = 0.0
+        self._high = -math.inf
+        self._low = math.inf
+        self._volume = 0.0
+        self._last_base: Optional[float] = None
+        self._partial: Optional[Candle] = None
+
+    def _bar(self, is_closed: bool) -> Candle:
+        partial = self._partial
+        high, low, close, volume = self._high, self._low, self._close, self._volume
+        if partial is not None:
+            high, low = max(high, partial.high), min(low, partial.low)
+            close, volume = partial.close, volume + partial.volume
+        return Candle(high=high, low=low, timestamp=self._bar_open, open=self._open,
+                      close=close, volume=volume, is_closed=is_closed)
+
+    def _close_bar(self) -> Candle:
+        bar = self._bar(is_closed=True)
+        self._last_closed_bar = self._bar_open
+        self._bar_open = None
+        self._reset()
+        return bar
+
+    def update(self, candle: Candle) -> List[Candle]:
+        """Feeds one base candle update; returns the resulting bar updates (oldest first)."""
+        bar_open = bar_open_time(candle.timestamp, self.timeframe)
+        if self._last_closed_bar is not None and bar_open <= self._last_closed_bar:
+            return []  # 이미 마감된 바에 대한 지연/재전송 캔들
+
+        bars = []
+        if self._bar_open is not None and bar_open != self._bar_open:
+            if bar_open < self._bar_open:
+                return []
+            # 피드 공백 - 마감 캔들 없이 다음 바로 넘어감
+            bars.append(self._close_bar())
+
+        if self._bar_open is None:
+            self._bar_open = bar_open
+            self._open = candle.open
+
+        if candle.is_closed:
+            if self._last_base is not None and candle.timestamp <= self._last_base:
+                return bars
+            self._high = max(self._high, candle.high)
+            self._low = min(self._low, candle.low)
+            self._close = candle.close
+            self._volume += candle.volume
+            self._last_base = candle.timestamp
+            self._partial = None
+        else:
+            self._partial = candle
+
+        if candle.is_closed and candle.timestamp + self.base_period >= self._bar_open + self.period:
+            bars.append(self._close_bar())
+        else:
+            bars.append(self._bar(is_closed=False))
+        return bars
@@ -0,0 +1,151 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.entities.MarketData import Candle, PriceTick
+
+
+class ColumnarRingBuffer:
+    """
+    Fixed-capacity history stored as one NumPy array per column.
+
+    Every row is written twice, at `i` and `i + capacity`, so the latest n rows
+    (n <= capacity) are always one contiguous slice: appends are O(1) and
+    windows are views into the arrays, never copies. Views are only valid
+    until `capacity - n` further appends and must not be written to.
+
+    Every appended row gets a sequence number (rows appended before it), so a
+    consumer that lags behind the writer can ask for the window ending at the
+    row it is processing, even among rows sharing a millisecond timestamp.
+    The row must still be buffered, i.e. at most `capacity` rows behind.
+    """
+
+    def __init__(self, capacity: int, columns: Sequence[Tuple[str, type]]):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.capacity = capacity
+        self.names = tuple(name for name, _ in columns)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in columns
+        }
+        self._arrays = tuple(self._columns[name] for name in self.names)
+        self._timestamps = self._columns['timestamp']
+        self._timestamp_index = self.names.index('timestamp')
+        self.total = 0  # rows ever appended
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append_row(self, values: Sequence[float]) -> int:
+        """
+        Appends one row in column order and returns its sequence number. A row
+        with the same timestamp as the last one replaces it (same number).
+        """
+        if not (self.total and values[self._timestamp_index] == self.last_timestamp):
+            self.total += 1
+        self._write_last(values)
+        return self.total - 1
+
+    def _write_last(self, values: Sequence[float]):
+        # 최신 행 슬롯과 그 미러에 기록
+        slot = (self.total - 1) % self.capacity
+        mirror = slot + self.capacity
+        for array, value in zip(self._arrays, values):
+            array[slot] = value
+            array[mirror] = value
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        if not self.total:
+            return None
+        return int(self._timestamps[(self.total - 1) % self.capacity])
+
+    def _bounds(self, n: Optional[int], rows: int) -> Tuple[int, int]:
+        # rows: number of most recent rows to drop from the end (for lagging readers)
+        available = max(len(self) - rows, 0)
+        n = available if n is None else min(n, available)
+        end = (self.total - rows - 1) % self.capacity + 1 + self.capacity
+        return end - n, end
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """View of the latest n values of one column, oldest first."""
+        start, end = self._bounds(n, 0)
+        return self._columns[name][start:end]
+
+    def rows_after(self, sequence: int) -> int:
+        """Number of rows appended after the row with this sequence number."""
+        return max(self.total - 1 - sequence, 0)
+
+    def views(self, n: Optional[int] = None, until: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Views of the latest n rows of every column, or of the n rows ending at
+        the row with sequence number `until` (empty once it is overwritten).
+        """
+        start, end = self._bounds(n, self.rows_after(until) if until is not None else 0)
+        return {name: self._columns[name][start:end] for name in self.names}
+
+    def rows(self) -> Dict[str, np.ndarray]:
+        """Copies of every buffered row, oldest first (state snapshots)."""
+        return {name: view.copy() for name, view in self.views().items()}
+
+    def extend(self, columns: Dict[str, np.ndarray]):
+        """Appends rows given as columns, e.g. restored from rows()."""
+        for values in zip(*(columns[name].tolist() for name in self.names)):
+            self.append_row(values)
+
+
+class CandleWindow:
+    """Zero-copy window of candle columns, oldest first."""
+
+    __slots__ = ('open', 'high', 'low', 'close', 'volume', 'timestamp')
+
+    def __init__(self, views: Dict[str, np.ndarray]):
+        self.open = views['open']
+        self.high = views['high']
+        self.low = views['low']
+        self.close = views['close']
+        self.volume = views['volume']
+        self.timestamp = views['timestamp']
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def candle(self, i: int) -> Candle:
+        """Materializes a single row, e.g. the origin candle of a new zone."""
+        return Candle(
+            high=float(self.high[i]), low=float(self.low[i]), timestamp=int(self.timestamp[i]) / 1000,
+            open=float(self.open[i]), close=float(self.close[i]), volume=float(self.volume[i]),
+        )
+
+
+class CandleRingBuffer(ColumnarRingBuffer):
+    """Closed candles of one (symbol, timeframe)."""
+
+    COLUMNS = (('open', np.float64), ('high', np.float64), ('low', np.float64),
+               ('close', np.float64), ('volume', np.float64), ('timestamp', np.int64))
+
+    def __init__(self, capacity: int = 500):
+        super().__init__(capacity, self.COLUMNS)
+
+    def append(self, candle: Candle) -> int:
+        return self.append_row((candle.open, candle.high, candle.low, candle.close, candle.volume,
+                                round(candle.timestamp * 1000)))
+
+    def window(self, n: Optional[int] = None, until: Optional[int] = None) -> CandleWindow:
+        """Latest n candles, or the n candles ending at the one with sequence number `until` (Candle.sequence)."""
+        return CandleWindow(self.views(n, until))
+
+
+class TickRingBuffer(ColumnarRingBuffer):
+    """Trades of one symbol."""
+
+    COLUMNS = (('price', np.float64), ('quantity', np.float64), ('timestamp', np.int64))
+
+    def __init__(self, capacity: int = 500):
+        super().__init__(capacity, self.COLUMNS)
+
+    def append(self, tick: PriceTick) -> int:
+        # Trades share millisecond timestamps, so ticks never replace each other
+        self.total += 1
+        self._write_last((tick.price, tick.quantity, round(tick.timestamp * 1000)))
+        return self.total - 1
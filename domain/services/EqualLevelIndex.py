@@ -0,0 +1,108 @@
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# anchor, price, touches, first_seen, last_seen
+LevelRow = Tuple[float, float, int, float, float]
+
+
+class EqualLevel:
+    """A cluster of swing prices within tolerance of its first touch."""
+
+    __slots__ = ('anchor', 'price', 'touches', 'first_seen', 'last_seen', 'bucket')
+
+    def __init__(self, price: float, timestamp: float, bucket: int):
+        self.anchor = price
+        self.price = price
+        self.touches = 1
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.bucket = bucket
+
+
+class EqualLevelIndex:
+    """
+    Incremental equal-highs (or equal-lows) detection.
+
+    Swing prices are hashed into log-space buckets one tolerance wide, so a
+    bucket covers the same relative distance at any price. A new swing is
+    compared only with the levels of its own and the two neighbouring buckets
+    (two prices within tolerance can straddle a bucket edge): O(1) per swing,
+    regardless of how many levels are kept. A level is reported on its second
+    touch and again on every later one, so a level whose liquidity was taken
+    (a swept pool) can be built again by the next touch; callers skip reports
+    for levels they still hold. The newest `max_levels` levels are kept; older
+    ones expire.
+
+    For highs the level price is the higher of its first two touches (liquidity
+    rests above the cluster); with `use_high=False`, the lower. Later touches
+    leave it in place, so every report of a level names the same price.
+    """
+
+    def __init__(self, tolerance_percent: float = 0.1, max_levels: int = 20000, use_high: bool = True):
+        if tolerance_percent <= 0:
+            raise ValueError("tolerance_percent must be positive")
+        self.tolerance = tolerance_percent / 100
+        self.max_levels = max_levels
+        self.use_high = use_high
+        self._bucket_width = math.log1p(self.tolerance)
+        self._buckets: Dict[int, List[EqualLevel]] = {}
+        self._levels: Deque[EqualLevel] = deque()
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def _bucket(self, price: float) -> int:
+        return math.floor(math.log(price) / self._bucket_width)
+
+    def _match(self, price: float, bucket: int) -> Optional[EqualLevel]:
+        best = None
+        for neighbour in (bucket, bucket - 1, bucket + 1):
+            for level in self._buckets.get(neighbour, ()):
+                distance = abs(price - level.anchor)
+                if distance <= self.tolerance * level.anchor and (best is None or distance < abs(price - best.anchor)):
+                    best = level
+        return best
+
+    def add(self, price: float, timestamp: float) -> Optional[EqualLevel]:
+        """Records a swing price. Returns its level if the level has been touched at least twice."""
+        if price <= 0:
+            return None
+        bucket = self._bucket(price)
+        level = self._match(price, bucket)
+        if level is not None:
+            level.touches += 1
+            level.last_seen = timestamp
+            if level.touches == 2:
+                level.price = max(level.price, price) if self.use_high else min(level.price, price)
+            return level
+
+        level = EqualLevel(price, timestamp, bucket)
+        self._buckets.setdefault(bucket, []).append(level)
+        self._levels.append(level)
+        if len(self._levels) > self.max_levels:
+            self._expire(self._levels.popleft())
+        return None
+
+    def _expire(self, level: EqualLevel):
+        levels = self._buckets.get(level.bucket)
+        if levels is not None:
+            levels.remove(level)
+            if not levels:
+                del self._buckets[level.bucket]
+
+    def state(self) -> List[LevelRow]:
+        """Every kept level, oldest first (state snapshots)."""
+        return [(level.anchor, level.price, level.touches, level.first_seen, level.last_seen) for level in self._levels]
+
+    @classmethod
+    def from_state(cls, rows: List[LevelRow], tolerance_percent: float = 0.1, max_levels: int = 20000,
+                   use_high: bool = True) -> "EqualLevelIndex":
+        """Rebuilds the index; buckets are recomputed, so a changed tolerance still applies."""
+        index = cls(tolerance_percent, max_levels, use_high)
+        for anchor, price, touches, first_seen, last_seen in rows[-max_levels:]:
+            level = EqualLevel(anchor, first_seen, index._bucket(anchor))
+            level.price, level.touches, level.last_seen = price, touches, last_seen
+            index._buckets.setdefault(level.bucket, []).append(level)
+            index._levels.append(level)
+        return index
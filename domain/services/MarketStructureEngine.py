@@ -0,0 +1,104 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, ClassVar, Deque, Dict, List, Optional
+
+from domain.services.SwingPointDetector import SwingPoint, SwingPointDetector, SwingType
+
+
+class TrendDirection:
+    UNKNOWN = "UNKNOWN"
+    BULLISH = "BULLISH"
+    BEARISH = "BEARISH"
+
+
+@dataclass
+class StructureBreak:
+    event_type: ClassVar[str] = ""
+
+    direction: str          # TrendDirection of the break
+    level: float            # price of the broken swing
+    close: float            # close of the breaking candle
+    timestamp: float        # open time of the breaking candle
+    swing_timestamp: float  # open time of the broken swing candle
+
+
+@dataclass
+class BOS(StructureBreak):
+    """Break of structure: a swing broken in the direction of the trend."""
+    event_type: ClassVar[str] = "BOS_DETECTED"
+
+
+@dataclass
+class CHoCH(StructureBreak):
+    """Change of character: a swing broken against the trend, which flips it."""
+    event_type: ClassVar[str] = "CHOCH_DETECTED"
+
+
+class MarketStructureEngine:
+    """
+    Streaming market structure of one symbol/timeframe. Each closed candle
+    updates the swing points, then checks the close against the latest
+    unbroken swing high and low: a break in the trend direction (or the first
+    break) is a BOS, a break against it a CHoCH. A few comparisons per candle,
+    cheap enough to run inline on the event loop.
+    """
+
+    def __init__(self, swing_strength: int = 2, max_swings: int = 50):
+        self.swing_strength = swing_strength
+        self.swing_highs: Deque[SwingPoint] = deque(maxlen=max_swings)
+        self.swing_lows: Deque[SwingPoint] = deque(maxlen=max_swings)
+        self.current_trend = TrendDirection.UNKNOWN
+        self.last_timestamp: Optional[float] = None
+        self._swings = SwingPointDetector(swing_strength)
+        self._unbroken_high: Optional[SwingPoint] = None
+        self._unbroken_low: Optional[SwingPoint] = None
+
+    def update(self, high: float, low: float, close: float, timestamp: float) -> List[StructureBreak]:
+        """Feeds one closed candle; returns the BOS/CHoCH it produces."""
+        self.last_timestamp = timestamp
+        for swing in self._swings.update(high, low, timestamp):
+            if swing.kind == SwingType.HIGH:
+                self.swing_highs.append(swing)
+                self._unbroken_high = swing
+            else:
+                self.swing_lows.append(swing)
+                self._unbroken_low = swing
+
+        breaks = []
+        if self._unbroken_high is not None and close > self._unbroken_high.price:
+            breaks.append(self._break(TrendDirection.BULLISH, self._unbroken_high, close, timestamp))
+            self._unbroken_high = None
+        if self._unbroken_low is not None and close < self._unbroken_low.price:
+            breaks.append(self._break(TrendDirection.BEARISH, self._unbroken_low, close, timestamp))
+            self._unbroken_low = None
+        return breaks
+
+    def _break(self, direction: str, swing: SwingPoint, close: float, timestamp: float) -> StructureBreak:
+        against_trend = self.current_trend not in (direction, TrendDirection.UNKNOWN)
+        self.current_trend = direction
+        result_type = CHoCH if against_trend else BOS
+        return result_type(direction, swing.price, close, timestamp, swing.timestamp)
+
+    def state(self) -> Dict[str, Any]:
+        """Plain-data copy of the engine for state snapshots (swing points are never mutated, so shared)."""
+        return {
+            'current_trend': self.current_trend,
+            'last_timestamp': self.last_timestamp,
+            'swing_highs': list(self.swing_highs),
+            'swing_lows': list(self.swing_lows),
+            'unbroken_high': self._unbroken_high,
+            'unbroken_low': self._unbroken_low,
+            'swings': self._swings.state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], swing_strength: int = 2, max_swings: int = 50) -> "MarketStructureEngine":
+        engine = cls(swing_strength, max_swings)
+        engine.current_trend = state['current_trend']
+        engine.last_timestamp = state['last_timestamp']
+        engine.swing_highs.extend(state['swing_highs'])
+        engine.swing_lows.extend(state['swing_lows'])
+        engine._unbroken_high = state['unbroken_high']
+        engine._unbroken_low = state['unbroken_low']
+        engine._swings = SwingPointDetector.from_state(swing_strength, state['swings'])
+        return engine
@@ -0,0 +1,60 @@
+from decimal import Decimal
+from typing import Dict
+
+# Finest tick the exchange lists; used for symbols whose tick size is unknown
+DEFAULT_TICK_SIZE = 1e-8
+
+# Spot PRICE_FILTER tick sizes, replaced by exchangeInfo when it is loaded
+_tick_sizes: Dict[str, float] = {"BTCUSDT": 0.01, "ETHUSDT": 0.01}
+_scales: Dict[float, "TickScale"] = {}
+
+
+class TickScale:
+    """
+    Prices of one symbol as integer multiples of its tick size. Zone levels
+    are kept in ticks, so comparisons are exact and levels hash; floats only
+    appear where prices enter (trades, candles) and leave (events, logs).
+    """
+
+    __slots__ = ('tick_size', 'decimals')
+
+    def __init__(self, tick_size: float):
+        if tick_size <= 0:
+            raise ValueError("Tick size must be positive")
+        self.tick_size = tick_size
+        # 표시용 반올림 자릿수 (0.01 -> 2, 0.5 -> 1)
+        self.decimals = max(0, -Decimal(repr(tick_size)).normalize().as_tuple().exponent)
+
+    def to_ticks(self, price: float) -> int:
+        return round(price / self.tick_size)
+
+    def to_price(self, ticks: int) -> float:
+        return round(ticks * self.tick_size, self.decimals)
+
+
+def scale_for(tick_size: float) -> TickScale:
+    """Shared TickScale of a tick size."""
+    scale = _scales.get(tick_size)
+    if scale is None:
+        scale = _scales[tick_size] = TickScale(tick_size)
+    return scale
+
+
+def tick_scale(symbol: str) -> TickScale:
+    """Current scale of a symbol; zones keep the tick size they were created with."""
+    return scale_for(_tick_sizes.get(symbol, DEFAULT_TICK_SIZE))
+
+
+def convert_ticks(ticks: int, source: TickScale, target: TickScale) -> int:
+    """Ticks of one scale in another, e.g. a zone saved before its symbol's tick size changed."""
+    return ticks if source is target else target.to_ticks(source.to_price(ticks))
+
+
+def register_tick_sizes(tick_sizes: Dict[str, float]):
+    """Sets symbols' tick sizes (from the exchange); call before any zone of them is created or restored."""
+    _tick_sizes.update(tick_sizes)
+
+
+def tick_sizes() -> Dict[str, float]:
+    """Known tick sizes, e.g. to hand to shard workers."""
+    return dict(_tick_sizes)
@@ -0,0 +1,154 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (first name, second name, correlation)
+CorrelatedPair = Tuple[str, str, float]
+
+
+class CorrelationRegime:
+    INVERSE = -1
+    NEUTRAL = 0
+    HIGH = 1
+
+
+class RollingCorrelation:
+    """
+    Pairwise Pearson correlation of N series over the last `window` rows,
+    maintained incrementally.
+
+    Each row holds one value per series, NaN where a series has none. The
+    co-moments of every pair are kept in (N, N) matrices over the rows where
+    both series have a value: counts, sums, sums of squares and cross
+    products. A row adds its outer products and the row leaving the window
+    subtracts its own, so an update is a handful of O(N^2) vectorized ops
+    and never revisits the window. Every `window` updates the matrices are
+    rebuilt from the ring of rows, so floating-point drift stays bounded at
+    an amortized O(N^2) per row.
+
+    Series can be added at any time; their past rows count as missing.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self.min_periods = min_periods or max(2, window // 4)
+        self.names: List[str] = []
+        self.rows = 0
+        self._index: Dict[str, int] = {}
+        self._values = np.zeros((window, 0))
+        self._present = np.zeros((window, 0), dtype=bool)
+        self._next = 0
+        self._since_rebuild = 0
+        self._count = np.zeros((0, 0))
+        self._sum = np.zeros((0, 0))      # [i, j]: i의 합 (i, j 모두 값이 있는 행)
+        self._sum_sq = np.zeros((0, 0))
+        self._cross = np.zeros((0, 0))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        """Column of a series, added on first use."""
+        i = self._index.get(name)
+        if i is None:
+            i = self._index[name] = len(self.names)
+            self.names.append(name)
+            self._values = np.pad(self._values, ((0, 0), (0, 1)))
+            self._present = np.pad(self._present, ((0, 0), (0, 1)))
+            self._count, self._sum, self._sum_sq, self._cross = (
+                np.pad(m, ((0, 1), (0, 1))) for m in (self._count, self._sum, self._sum_sq, self._cross))
+        return i
+
+    def _accumulate(self, values: np.ndarray, present: np.ndarray, sign: float):
+        mask = present.astype(np.float64)
+        self._count += sign * np.outer(mask, mask)
+        self._sum += sign * np.outer(values, mask)
+        self._sum_sq += sign * np.outer(values * values, mask)
+        self._cross += sign * np.outer(values, values)
+
+    def _rebuild(self):
+        values = self._values
+        mask = self._present.astype(np.float64)
+        self._count = mask.T @ mask
+        self._sum = values.T @ mask
+        self._sum_sq = (values * values).T @ mask
+        self._cross = values.T @ values
+        self._since_rebuild = 0
+
+    def update(self, row: np.ndarray):
+        """Appends one row (a value per series in `names` order, NaN where missing)."""
+        row = np.asarray(row, dtype=np.float64)
+        if len(row) != len(self.names):
+            raise ValueError(f"Row has {len(row)} values for {len(self.names)} series")
+        present = ~np.isnan(row)
+        values = np.where(present, row, 0.0)
+
+        slot = self._next
+        if self.rows >= self.window:
+            self._accumulate(self._values[slot], self._present[slot], -1.0)
+        self._values[slot] = values
+        self._present[slot] = present
+        self._accumulate(values, present, 1.0)
+        self._next = (slot + 1) % self.window
+        self.rows += 1
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+
+    def matrix(self) -> np.ndarray:
+        """(N, N) correlations; NaN for pairs with fewer than min_periods shared rows or no variance."""
+        n = self._count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = self._sum / n
+            var = self._sum_sq / n - mean * mean
+            cov = self._cross / n - mean * mean.T
+            corr = cov / np.sqrt(var * var.T)
+        corr[(n < self.min_periods) | ~(var > 1e-18) | ~(var.T > 1e-18)] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    def top_pairs(self, k: int, min_abs: float = 0.0, corr: Optional[np.ndarray] = None) -> List[CorrelatedPair]:
+        """The k most correlated pairs by absolute correlation, strongest first."""
+        corr = self.matrix() if corr is None else corr
+        rows, cols = np.triu_indices(len(self.names), 1)
+        strength = np.nan_to_num(np.abs(corr[rows, cols]), nan=-1.0)
+        candidates = np.flatnonzero(strength >= max(min_abs, 0.0))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-strength[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-strength[candidates], kind='stable')]
+        return [(self.names[rows[c]], self.names[cols[c]], float(corr[rows[c], cols[c]])) for c in candidates]
+
+
+class CorrelationRegimeTracker:
+    """
+    Per-pair correlation regime (HIGH, NEUTRAL, INVERSE) with hysteresis: a
+    pair enters HIGH at `enter` and leaves below `exit` (INVERSE mirrors it),
+    so a correlation hovering at the threshold does not flap.
+    """
+
+    def __init__(self, enter: float = 0.7, exit: float = 0.5):
+        if not 0 <= exit <= enter:
+            raise ValueError("Regime thresholds need 0 <= exit <= enter")
+        self.enter = enter
+        self.exit = exit
+        self._regimes = np.zeros((0, 0), dtype=np.int8)
+
+    def update(self, corr: np.ndarray, names: Sequence[str]) -> List[Tuple[str, str, int, int, float]]:
+        """Classifies every pair; returns (first, second, previous, regime, correlation) of the pairs that changed."""
+        size = len(names)
+        if self._regimes.shape[0] < size:
+            grow = size - self._regimes.shape[0]
+            self._regimes = np.pad(self._regimes, ((0, grow), (0, grow)))
+        previous = self._regimes
+        c = np.nan_to_num(corr, nan=0.0)
+        regimes = np.where(c >= self.enter, CorrelationRegime.HIGH,
+                  np.where(c <= -self.enter, CorrelationRegime.INVERSE,
+                  np.where((previous == CorrelationRegime.HIGH) & (c >= self.exit), CorrelationRegime.HIGH,
+                  np.where((previous == CorrelationRegime.INVERSE) & (c <= -self.exit), CorrelationRegime.INVERSE,
+                           CorrelationRegime.NEUTRAL)))).astype(np.int8)
+        self._regimes = regimes
+        rows, cols = np.nonzero(np.triu(regimes != previous, 1))
+        return [(names[i], names[j], int(previous[i, j]), int(regimes[i, j]), float(c[i, j]))
+                for i, j in zip(rows.tolist(), cols.tolist())]
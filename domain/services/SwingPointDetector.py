@@ -0,0 +1,65 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Tuple
+
+WindowRow = Tuple[float, float, float, int]
+
+
+class SwingType:
+    HIGH = "HIGH"
+    LOW = "LOW"
+
+
+@dataclass
+class SwingPoint:
+    kind: str         # SwingType
+    price: float
+    timestamp: float  # open time of the swing candle
+    index: int        # sequence number of the swing candle in the stream
+
+
+class SwingPointDetector:
+    """
+    Incremental swing detection over closed candles. A candle is a swing high
+    when its high is above the highs of the `strength` candles before it and
+    not below the highs of the `strength` candles after it (lows mirrored), so
+    a swing is confirmed `strength` candles late. Each update looks at a fixed
+    window of 2 * strength + 1 candles, independent of history length.
+    """
+
+    def __init__(self, strength: int = 2):
+        if strength < 1:
+            raise ValueError("Swing strength must be at least 1")
+        self.strength = strength
+        self._window: Deque[WindowRow] = deque(maxlen=2 * strength + 1)
+        self._count = 0
+
+    def update(self, high: float, low: float, timestamp: float) -> List[SwingPoint]:
+        """Feeds one closed candle; returns the swings it confirms (at most one high and one low)."""
+        self._window.append((high, low, timestamp, self._count))
+        self._count += 1
+        if len(self._window) < self._window.maxlen:
+            return []
+
+        window = self._window
+        middle_high, middle_low, middle_time, middle_index = window[self.strength]
+        before = [window[i] for i in range(self.strength)]
+        after = [window[i] for i in range(self.strength + 1, len(window))]
+
+        swings = []
+        if all(middle_high > c[0] for c in before) and all(middle_high >= c[0] for c in after):
+            swings.append(SwingPoint(SwingType.HIGH, middle_high, middle_time, middle_index))
+        if all(middle_low < c[1] for c in before) and all(middle_low <= c[1] for c in after):
+            swings.append(SwingPoint(SwingType.LOW, middle_low, middle_time, middle_index))
+        return swings
+
+    def state(self) -> Tuple[int, List[WindowRow]]:
+        """Candle count and pending window: all that is needed to resume (state snapshots)."""
+        return self._count, list(self._window)
+
+    @classmethod
+    def from_state(cls, strength: int, state: Tuple[int, List[WindowRow]]) -> "SwingPointDetector":
+        detector = cls(strength)
+        detector._count, window = state
+        detector._window.extend(window)
+        return detector
@@ -0,0 +1,20 @@
+TIMEFRAME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+# Exchange bars are aligned to UTC; weekly bars open on Monday 00:00 UTC while
+# the Unix epoch fell on a Thursday.
+WEEK_OFFSET = 4 * 86400
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """Bar length of an exchange interval such as "1m", "15m", "4h" or "1d"."""
+    try:
+        return int(timeframe[:-1]) * TIMEFRAME_UNITS[timeframe[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe: {timeframe}") from None
+
+
+def bar_open_time(timestamp: float, timeframe: str) -> float:
+    """Open time (seconds) of the `timeframe` bar containing `timestamp`."""
+    period = timeframe_seconds(timeframe)
+    offset = WEEK_OFFSET if timeframe.endswith('w') else 0
+    return (timestamp - offset) // period * period + offset
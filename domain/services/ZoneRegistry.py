@@ -0,0 +1,132 @@
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from domain.entities.ZoneLifecycle import ZoneLifecycle
+
+ZONE_ARCHIVE_DTYPE = np.dtype([('entity_id', np.uint64), ('lifecycle', np.int8),
+                               ('creation_time', np.float64), ('closed_at', np.float64),
+                               ('low_ticks', np.int64), ('high_ticks', np.int64)])
+
+_LIFECYCLE_CODES = {state: code for code, state in enumerate(ZoneLifecycle.ALL)}
+
+# Per-registry caps: live zones, and seconds an untouched zone stays live
+DEFAULT_MAX_ZONES = 500
+DEFAULT_MAX_AGE = 30 * 86400
+
+
+class ZoneArchive:
+    """
+    Fixed-capacity ring of finished zones, one row per zone in a NumPy
+    structured array (ZONE_ARCHIVE_DTYPE, 41 bytes a zone). The oldest rows are
+    overwritten, so memory is fixed at construction.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity <= 0:
+            raise ValueError("Zone archive capacity must be positive")
+        self.capacity = capacity
+        self._rows = np.zeros(capacity, dtype=ZONE_ARCHIVE_DTYPE)
+        self.total = 0  # zones ever archived
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append(self, zone: Any, closed_at: float):
+        levels = zone.trigger_levels()
+        self._rows[self.total % self.capacity] = (
+            zone.entity_id, _LIFECYCLE_CODES[zone.lifecycle], zone.creation_time, closed_at,
+            min(levels), max(levels))
+        self.total += 1
+
+    def rows(self) -> np.ndarray:
+        """Archived zones, oldest first (a copy)."""
+        if self.total <= self.capacity:
+            return self._rows[:self.total].copy()
+        split = self.total % self.capacity
+        return np.concatenate([self._rows[split:], self._rows[:split]])
+
+    def counts(self) -> Dict[str, int]:
+        """Archived zones per terminal state (within capacity)."""
+        codes = np.bincount(self.rows()['lifecycle'], minlength=len(ZoneLifecycle.ALL))
+        return {state: int(count) for state, count in zip(ZoneLifecycle.ALL, codes) if count}
+
+
+class ZoneRegistry:
+    """
+    Live zones of one symbol (and timeframe), keyed by entity id in creation
+    order.
+
+    Zones leave the registry as soon as they are terminal: a zone reported
+    through close() when it is filled, swept or invalidated (the zone
+    monitor's callback) is archived on the next add(), and the oldest active
+    zones expire once they are older than `max_age` seconds or beyond
+    `max_zones`. Both only touch the zones that leave, so an add() costs
+    O(1) amortized however many zones are live. Left zones are kept only as
+    rows of a fixed-size ZoneArchive, so memory stays flat however long the
+    process runs.
+    """
+
+    def __init__(self, max_zones: int = DEFAULT_MAX_ZONES, max_age: Optional[float] = DEFAULT_MAX_AGE,
+                 archive_size: int = 1000):
+        self.max_zones = max_zones
+        self.max_age = max_age
+        self.archive = ZoneArchive(archive_size)
+        self._zones: Dict[int, Any] = {}
+        self._closed: Deque[Any] = deque()
+
+    def __len__(self) -> int:
+        return len(self._zones)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._zones.values())
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self._zones
+
+    def get(self, entity_id: int) -> Optional[Any]:
+        return self._zones.get(entity_id)
+
+    def zones(self) -> List[Any]:
+        return list(self._zones.values())
+
+    def close(self, zone: Any):
+        """Queues a zone that just left ACTIVE; it is archived on the next add() or evict()."""
+        self._closed.append(zone)
+
+    def add(self, zone: Any, now: float) -> List[Any]:
+        """Adds a zone and evicts; returns the zones this expired (to unregister from price monitoring)."""
+        replaced = []
+        # 같은 id의 이전 존 (예: 스윕된 레벨에 다시 생긴 풀)은 아카이브로
+        previous = self._zones.pop(zone.entity_id, None)
+        if previous is not None and previous is not zone:
+            if previous.is_active:
+                previous.expire()
+                replaced.append(previous)
+            self.archive.append(previous, now)
+        self._zones[zone.entity_id] = zone
+        return replaced + self.evict(now)
+
+    def evict(self, now: float) -> List[Any]:
+        """Archives closed zones and expires zones over the age or count cap. Returns the expired ones."""
+        while self._closed:
+            zone = self._closed.popleft()
+            # 같은 id의 새 존으로 교체된 존은 교체 시 이미 아카이브됨
+            if self._zones.get(zone.entity_id) is zone:
+                del self._zones[zone.entity_id]
+                self.archive.append(zone, now)
+
+        expired = []
+        excess = len(self._zones) - self.max_zones
+        while self._zones:
+            zone = next(iter(self._zones.values()))
+            too_old = self.max_age is not None and now - zone.creation_time > self.max_age
+            if excess <= 0 and not too_old:
+                break
+            zone.expire()
+            del self._zones[zone.entity_id]
+            self.archive.append(zone, now)
+            expired.append(zone)
+            excess -= 1
+        return expired
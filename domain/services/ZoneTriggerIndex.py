@@ -0,0 +1,63 @@
+import bisect
+from typing import Any, Dict, List, Tuple
+
+
+class ZoneTriggerIndex:
+    """
+    Sorted array of zone trigger levels for a single symbol.
+
+    A zone exposes `trigger_levels()` - the prices, in integer ticks, at which its
+    state can change (block edges, fill steps of a gap, a pool level). A price move from
+    `previous` to `current` only needs to visit the zones whose levels lie inside
+    the crossed range, which is a bisect plus a slice: O(log n + k).
+    """
+
+    def __init__(self):
+        self._levels: List[int] = []
+        self._zones: List[Any] = []
+        self._registered: Dict[int, Tuple[Any, List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._registered)
+
+    def __contains__(self, zone: Any) -> bool:
+        return id(zone) in self._registered
+
+    def zones(self) -> List[Any]:
+        return [zone for zone, _ in self._registered.values()]
+
+    def add(self, zone: Any):
+        if id(zone) in self._registered:
+            return
+        levels = sorted(set(zone.trigger_levels()))
+        for level in levels:
+            i = bisect.bisect_right(self._levels, level)
+            self._levels.insert(i, level)
+            self._zones.insert(i, zone)
+        self._registered[id(zone)] = (zone, levels)
+
+    def remove(self, zone: Any):
+        entry = self._registered.pop(id(zone), None)
+        if entry is None:
+            return
+        for level in entry[1]:
+            i = bisect.bisect_left(self._levels, level)
+            while self._zones[i] is not zone:
+                i += 1
+            del self._levels[i]
+            del self._zones[i]
+
+    def crossed(self, previous: int, current: int) -> List[Any]:
+        """Zones with at least one trigger level in [previous, current], in the order price reached them."""
+        if previous == current:
+            return []
+        low, high = (previous, current) if previous < current else (current, previous)
+        start = bisect.bisect_left(self._levels, low)
+        end = bisect.bisect_right(self._levels, high)
+        if start == end:
+            return []
+
+        hits = self._zones[start:end]
+        if current < previous:
+            hits.reverse()
+        return list(dict.fromkeys(hits))
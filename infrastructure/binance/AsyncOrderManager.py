@@ -2,6 +2,7 @@ import asyncio
 import logging
 
 from domain.ports.EventBus import EventBus
+from domain.events.OrderEvent import OrderEvent
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -14,12 +15,12 @@ class AsyncOrderManager:
     async def start_order_processing(self):
         logger.info("Order Manager started.")
         # This would typically process an internal queue of order requests
-        # generated by the strategy coordinator.
-        while True:
-            await asyncio.sleep(1)
+        # generated by the strategy coordinator. Idle until cancelled meanwhile.
+        await asyncio.get_running_loop().create_future()
 
     async def cancel_all_orders(self):
         logger.info("Cancelling all open orders...")
         # Logic to fetch and cancel all open orders from the exchange.
         await asyncio.sleep(0.5)
         logger.info("All open orders cancelled.")
+        await self.event_bus.publish(OrderEvent(event_type="ALL_ORDERS_CANCELLED"))
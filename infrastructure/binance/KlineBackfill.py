@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import logging
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.ports.Clock import Clock, SystemClock
+from domain.ports.MarketDataFeed import CandleHistorySource, MarketStream
+from domain.services.ColumnarRingBuffer import CandleRingBuffer, CandleWindow
+from domain.services.Timeframe import bar_open_time, timeframe_seconds
+from infrastructure.data.CandleArchive import CandleArchive
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+BINANCE_REST_URL = "https://api.binance.com"
+KLINES_PATH = "/api/v3/klines"
+KLINES_WEIGHT = 2
+PAGE_LIMIT = 1000
+EXCHANGE_INFO_PATH = "/api/v3/exchangeInfo"
+EXCHANGE_INFO_WEIGHT = 20
+DEPTH_PATH = "/api/v3/depth"
+# Depth request weight by limit (up to 100, 500, 1000, 5000 levels)
+DEPTH_WEIGHTS = ((100, 5), (500, 25), (1000, 50), (5000, 250))
+
+
+class RequestWeightLimiter:
+    """
+    Client side of the exchange's per-minute request weight limit. Weight is
+    counted in the same fixed wall-clock minutes as the exchange, and the
+    X-MBX-USED-WEIGHT-1M header of each response replaces the local count
+    when higher (other clients on the same IP). acquire() waits for the next
+    minute once `limit` would be exceeded.
+    """
+
+    def __init__(self, limit: int = 5000, window: float = 60.0, clock: Optional[Clock] = None):
+        self.limit = limit
+        self.window = window
+        self.clock = clock or SystemClock()
+        self.used = 0
+        self.waits = 0
+        self._window_start = 0.0
+
+    def _roll(self, now: float):
+        window_start = now - now % self.window
+        if window_start != self._window_start:
+            self._window_start, self.used = window_start, 0
+
+    async def acquire(self, weight: int):
+        while True:
+            now = self.clock.time()
+            self._roll(now)
+            if self.used + weight <= self.limit:
+                self.used += weight
+                return
+            self.waits += 1
+            await asyncio.sleep(self._window_start + self.window - now)
+
+    def observe(self, used_weight: int):
+        self._roll(self.clock.time())
+        self.used = max(self.used, used_weight)
+
+
+class RateLimitedError(Exception):
+    def __init__(self, retry_after: float, banned: bool = False):
+        super().__init__(f"rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+        self.banned = banned
+
+
+def _parse_klines(rows: List[list]) -> Dict[str, np.ndarray]:
+    if not rows:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in CandleRingBuffer.COLUMNS}
+    table = np.array([row[:6] for row in rows], dtype=np.float64)
+    return {
+        'open': table[:, 1], 'high': table[:, 2], 'low': table[:, 3], 'close': table[:, 4], 'volume': table[:, 5],
+        'timestamp': np.array([row[0] for row in rows], dtype=np.int64),
+    }
+
+
+def _parse_tick_sizes(info: dict) -> Dict[str, float]:
+    tick_sizes = {}
+    for symbol in info.get('symbols', []):
+        for price_filter in symbol.get('filters', []):
+            if price_filter.get('filterType') == 'PRICE_FILTER':
+                tick_sizes[symbol['symbol']] = float(price_filter['tickSize'])
+    return tick_sizes
+
+
+class BinanceRestClient:
+    """
+    Minimal Binance spot REST client for klines, symbol tick sizes and depth
+    snapshots. Requests use urllib on a dedicated thread pool (one thread per
+    concurrent request); JSON decoding happens there too, so the event loop
+    only awaits.
+    """
+
+    def __init__(self, base_url: str = BINANCE_REST_URL, limiter: Optional[RequestWeightLimiter] = None,
+                 max_concurrency: int = 16, timeout: float = 10.0, retries: int = 3):
+        self.base_url = base_url.rstrip("/")
+        self.limiter = limiter or RequestWeightLimiter()
+        self.timeout = timeout
+        self.retries = retries
+        self.requests = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_concurrency, thread_name_prefix="binance-rest")
+
+    def _get(self, path: str, params: Dict[str, object]) -> Tuple[object, int]:
+        url = f"{self.base_url}{path}?{urllib.parse.urlencode(params)}"
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                return json.loads(response.read()), int(response.headers.get("X-MBX-USED-WEIGHT-1M", 0))
+        except urllib.error.HTTPError as e:
+            if e.code in (418, 429):
+                raise RateLimitedError(float(e.headers.get("Retry-After", 60)), banned=e.code == 418) from e
+            raise
+
+    async def get_klines(self, symbol: str, interval: str, start_ms: int, end_ms: int,
+                         limit: int = PAGE_LIMIT) -> Dict[str, np.ndarray]:
+        """Klines opened in [start_ms, end_ms] (at most `limit`), as CandleRingBuffer columns."""
+        params = {'symbol': symbol, 'interval': interval, 'startTime': start_ms, 'endTime': end_ms, 'limit': limit}
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            await self.limiter.acquire(KLINES_WEIGHT)
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    rows, used_weight = await loop.run_in_executor(self._executor, self._get, KLINES_PATH, params)
+                self.limiter.observe(used_weight)
+                return await loop.run_in_executor(self._executor, _parse_klines, rows)
+            except RateLimitedError as e:
+                if e.banned:
+                    raise
+                # 한도 초과 - 서버가 알려준 시점까지 이 분의 가중치를 소진한 것으로 간주
+                logger.warning(f"Rate limited on {symbol} {interval}; waiting {e.retry_after:.0f}s")
+                self.limiter.observe(self.limiter.limit)
+                await asyncio.sleep(e.retry_after)
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                logger.warning(f"Kline request {symbol} {interval} failed ({e}); retry {attempt}/{self.retries}")
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def get_tick_sizes(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """PRICE_FILTER tick size of each symbol, from one exchangeInfo request."""
+        params = {'symbols': json.dumps(list(symbols), separators=(",", ":"))}
+        loop = asyncio.get_running_loop()
+        await self.limiter.acquire(EXCHANGE_INFO_WEIGHT)
+        async with self._semaphore:
+            self.requests += 1
+            info, used_weight = await loop.run_in_executor(self._executor, self._get, EXCHANGE_INFO_PATH, params)
+        self.limiter.observe(used_weight)
+        return _parse_tick_sizes(info)
+
+    async def get_depth(self, symbol: str, limit: int = 1000) -> dict:
+        """Order book snapshot ({'lastUpdateId', 'bids', 'asks'}) with up to `limit` levels a side."""
+        weight = next((w for max_limit, w in DEPTH_WEIGHTS if limit <= max_limit), DEPTH_WEIGHTS[-1][1])
+        loop = asyncio.get_running_loop()
+        await self.limiter.acquire(weight)
+        async with self._semaphore:
+            self.requests += 1
+            depth, used_weight = await loop.run_in_executor(
+                self._executor, self._get, DEPTH_PATH, {'symbol': symbol, 'limit': limit})
+        self.limiter.observe(used_weight)
+        return depth
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class KlineBackfill(CandleHistorySource):
+    """
+    Fetches the latest closed klines of every (symbol, timeframe) before the
+    detectors start, and any past range on demand (candles(), e.g. to refill
+    a gap in the live stream).
+
+    All pages of all pairs are requested concurrently, bounded by the
+    client's concurrency and the exchange weight limit; a range longer than
+    one page is split into page-sized requests up front instead of walked
+    sequentially. With a CandleArchive as cache, only the bars after the
+    last archived one are fetched, and the fetched bars are appended to it,
+    so a restart costs one request per pair.
+    """
+
+    def __init__(self, client: BinanceRestClient, archive: Optional[CandleArchive] = None,
+                 clock: Optional[Clock] = None):
+        self.client = client
+        self.archive = archive
+        self.clock = clock or SystemClock()
+        self.bars_fetched = 0
+
+    def _plan(self, symbols: Sequence[str], timeframes: Sequence[str], bars: int,
+              now: float) -> Dict[Tuple[str, str], Tuple[int, int, int]]:
+        """(first bar, last closed bar, first bar to fetch) open times in ms per pair."""
+        plan = {}
+        for symbol in symbols:
+            for timeframe in timeframes:
+                period = timeframe_seconds(timeframe)
+                last = int(bar_open_time(now, timeframe)) - period
+                first = last - (bars - 1) * period
+                fetch_from = first
+                cached = self.archive.time_range(symbol, MarketStream.kline(timeframe)) if self.archive else None
+                if cached is not None and cached[1] >= first:
+                    fetch_from = int(cached[1]) + period
+                plan[(symbol, timeframe)] = (first * 1000, last * 1000, fetch_from * 1000)
+        return plan
+
+    async def _fetch_pair(self, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> Dict[str, np.ndarray]:
+        page_ms = PAGE_LIMIT * timeframe_seconds(timeframe) * 1000
+        pages = await asyncio.gather(*(
+            self.client.get_klines(symbol, timeframe, page_start, min(page_start + page_ms - 1, end_ms))
+            for page_start in range(start_ms, end_ms + 1, page_ms)
+        ))
+        columns = {name: np.concatenate([page[name] for page in pages]) for name, _ in CandleRingBuffer.COLUMNS}
+        # 아직 열려 있는 봉은 제외
+        closed = columns['timestamp'] <= end_ms
+        return {name: values[closed] for name, values in columns.items()}
+
+    async def fetch(self, symbols: Sequence[str], timeframes: Sequence[str], bars: int = 500,
+                    now: Optional[float] = None) -> Dict[Tuple[str, str], CandleWindow]:
+        """The last `bars` closed candles of every pair (fewer if the exchange has fewer)."""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        now = self.clock.time() if now is None else now
+        plan = await loop.run_in_executor(None, self._plan, symbols, timeframes, bars, now)
+
+        keys = [key for key, (_, last, fetch_from) in plan.items() if fetch_from <= last]
+        results = await asyncio.gather(*(
+            self._fetch_pair(symbol, timeframe, plan[(symbol, timeframe)][2], plan[(symbol, timeframe)][1])
+            for symbol, timeframe in keys
+        ), return_exceptions=True)
+
+        fetched: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Backfill of {key[0]} {key[1]} failed: {result}")
+                continue
+            fetched[key] = result
+            self.bars_fetched += len(result['timestamp'])
+
+        if self.archive is not None:
+            windows = await loop.run_in_executor(None, self._archive_and_read, plan, fetched)
+        else:
+            windows = {key: CandleWindow(columns) for key, columns in fetched.items()}
+        logger.info(f"Backfilled {len(windows)} pairs ({len(keys)} fetched, {self.bars_fetched} bars, "
+                    f"{self.client.requests} requests) in {time.perf_counter() - started:.2f}s")
+        return windows
+
+    async def candles(self, symbol: str, timeframe: str, start: float, end: float) -> CandleWindow:
+        columns = await self._fetch_pair(symbol, timeframe, round(start * 1000), round(end * 1000))
+        self.bars_fetched += len(columns['timestamp'])
+        return CandleWindow(columns)
+
+    def _archive_and_read(self, plan: Dict[Tuple[str, str], Tuple[int, int, int]],
+                          fetched: Dict[Tuple[str, str], Dict[str, np.ndarray]]) -> Dict[Tuple[str, str], CandleWindow]:
+        windows = {}
+        for (symbol, timeframe), (first, last, _) in plan.items():
+            if (symbol, timeframe) in fetched:
+                self.archive.append_columns(symbol, MarketStream.kline(timeframe), fetched[(symbol, timeframe)])
+            windows[(symbol, timeframe)] = self.archive.candles(symbol, timeframe, first / 1000, last / 1000 + 1)
+        return windows
+
+
+async def _benchmark(symbols: int, timeframes: List[str], bars: int, latency: float, cache_dir: str):
+    from infrastructure.binance.MockBinanceServer import MockBinanceServer
+
+    server = MockBinanceServer(latency=latency).start()
+    names = [f"SYM{i:03d}USDT" for i in range(symbols)]
+    try:
+        for run in ("cold", "warm"):
+            client = BinanceRestClient(server.url)
+            backfill = KlineBackfill(client, CandleArchive(cache_dir))
+            started = time.perf_counter()
+            windows = await backfill.fetch(names, timeframes, bars)
+            elapsed = time.perf_counter() - started
+            client.close()
+            print(f"{run}: {len(windows)} pairs, {sum(map(len, windows.values()))} bars, "
+                  f"{client.requests} requests, weight waits {client.limiter.waits}, {elapsed:.2f}s")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill benchmark against the local mock REST server")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--timeframes", nargs="+", default=["1m", "5m", "15m", "1h", "4h"])
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock server response delay")
+    parser.add_argument("--cache", help="Archive directory (default: a temporary one)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(_benchmark(args.symbols, args.timeframes, args.bars, args.latency, args.cache or tmp))
@@ -0,0 +1,331 @@
+import argparse
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from domain.ports.MarketDataFeed import MarketStream
+from domain.ports.OrderBook import BookSide, OrderBookSource, OrderBookView
+from domain.services.PriceTicks import tick_scale
+from infrastructure.data.MarketDataHub import RawSource
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Fetches a depth snapshot ({'lastUpdateId', 'bids', 'asks'}) of a symbol,
+# e.g. BinanceRestClient.get_depth
+SnapshotFetcher = Callable[[str], Awaitable[dict]]
+
+
+class _BookSide:
+    """
+    One side of the book as parallel price-level arrays sorted by tick, plus
+    a Fenwick tree of the sizes by array position for range sums. Resizing
+    an existing level updates the tree in O(log n). Adding or removing a
+    level shifts the positions after it, as the list insert/delete itself
+    does, so the tree is dropped and rebuilt in O(n) on the next query.
+    """
+
+    __slots__ = ('ticks', 'sizes', '_tree')
+
+    def __init__(self):
+        self.ticks: List[int] = []
+        self.sizes: List[float] = []
+        self._tree: Optional[List[float]] = None
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    def load(self, levels: Iterable[Tuple[int, float]]):
+        levels = sorted(level for level in levels if level[1] > 0)
+        self.ticks = [tick for tick, _ in levels]
+        self.sizes = [size for _, size in levels]
+        self._tree = None
+
+    def set(self, tick: int, size: float):
+        i = bisect_left(self.ticks, tick)
+        present = i < len(self.ticks) and self.ticks[i] == tick
+        if size > 0:
+            if present:
+                if self._tree is not None:
+                    self._add(i, size - self.sizes[i])
+                self.sizes[i] = size
+            else:
+                self.ticks.insert(i, tick)
+                self.sizes.insert(i, size)
+                self._tree = None
+        elif present:
+            # 수량 0은 레벨 삭제
+            del self.ticks[i]
+            del self.sizes[i]
+            self._tree = None
+
+    def _build(self) -> List[float]:
+        # 1부터 시작하는 Fenwick 배열을 선형 시간에 구성
+        tree = [0.0] + self.sizes
+        n = len(self.sizes)
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        return tree
+
+    def _add(self, position: int, delta: float):
+        tree = self._tree
+        i = position + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, tree: List[float], count: int) -> float:
+        total = 0.0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def size_between(self, low: int, high: int) -> float:
+        start, end = bisect_left(self.ticks, low), bisect_right(self.ticks, high)
+        if start >= end:
+            return 0.0
+        tree = self._tree if self._tree is not None else self._build()
+        # 부동소수점 갱신 오차로 음수가 되지 않게
+        return max(self._prefix(tree, end) - self._prefix(tree, start), 0.0)
+
+
+class LocalOrderBook(OrderBookView):
+    """
+    One symbol's L2 book, seeded from a REST snapshot and kept current from
+    the depth-diff stream following the exchange's sequencing rules: diffs
+    up to the snapshot's lastUpdateId are dropped, the first applied diff
+    must span lastUpdateId + 1, and every later diff must start right after
+    the previous one (U == previous u + 1). A gap takes the book out of sync
+    until the next snapshot; diffs arriving meanwhile are buffered.
+
+    Each side is a pair of tick-sorted arrays, so a level update is a bisect
+    plus an insert or delete, and a range query is two bisects and two
+    prefix sums over the side's Fenwick tree.
+    """
+
+    def __init__(self, symbol: str, max_pending: int = 10000):
+        self.symbol = symbol
+        self.scale = tick_scale(symbol)
+        self.bids = _BookSide()
+        self.asks = _BookSide()
+        self.last_update_id = 0
+        self.synced = False
+        self.diffs_applied = 0
+        self.snapshots = 0
+        self.gaps = 0
+        self._first_diff = False
+        self._pending: Deque[dict] = deque(maxlen=max_pending)
+
+    def _levels(self, levels: Sequence[Sequence[str]]) -> List[Tuple[int, float]]:
+        return [(self.scale.to_ticks(float(price)), float(size)) for price, size in levels]
+
+    def _side(self, side: str) -> _BookSide:
+        return self.bids if side == BookSide.BID else self.asks
+
+    def apply_snapshot(self, snapshot: dict) -> bool:
+        """
+        Loads a snapshot and replays the buffered diffs on top. Returns False
+        when the snapshot is older than the buffered stream (fetch another).
+        """
+        last_update_id = snapshot['lastUpdateId']
+        pending = [event for event in self._pending if event['u'] > last_update_id]
+        if pending and pending[0]['U'] > last_update_id + 1:
+            return False
+
+        self.bids.load(self._levels(snapshot['bids']))
+        self.asks.load(self._levels(snapshot['asks']))
+        self.last_update_id = last_update_id
+        self.synced = True
+        self.snapshots += 1
+        self._first_diff = True
+        self._pending.clear()
+        for event in pending:
+            if not self.apply_diff(event):
+                return False
+        return True
+
+    def invalidate(self):
+        """Marks the book out of sync and drops buffered diffs (stream reconnect)."""
+        self.synced = False
+        self._pending.clear()
+
+    def apply_diff(self, event: dict) -> bool:
+        """
+        Applies a depthUpdate event, or buffers it while out of sync. Returns
+        False when it reveals a sequence gap; the book then waits for a snapshot.
+        """
+        if not self.synced:
+            self._pending.append(event)
+            return True
+        if event['u'] <= self.last_update_id:
+            return True  # 스냅샷에 이미 반영된 이벤트
+        expected = self.last_update_id + 1
+        if event['U'] > expected or (not self._first_diff and event['U'] != expected):
+            logger.warning(f"{self.symbol} depth gap: expected update {expected}, got {event['U']}; resyncing")
+            self.synced = False
+            self.gaps += 1
+            self._pending.clear()
+            self._pending.append(event)
+            return False
+
+        for tick, size in self._levels(event['b']):
+            self.bids.set(tick, size)
+        for tick, size in self._levels(event['a']):
+            self.asks.set(tick, size)
+        self.last_update_id = event['u']
+        self._first_diff = False
+        self.diffs_applied += 1
+        return True
+
+    def best_bid(self) -> Optional[int]:
+        return self.bids.ticks[-1] if self.bids.ticks else None
+
+    def best_ask(self) -> Optional[int]:
+        return self.asks.ticks[0] if self.asks.ticks else None
+
+    def size_between(self, side: str, low_ticks: int, high_ticks: int) -> float:
+        return self._side(side).size_between(low_ticks, high_ticks)
+
+    def levels(self, side: str) -> List[Tuple[int, float]]:
+        """(tick, size) levels of one side in ascending price order."""
+        book_side = self._side(side)
+        return list(zip(book_side.ticks, book_side.sizes))
+
+    def stats(self) -> Dict[str, Any]:
+        return {'synced': self.synced, 'last_update_id': self.last_update_id,
+                'bid_levels': len(self.bids), 'ask_levels': len(self.asks),
+                'diffs_applied': self.diffs_applied, 'snapshots': self.snapshots,
+                'gaps': self.gaps, 'pending': len(self._pending)}
+
+
+class OrderBookManager(OrderBookSource):
+    """
+    Keeps one LocalOrderBook per symbol from one depth-diff stream and one
+    snapshot per (re)sync, shared by every zone of the symbol. The first
+    snapshot is requested once the stream has delivered a diff, so the
+    buffer covers it; after a sequence gap the book is resynced the same
+    way, retrying every `resync_delay` seconds while the snapshot is stale.
+    """
+
+    def __init__(self, fetch_snapshot: SnapshotFetcher, source: RawSource,
+                 resync_delay: float = 1.0, max_pending: int = 10000):
+        self._fetch_snapshot = fetch_snapshot
+        self._source = source
+        self.resync_delay = resync_delay
+        self.max_pending = max_pending
+        self._books: Dict[str, LocalOrderBook] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._syncing: Dict[str, asyncio.Task] = {}
+
+    def book(self, symbol: str) -> Optional[LocalOrderBook]:
+        book = self._books.get(symbol)
+        return book if book is not None and book.synced else None
+
+    def track(self, symbol: str) -> LocalOrderBook:
+        """Starts following a symbol's book (idempotent)."""
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = LocalOrderBook(symbol, self.max_pending)
+            self._tasks[symbol] = asyncio.create_task(self._follow(book))
+            logger.info(f"Local order book opened for {symbol}")
+        return book
+
+    async def run(self, symbols: Sequence[str]):
+        """심볼별 오더북 추적 (백그라운드 코루틴)"""
+        for symbol in symbols:
+            self.track(symbol)
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _follow(self, book: LocalOrderBook):
+        """깊이 차분 수신 - 동기화가 끊기면 스냅샷 재요청"""
+        while True:
+            try:
+                async for event in self._source(book.symbol, MarketStream.DEPTH):
+                    book.apply_diff(event)
+                    if not book.synced and book.symbol not in self._syncing:
+                        self._syncing[book.symbol] = asyncio.create_task(self._resync(book))
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Depth stream error for {book.symbol}: {e}")
+                # 재연결 후 이어지는 차분은 연속성이 없으므로 스냅샷부터 다시
+                book.invalidate()
+                await asyncio.sleep(5)
+
+    async def _resync(self, book: LocalOrderBook):
+        try:
+            while True:
+                try:
+                    snapshot = await self._fetch_snapshot(book.symbol)
+                    if book.apply_snapshot(snapshot):
+                        logger.info(f"{book.symbol} order book synced at update {book.last_update_id}")
+                        return
+                except Exception as e:
+                    logger.error(f"Depth snapshot for {book.symbol} failed: {e}")
+                await asyncio.sleep(self.resync_delay)
+        finally:
+            self._syncing.pop(book.symbol, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {symbol: book.stats() for symbol, book in self._books.items()}
+
+    async def close(self):
+        tasks = list(self._tasks.values()) + list(self._syncing.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _replay(symbol: str, diffs: int, drop: int, levels: int, queries: int, path: Optional[str]):
+    from infrastructure.replay.DepthRecording import DepthReplay, load_depth_recording, synthetic_depth
+
+    if path:
+        snapshot, events = load_depth_recording(path)
+    else:
+        snapshot, events = synthetic_depth(symbol, diffs, levels=levels)
+    replay = DepthReplay({symbol: (snapshot, events)}, drop_every=drop)
+    manager = OrderBookManager(replay.fetch_snapshot, replay.source, resync_delay=0.0)
+
+    started = time.perf_counter()
+    book = manager.track(symbol)
+    await replay.finished(symbol)
+    while not book.synced:
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+
+    expected = replay.reference(symbol)
+    matches = book.levels(BookSide.BID) == expected[BookSide.BID] and \
+        book.levels(BookSide.ASK) == expected[BookSide.ASK]
+    print(f"{len(events)} diffs in {elapsed:.2f}s ({len(events) / elapsed:.0f}/s), {replay.dropped} dropped, "
+          f"{replay.snapshots_served} snapshots; book {book.stats()}")
+    print(f"book matches replay reference: {matches}")
+
+    best_bid, best_ask = book.best_bid(), book.best_ask()
+    started = time.perf_counter()
+    for i in range(queries):
+        book.size_within(BookSide.BID if i % 2 else BookSide.ASK, best_bid if i % 2 else best_ask, 50)
+    elapsed = time.perf_counter() - started
+    print(f"{queries} size_within queries: {elapsed / queries * 1e6:.2f} us each")
+    await manager.close()
+    return matches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded or synthetic depth diffs into a local order book")
+    parser.add_argument("--symbol", default="BTCUSDT")
+    parser.add_argument("--recording", help="JSON-lines depth recording (snapshot line, then depthUpdate events)")
+    parser.add_argument("--diffs", type=int, default=50000, help="Synthetic diffs when no recording is given")
+    parser.add_argument("--levels", type=int, default=1000, help="Synthetic snapshot levels per side")
+    parser.add_argument("--drop", type=int, default=10000, help="Drop every Nth diff to force resyncs (0: none)")
+    parser.add_argument("--queries", type=int, default=100000)
+    args = parser.parse_args()
+
+    asyncio.run(_replay(args.symbol, args.diffs, args.drop, args.levels, args.queries, args.recording))
@@ -0,0 +1,177 @@
+import argparse
+import json
+import logging
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from domain.services.Timeframe import timeframe_seconds
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+KLINES_PATH = "/api/v3/klines"
+KLINES_WEIGHT = 2
+MAX_LIMIT = 1000
+EXCHANGE_INFO_PATH = "/api/v3/exchangeInfo"
+EXCHANGE_INFO_WEIGHT = 20
+MOCK_TICK_SIZE = "0.00010000"
+
+
+def mock_klines(symbol: str, interval: str, open_times_ms: np.ndarray) -> List[list]:
+    """
+    Deterministic klines for any open times: prices are a function of the
+    symbol and the bar's time only, so overlapping or out-of-order page
+    requests always agree.
+    """
+    period_ms = timeframe_seconds(interval) * 1000
+    base = 50 + zlib.crc32(symbol.encode()) % 1000
+
+    def price(t: np.ndarray) -> np.ndarray:
+        days = t / 86_400_000
+        return base * (1 + 0.05 * np.sin(days * 2.1) + 0.01 * np.sin(days * 37.0) + 0.002 * np.sin(days * 911.0))
+
+    opens, closes = price(open_times_ms), price(open_times_ms + period_ms)
+    # 시간으로 시드한 노이즈 - 같은 봉은 항상 같은 값
+    noise = (np.sin(open_times_ms / 1000 * 12.9898) * 43758.5453) % 1
+    highs = np.maximum(opens, closes) * (1 + 0.001 * noise)
+    lows = np.minimum(opens, closes) * (1 - 0.001 * (1 - noise))
+    volumes = 10 + 90 * noise
+    return [
+        [int(t), f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}", int(t) + period_ms - 1,
+         "0", 0, "0", "0", "0"]
+        for t, o, h, l, c, v in zip(open_times_ms.tolist(), opens.tolist(), highs.tolist(),
+                                    lows.tolist(), closes.tolist(), volumes.tolist())
+    ]
+
+
+class MockBinanceServer:
+    """
+    Local stand-in for the Binance spot REST API's GET /api/v3/klines and
+    /api/v3/exchangeInfo (tick sizes only), for backfill tests and benchmarks. Answers with deterministic klines after
+    `latency` seconds, accounts request weight per wall-clock minute like the
+    exchange (X-MBX-USED-WEIGHT-1M header, 429 with Retry-After once
+    `weight_limit` is exceeded) and only serves bars that have opened.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05, weight_limit: int = 6000):
+        self.latency = latency
+        self.weight_limit = weight_limit
+        self.requests = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._minute = 0
+        self._used_weight = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockBinanceServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-binance", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _charge(self, weight: int) -> int:
+        """Adds the request's weight to the current minute; returns the minute's total."""
+        with self._lock:
+            minute = int(time.time() // 60)
+            if minute != self._minute:
+                self._minute, self._used_weight = minute, 0
+            self._used_weight += weight
+            self.requests += 1
+            return self._used_weight
+
+    def _klines(self, query: Dict[str, List[str]]) -> List[list]:
+        symbol = query['symbol'][0]
+        interval = query['interval'][0]
+        limit = min(int(query.get('limit', ['500'])[0]), MAX_LIMIT)
+        period_ms = timeframe_seconds(interval) * 1000
+        now_ms = int(time.time() * 1000)
+        end = min(int(query['endTime'][0]) if 'endTime' in query else now_ms, now_ms)
+        if 'startTime' in query:
+            start = -(-int(query['startTime'][0]) // period_ms) * period_ms
+            open_times = np.arange(start, end + 1, period_ms, dtype=np.int64)[:limit]
+        else:
+            last = end // period_ms * period_ms
+            open_times = np.arange(last - (limit - 1) * period_ms, last + 1, period_ms, dtype=np.int64)
+        return mock_klines(symbol, interval, open_times)
+
+    def _exchange_info(self, query: Dict[str, List[str]]) -> dict:
+        symbols = json.loads(query['symbols'][0]) if 'symbols' in query else [query['symbol'][0]]
+        return {'symbols': [
+            {'symbol': symbol, 'status': 'TRADING',
+             'filters': [{'filterType': 'PRICE_FILTER', 'minPrice': MOCK_TICK_SIZE,
+                          'maxPrice': "1000000.00000000", 'tickSize': MOCK_TICK_SIZE}]}
+            for symbol in symbols
+        ]}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                routes = {KLINES_PATH: (server._klines, KLINES_WEIGHT),
+                          EXCHANGE_INFO_PATH: (server._exchange_info, EXCHANGE_INFO_WEIGHT)}
+                if url.path not in routes:
+                    self._reply(404, {'code': -1, 'msg': 'Not found'})
+                    return
+                route, weight = routes[url.path]
+                time.sleep(server.latency)
+                used = server._charge(weight)
+                if used > server.weight_limit:
+                    server.rejected += 1
+                    retry_after = 60 - int(time.time()) % 60
+                    self._reply(429, {'code': -1003, 'msg': 'Too many requests'}, used, retry_after)
+                    return
+                try:
+                    body = route(parse_qs(url.query))
+                except (KeyError, ValueError) as e:
+                    self._reply(400, {'code': -1100, 'msg': f"Illegal parameters: {e}"}, used)
+                    return
+                self._reply(200, body, used)
+
+            def _reply(self, status: int, body, used_weight: int = 0, retry_after: Optional[int] = None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("X-MBX-USED-WEIGHT-1M", str(used_weight))
+                if retry_after is not None:
+                    self.send_header("Retry-After", str(retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve mock Binance klines and tick sizes over HTTP")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before each response")
+    parser.add_argument("--weight-limit", type=int, default=6000, help="Request weight per minute")
+    args = parser.parse_args()
+
+    mock = MockBinanceServer(port=args.port, latency=args.latency, weight_limit=args.weight_limit).start()
+    logger.info(f"Mock Binance REST API on {mock.url}{KLINES_PATH}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        mock.stop()
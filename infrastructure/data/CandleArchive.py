@@ -0,0 +1,336 @@
+import asyncio
+import collections
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.ports.MarketDataFeed import MarketStream
+from domain.services.ColumnarRingBuffer import CandleRingBuffer, CandleWindow, TickRingBuffer
+from domain.services.Timeframe import timeframe_seconds
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+INDEX_FILE = "index.json"
+# (first timestamp ms, last timestamp ms, rows) of one time partition
+PartitionEntry = Tuple[int, int, int]
+
+
+def _columns_for(stream_type: str) -> Tuple[Tuple[str, type], ...]:
+    # Same column layout as the in-memory ring buffers
+    return TickRingBuffer.COLUMNS if stream_type == MarketStream.TRADE else CandleRingBuffer.COLUMNS
+
+
+def _partition_unit(stream_type: str) -> str:
+    """
+    NumPy datetime unit of the time partitions: UTC days for trades and 1m
+    candles, months up to 30m and years from 1h, so a partition holds
+    roughly 1k-10k rows whatever the timeframe.
+    """
+    if stream_type == MarketStream.TRADE:
+        return 'D'
+    seconds = timeframe_seconds(stream_type[len(MarketStream.kline("")):])
+    return 'D' if seconds < 300 else 'M' if seconds < 3600 else 'Y'
+
+
+def _rows_of(stream_type: str, messages: Sequence[Any]) -> Dict[str, np.ndarray]:
+    if stream_type == MarketStream.TRADE:
+        return {
+            'price': np.array([t.price for t in messages], dtype=np.float64),
+            'quantity': np.array([t.quantity for t in messages], dtype=np.float64),
+            'timestamp': np.array([round(t.timestamp * 1000) for t in messages], dtype=np.int64),
+        }
+    return {
+        'open': np.array([c.open for c in messages], dtype=np.float64),
+        'high': np.array([c.high for c in messages], dtype=np.float64),
+        'low': np.array([c.low for c in messages], dtype=np.float64),
+        'close': np.array([c.close for c in messages], dtype=np.float64),
+        'volume': np.array([c.volume for c in messages], dtype=np.float64),
+        'timestamp': np.array([round(c.timestamp * 1000) for c in messages], dtype=np.int64),
+    }
+
+
+class _MapCache:
+    """
+    Archive-wide LRU of memory-mapped partitions. Every mmap holds a file
+    descriptor, so only the `capacity` most recently read partitions stay
+    mapped; evicted maps close once no returned view references them.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._maps: "collections.OrderedDict[str, Tuple[int, Dict[str, np.ndarray]]]" = collections.OrderedDict()
+
+    def get(self, directory: str, rows: int) -> Optional[Dict[str, np.ndarray]]:
+        cached = self._maps.get(directory)
+        if cached is None or cached[0] != rows:
+            return None
+        self._maps.move_to_end(directory)
+        return cached[1]
+
+    def put(self, directory: str, rows: int, views: Dict[str, np.ndarray]):
+        self._maps[directory] = (rows, views)
+        self._maps.move_to_end(directory)
+        while len(self._maps) > self.capacity:
+            self._maps.popitem(last=False)
+
+
+class _Partition:
+    """One (symbol, stream type): a directory of time partition subdirectories plus an index."""
+
+    def __init__(self, path: str, columns: Tuple[Tuple[str, type], ...], unit: str, maps: _MapCache):
+        self.path = path
+        self.columns = columns
+        self.unit = unit
+        self.periods: Dict[str, PartitionEntry] = {}
+        self._index_mtime: Optional[float] = None
+        self._maps = maps
+        self.reload()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.path, INDEX_FILE)
+
+    def reload(self):
+        """Re-reads the index if another process appended since the last read."""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._index_mtime:
+            with open(self.index_path) as f:
+                self.periods = {name: tuple(entry) for name, entry in json.load(f).items()}
+            self._index_mtime = mtime
+
+    def _write_index(self, periods: Dict[str, PartitionEntry]):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(dict(sorted(periods.items())), f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+        self._index_mtime = os.stat(self.index_path).st_mtime_ns
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return max((entry[1] for entry in self.periods.values() if entry[2]), default=None)
+
+    def append(self, rows: Dict[str, np.ndarray]) -> int:
+        """Appends rows (sorted by timestamp); rows not newer than the stored ones are dropped."""
+        timestamps = rows['timestamp']
+        last = self.last_timestamp
+        if last is not None:
+            keep = timestamps > last
+            if not keep.all():
+                rows = {name: values[keep] for name, values in rows.items()}
+                timestamps = rows['timestamp']
+        if not len(timestamps):
+            return 0
+
+        # Readers on the event loop may hold the old index; it is swapped in whole
+        periods = dict(self.periods)
+        units = timestamps.astype('datetime64[ms]').astype(f'datetime64[{self.unit}]')
+        boundaries = np.flatnonzero(np.diff(units.astype(np.int64))) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(timestamps)]):
+            name = str(units[start])
+            periods[name] = self._append_period(name, periods.get(name),
+                                                {column: values[start:end] for column, values in rows.items()})
+        self._write_index(periods)
+        self.periods = periods
+        return len(timestamps)
+
+    def _append_period(self, period: str, entry: Optional[PartitionEntry], rows: Dict[str, np.ndarray]) -> PartitionEntry:
+        directory = os.path.join(self.path, period)
+        os.makedirs(directory, exist_ok=True)
+        first, _, count = entry or (int(rows['timestamp'][0]), 0, 0)
+        for name, dtype in self.columns:
+            path = os.path.join(directory, name)
+            with open(path, 'ab') as f:
+                # 이전 쓰기가 색인 갱신 전에 중단되었다면 색인 기준으로 잘라냄
+                size = count * np.dtype(dtype).itemsize
+                if f.tell() != size:
+                    f.truncate(size)
+                f.write(np.ascontiguousarray(rows[name], dtype=dtype).tobytes())
+        return first, int(rows['timestamp'][-1]), count + len(rows['timestamp'])
+
+    def _period_views(self, period: str, rows: int) -> Dict[str, np.ndarray]:
+        directory = os.path.join(self.path, period)
+        views = self._maps.get(directory, rows)
+        if views is None:
+            views = {
+                name: np.memmap(os.path.join(directory, name), dtype=dtype, mode='r', shape=(rows,))
+                for name, dtype in self.columns
+            }
+            self._maps.put(directory, rows, views)
+        return views
+
+    def chunks(self, start_ms: Optional[int], end_ms: Optional[int]) -> Iterator[Dict[str, np.ndarray]]:
+        """Zero-copy column views of [start_ms, end_ms), one per time partition."""
+        self.reload()
+        periods = self.periods
+        for period in sorted(periods):
+            first, last, rows = periods[period]
+            if not rows or (start_ms is not None and last < start_ms) or (end_ms is not None and first >= end_ms):
+                continue
+            views = self._period_views(period, rows)
+            timestamps = views['timestamp']
+            lo = 0 if start_ms is None or first >= start_ms else int(np.searchsorted(timestamps, start_ms, side='left'))
+            hi = rows if end_ms is None or last < end_ms else int(np.searchsorted(timestamps, end_ms, side='left'))
+            if hi > lo:
+                yield {name: view[lo:hi] for name, view in views.items()}
+
+
+class CandleArchive:
+    """
+    Append-only on-disk store of closed candles and trades.
+
+    Laid out as <root>/<symbol>/<stream type>/<period>/<column>, where a
+    period is a UTC day, month or year depending on the timeframe (see
+    _partition_unit): one file of fixed-width native-endian values per
+    column (the ring buffers' columns: float64 prices and volume, int64
+    timestamps in ms), plus one small index.json per (symbol, stream type)
+    mapping each period to its first and last timestamp and row count. The
+    index is rewritten atomically after the column files, so it only ever
+    covers complete rows.
+
+    Reads memory-map the period files and return NumPy views: a range within
+    one period is never copied, a range spanning periods is copied once into
+    contiguous arrays. Use the *_chunks methods to walk long ranges period
+    by period without any copy. Times are epoch seconds; ranges are
+    [start, end). At most `max_mapped` partitions stay mapped between reads.
+    """
+
+    def __init__(self, root: str, max_mapped: int = 512):
+        self.root = root
+        self._partitions: Dict[Tuple[str, str], _Partition] = {}
+        self._maps = _MapCache(max_mapped)
+
+    def _partition(self, symbol: str, stream_type: str) -> _Partition:
+        key = (symbol, stream_type)
+        partition = self._partitions.get(key)
+        if partition is None:
+            path = os.path.join(self.root, symbol, stream_type)
+            os.makedirs(path, exist_ok=True)
+            partition = self._partitions[key] = _Partition(
+                path, _columns_for(stream_type), _partition_unit(stream_type), self._maps)
+        return partition
+
+    def append(self, symbol: str, stream_type: str, messages: Sequence[Any]) -> int:
+        """Appends decoded candles or trades in time order. Returns the rows written."""
+        if not messages:
+            return 0
+        return self._partition(symbol, stream_type).append(_rows_of(stream_type, messages))
+
+    def append_columns(self, symbol: str, stream_type: str, columns: Dict[str, np.ndarray]) -> int:
+        """Bulk append of column arrays (e.g. a backfill), timestamps in ms."""
+        return self._partition(symbol, stream_type).append(columns)
+
+    def time_range(self, symbol: str, stream_type: str) -> Optional[Tuple[float, float]]:
+        """(first, last) stored timestamp in seconds, or None when empty."""
+        partition = self._partition(symbol, stream_type)
+        partition.reload()
+        entries = [entry for entry in partition.periods.values() if entry[2]]
+        if not entries:
+            return None
+        return min(e[0] for e in entries) / 1000, max(e[1] for e in entries) / 1000
+
+    def _range(self, symbol: str, stream_type: str, start: Optional[float], end: Optional[float]) -> Dict[str, np.ndarray]:
+        partition = self._partition(symbol, stream_type)
+        chunks = list(partition.chunks(_to_ms(start), _to_ms(end)))
+        if len(chunks) == 1:
+            return chunks[0]
+        return {
+            name: np.concatenate([chunk[name] for chunk in chunks]) if chunks else np.empty(0, dtype=dtype)
+            for name, dtype in partition.columns
+        }
+
+    def candles(self, symbol: str, timeframe: str, start: Optional[float] = None,
+                end: Optional[float] = None) -> CandleWindow:
+        return CandleWindow(self._range(symbol, MarketStream.kline(timeframe), start, end))
+
+    def candle_chunks(self, symbol: str, timeframe: str, start: Optional[float] = None,
+                      end: Optional[float] = None) -> Iterator[CandleWindow]:
+        for chunk in self._partition(symbol, MarketStream.kline(timeframe)).chunks(_to_ms(start), _to_ms(end)):
+            yield CandleWindow(chunk)
+
+    def trades(self, symbol: str, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Columns 'price', 'quantity' and 'timestamp' of the trades in range."""
+        return self._range(symbol, MarketStream.TRADE, start, end)
+
+    def trade_chunks(self, symbol: str, start: Optional[float] = None,
+                     end: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+        yield from self._partition(symbol, MarketStream.TRADE).chunks(_to_ms(start), _to_ms(end))
+
+
+def _to_ms(timestamp: Optional[float]) -> Optional[int]:
+    return None if timestamp is None else round(timestamp * 1000)
+
+
+class AsyncArchiveWriter:
+    """
+    Batches appends to a CandleArchive off the event loop. append() only
+    queues the message; a background task writes everything pending in an
+    executor every `flush_interval` seconds, or as soon as `max_batch`
+    messages are queued. Writes never overlap: close() lets an in-flight
+    flush finish before writing the rest.
+    """
+
+    def __init__(self, archive: CandleArchive, max_batch: int = 5000, flush_interval: float = 1.0):
+        self.archive = archive
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self._pending: Dict[Tuple[str, str], List[Any]] = {}
+        self._pending_count = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        # 실행기에서 도는 쓰기를 한 번에 하나로 직렬화
+        self._lock = asyncio.Lock()
+
+    def append(self, symbol: str, stream_type: str, message: Any):
+        """Queues a closed candle or trade. Never blocks."""
+        self._pending.setdefault((symbol, stream_type), []).append(message)
+        self._pending_count += 1
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        if self._pending_count >= self.max_batch:
+            self._wakeup.set()
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Writes everything queued so far."""
+        if not self._pending_count:
+            return
+        async with self._lock:
+            batch, self._pending, self._pending_count = self._pending, {}, 0
+            if not batch:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                self.rows_written += await loop.run_in_executor(None, self._write, batch)
+            except Exception as e:
+                logger.error(f"Archive write failed, {sum(map(len, batch.values()))} rows lost: {e}")
+
+    def _write(self, batch: Dict[Tuple[str, str], List[Any]]) -> int:
+        return sum(self.archive.append(symbol, stream_type, messages)
+                   for (symbol, stream_type), messages in batch.items())
+
+    async def close(self):
+        # 취소하면 실행기의 쓰기가 계속 도는 채로 다음 쓰기가 겹치므로, 루프를 깨워 스스로 끝내게 함
+        if self._task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task, self._closing = None, False
+        await self.flush()
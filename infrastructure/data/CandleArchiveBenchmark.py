@@ -0,0 +1,95 @@
+import argparse
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from domain.ports.MarketDataFeed import MarketStream
+from infrastructure.data.CandleArchive import CandleArchive
+
+DAY = 86400
+
+
+def synthetic_columns(start: int, count: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Random-walk 1m candles as archive columns (timestamps in ms)."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    open_ = np.r_[100.0, close[:-1]]
+    spread = np.abs(rng.normal(0, 0.0005, count))
+    return {
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + spread),
+        'low': np.minimum(open_, close) * (1 - spread),
+        'close': close,
+        'volume': rng.uniform(1, 100, count),
+        'timestamp': (start + np.arange(count, dtype=np.int64) * 60) * 1000,
+    }
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def run_benchmark(days: int, repeat: int) -> Dict[str, Any]:
+    start = 1_704_067_200  # 2024-01-01 UTC
+    columns = synthetic_columns(start, days * 1440)
+    rows = len(columns['timestamp'])
+
+    with tempfile.TemporaryDirectory() as root:
+        archive = CandleArchive(root)
+        started = time.perf_counter()
+        for day in range(days):  # 백필처럼 하루씩 추가
+            batch = slice(day * 1440, (day + 1) * 1440)
+            archive.append_columns("BTCUSDT", MarketStream.kline("1m"), {k: v[batch] for k, v in columns.items()})
+        append_seconds = time.perf_counter() - started
+        archive_bytes = _directory_size(root)
+
+        # 새 인스턴스: 색인 로드와 mmap 생성까지 포함한 첫 조회
+        cold = CandleArchive(root)
+        started = time.perf_counter()
+        window = cold.candles("BTCUSDT", "1m")
+        first_query = time.perf_counter() - started
+        assert len(window) == rows and window.close[-1] == columns['close'][-1]
+
+        end = start + days * DAY
+        results = {
+            'rows': rows,
+            'append_rows_per_s': round(rows / append_seconds),
+            'first_full_range_ms': round(first_query * 1000, 2),
+            'full_range_ms': round(_time(lambda: archive.candles("BTCUSDT", "1m", start, end), repeat) * 1000, 2),
+            'full_range_chunks_ms': round(_time(lambda: list(archive.candle_chunks("BTCUSDT", "1m", start, end)), repeat) * 1000, 2),
+            'one_day_ms': round(_time(lambda: archive.candles("BTCUSDT", "1m", end - 2 * DAY, end - DAY), repeat) * 1000, 3),
+            'one_hour_ms': round(_time(lambda: archive.candles("BTCUSDT", "1m", end - DAY, end - DAY + 3600), repeat) * 1000, 3),
+        }
+
+    table = np.column_stack([columns[name] for name in ('timestamp', 'open', 'high', 'low', 'close', 'volume')])
+    text = io.StringIO()
+    csv.writer(text).writerows(table.tolist())
+    results['archive_bytes_per_row'] = round(archive_bytes / rows, 1)
+    results['csv_bytes_per_row'] = round(len(text.getvalue()) / rows, 1)
+    keys = ('t', 'o', 'h', 'l', 'c', 'v')
+    results['json_bytes_per_row'] = round(len(json.dumps([dict(zip(keys, row)) for row in table.tolist()])) / rows, 1)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Candle archive append/range-query benchmark")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for name, value in run_benchmark(args.days, args.repeat).items():
+        print(f"{name:>24}: {value}")
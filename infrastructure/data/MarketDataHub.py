@@ -0,0 +1,349 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from domain.entities.MarketData import Candle, PriceTick
+from domain.ports.Clock import Clock, SystemClock
+from domain.ports.MarketDataFeed import MarketDataFeed, MarketStream
+from domain.services.ColumnarRingBuffer import CandleRingBuffer, CandleWindow
+from domain.services.CandleAggregator import CandleAggregator
+from domain.services.Timeframe import timeframe_seconds
+from infrastructure.data.CandleArchive import AsyncArchiveWriter
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# A source opens one upstream connection for a (symbol, stream type) pair and
+# yields raw exchange messages (Binance websocket payloads).
+RawSource = Callable[[str, str], AsyncIterator[dict]]
+
+
+async def simulated_source(symbol: str, stream_type: str) -> AsyncIterator[dict]:
+    # Placeholder for a real-time exchange websocket connection
+    if stream_type == MarketStream.TRADE:
+        price = 100.0
+        while True:
+            # Simulate some price movement
+            now = time.time()
+            price += 0.1 * (-1 if now % 2 > 1 else 1)
+            yield {'e': 'aggTrade', 'E': int(now * 1000), 's': symbol,
+                   'p': f"{price:.2f}", 'q': "1.0", 'T': int(now * 1000)}
+            await asyncio.sleep(0.1)
+    else:
+        interval = stream_type.split('_', 1)[-1]
+        period_ms = timeframe_seconds(interval) * 1000
+        # Accelerated clock: one bar per second, bar open times aligned like the exchange's
+        bar_open = int(time.time() * 1000) // period_ms * period_ms
+        while True:
+            await asyncio.sleep(1)  # Simulate receiving a new candle every second
+            now = time.time()
+            drift = 5 * math.sin(now / 10)
+            bar_open += period_ms
+            yield {'e': 'kline', 'E': int(now * 1000), 's': symbol, 'k': {
+                't': bar_open, 'T': bar_open + period_ms - 1, 's': symbol, 'i': interval,
+                'o': f"{98 + drift:.2f}", 'c': f"{102 + drift:.2f}",
+                'h': f"{105 + drift:.2f}", 'l': f"{95 + drift:.2f}",
+                'v': "10.0", 'x': True,
+            }}
+
+
+def decode_message(stream_type: str, raw: dict) -> Tuple[Any, float]:
+    """Decodes a raw exchange message. Returns (message, event time in seconds)."""
+    if stream_type == MarketStream.TRADE:
+        tick = PriceTick(price=float(raw['p']), timestamp=raw['T'] / 1000, quantity=float(raw['q']))
+        return tick, raw['E'] / 1000
+
+    k = raw['k']
+    candle = Candle(
+        high=float(k['h']),
+        low=float(k['l']),
+        timestamp=k['t'] / 1000,
+        open=float(k['o']),
+        close=float(k['c']),
+        volume=float(k['v']),
+        is_closed=k['x'],
+    )
+    return candle, raw['E'] / 1000
+
+
+class SubscriptionClosed(Exception):
+    """Raised by MarketDataSubscription.get() once the subscription or the hub is closed."""
+
+
+class MarketDataSubscription:
+    """
+    A bounded per-consumer queue fed by one upstream.
+    When the consumer falls behind, the oldest pending message is dropped.
+    Closing the subscription (or the hub) wakes a consumer waiting in get().
+    """
+
+    def __init__(self, hub: "MarketDataHub", key: Tuple[str, str], maxsize: int):
+        self.key = key
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._hub = hub
+        self._buffer: Deque[Any] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def push(self, message: Any):
+        if len(self._buffer) >= self.maxsize:
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append(message)
+        self._ready.set()
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    async def get(self) -> Any:
+        while not self._buffer:
+            if self._closed:
+                raise SubscriptionClosed(f"Subscription to {self.key[0]} {self.key[1]} is closed")
+            self._ready.clear()
+            await self._ready.wait()
+        return self._buffer.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            return await self.get()
+        except SubscriptionClosed:
+            raise StopAsyncIteration
+
+    def _wake_closed(self):
+        self._closed = True
+        self._ready.set()
+
+    def close(self):
+        if not self._closed:
+            self._wake_closed()
+            self._hub._unsubscribe(self)
+
+
+class FeedStats:
+    """Ingest statistics of a single upstream."""
+
+    def __init__(self):
+        self.messages = 0
+        self.decode_errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def record(self, lag: float):
+        self.messages += 1
+        self.last_lag = lag
+        self.total_lag += lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'messages': self.messages,
+            'decode_errors': self.decode_errors,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+            'avg_lag': self.total_lag / self.messages if self.messages else 0.0,
+        }
+
+
+class _Upstream:
+    def __init__(self):
+        self.subscriptions: List[MarketDataSubscription] = []
+        self.stats = FeedStats()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MarketDataHub(MarketDataFeed):
+    """
+    Keeps one upstream per (symbol, stream type), decodes each message once
+    and fans it out to any number of consumers. Closed candles are also
+    appended to shared columnar ring buffers, created on first request, and
+    stamped with their row's sequence number. A history holds at least
+    `queue_maxsize` rows, so a consumer a full queue behind still reads the
+    window ending at its own message.
+
+    Klines of timeframes that are a multiple of `base_timeframe` are not
+    fetched from the exchange: they are rolled up from the symbol's base kline
+    stream by a CandleAggregator, so a symbol needs one kline upstream and all
+    its timeframes stay consistent. Pass base_timeframe=None to fetch every
+    timeframe directly.
+
+    With an `archive` writer, every closed candle and trade is also queued
+    for the on-disk CandleArchive.
+    """
+
+    def __init__(self, source: Optional[RawSource] = None, queue_maxsize: int = 1000,
+                 history_capacity: int = 1000, base_timeframe: Optional[str] = "1m",
+                 clock: Optional[Clock] = None, archive: Optional[AsyncArchiveWriter] = None,
+                 reconnect_delay: float = 5.0):
+        self._source = source or simulated_source
+        self.reconnect_delay = reconnect_delay
+        self._archive = archive
+        self._clock = clock or SystemClock()
+        self._queue_maxsize = queue_maxsize
+        # 큐만큼 밀린 소비자도 자기 메시지의 행을 찾을 수 있도록
+        self._history_capacity = max(history_capacity, queue_maxsize)
+        self._base_timeframe = base_timeframe
+        self._upstreams: Dict[Tuple[str, str], _Upstream] = {}
+        self._histories: Dict[Tuple[str, str], CandleRingBuffer] = {}
+
+    def candle_history(self, symbol: str, timeframe: str) -> CandleRingBuffer:
+        key = (symbol, MarketStream.kline(timeframe))
+        history = self._histories.get(key)
+        if history is None:
+            history = self._histories[key] = CandleRingBuffer(self._history_capacity)
+        return history
+
+    def seed_history(self, symbol: str, timeframe: str, candles: CandleWindow):
+        """Appends backfilled candles newer than the history's last one."""
+        history = self.candle_history(symbol, timeframe)
+        last = history.last_timestamp
+        newer = slice(None) if last is None else candles.timestamp > last
+        history.extend({name: getattr(candles, name)[newer] for name in history.names})
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Rows of every candle history (StateSnapshotter provider); trades refill within seconds."""
+        return {f"{symbol}/{stream_type}": history.rows() for (symbol, stream_type), history in self._histories.items()}
+
+    async def restore_state(self, sections: Dict[str, Any]):
+        for name, rows in sections.items():
+            symbol, stream_type = name.rsplit("/", 1)
+            history = self._histories.get((symbol, stream_type))
+            if history is None:
+                history = self._histories[(symbol, stream_type)] = CandleRingBuffer(self._history_capacity)
+            history.extend(rows)
+
+    def subscribe(self, symbol: str, stream_type: str, maxsize: Optional[int] = None) -> MarketDataSubscription:
+        """Registers a consumer. The upstream is opened on the first subscription."""
+        key = (symbol, stream_type)
+        upstream = self._upstreams.get(key)
+        if upstream is None:
+            upstream = _Upstream()
+            self._upstreams[key] = upstream
+            aggregator = self._aggregator_for(stream_type)
+            if aggregator is not None:
+                upstream.task = asyncio.create_task(self._run_aggregated(key, upstream, aggregator))
+                logger.info(f"Aggregated stream opened for {symbol} {stream_type} from {self._base_timeframe}")
+            else:
+                upstream.task = asyncio.create_task(self._run_upstream(key, upstream))
+                logger.info(f"Upstream opened for {symbol} {stream_type}")
+
+        subscription = MarketDataSubscription(self, key, maxsize or self._queue_maxsize)
+        upstream.subscriptions.append(subscription)
+        return subscription
+
+    async def stream(self, symbol: str, stream_type: str) -> AsyncIterator[Any]:
+        subscription = self.subscribe(symbol, stream_type)
+        try:
+            async for message in subscription:
+                yield message
+        finally:
+            subscription.close()
+
+    def _unsubscribe(self, subscription: MarketDataSubscription):
+        upstream = self._upstreams.get(subscription.key)
+        if upstream is None:
+            return
+        if subscription in upstream.subscriptions:
+            upstream.subscriptions.remove(subscription)
+        if not upstream.subscriptions:
+            # 마지막 소비자가 떠나면 업스트림 종료
+            del self._upstreams[subscription.key]
+            if upstream.task and not upstream.task.done():
+                upstream.task.cancel()
+            logger.info(f"Upstream closed for {subscription.key[0]} {subscription.key[1]}")
+
+    def _aggregator_for(self, stream_type: str) -> Optional[CandleAggregator]:
+        if self._base_timeframe is None or not stream_type.startswith("kline_"):
+            return None
+        timeframe = stream_type.split('_', 1)[1]
+        try:
+            return CandleAggregator(timeframe, self._base_timeframe)
+        except ValueError:
+            return None  # 기준 시간대이거나 배수가 아닌 시간대는 직접 수신
+
+    def _dispatch(self, key: Tuple[str, str], upstream: _Upstream, message: Any):
+        if getattr(message, 'is_closed', True):
+            history = self._histories.get(key)
+            if history is not None:
+                # 소비자는 이 순번으로 자기 메시지까지의 윈도우를 읽음
+                message.sequence = history.append(message)
+            if self._archive is not None:
+                self._archive.append(key[0], key[1], message)
+        for subscription in upstream.subscriptions:
+            subscription.push(message)
+
+    async def _run_aggregated(self, key: Tuple[str, str], upstream: _Upstream, aggregator: CandleAggregator):
+        """기준 시간대 캔들을 상위 시간대로 증분 집계하여 분배"""
+        symbol, _ = key
+        base = self.subscribe(symbol, MarketStream.kline(aggregator.base_timeframe))
+        try:
+            async for candle in base:
+                for bar in aggregator.update(candle):
+                    upstream.stats.messages += 1
+                    self._dispatch(key, upstream, bar)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            base.close()
+
+    async def _run_upstream(self, key: Tuple[str, str], upstream: _Upstream):
+        """업스트림 수신, 1회 디코딩 후 모든 소비자에게 분배"""
+        symbol, stream_type = key
+        while True:
+            try:
+                async for raw in self._source(symbol, stream_type):
+                    received_at = self._clock.time()
+                    try:
+                        message, event_time = decode_message(stream_type, raw)
+                    except (KeyError, TypeError, ValueError) as e:
+                        upstream.stats.decode_errors += 1
+                        logger.error(f"Decode error on {symbol} {stream_type}: {e}")
+                        continue
+
+                    upstream.stats.record(received_at - event_time)
+                    self._dispatch(key, upstream, message)
+
+                # 소스가 정상 종료해도 곧바로 다시 열지 않음 (빈 소스의 바쁜 루프 방지)
+                logger.warning(f"Upstream for {symbol} {stream_type} ended; reconnecting in {self.reconnect_delay}s")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Upstream error for {symbol} {stream_type}: {e}")
+            try:
+                await asyncio.sleep(self.reconnect_delay)  # 재연결 대기
+            except asyncio.CancelledError:
+                break
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """업스트림별 수신 통계 및 피드 지연"""
+        snapshot = {}
+        for (symbol, stream_type), upstream in self._upstreams.items():
+            stats = upstream.stats.snapshot()
+            stats['consumers'] = len(upstream.subscriptions)
+            stats['max_consumer_backlog'] = max((s.qsize() for s in upstream.subscriptions), default=0)
+            stats['dropped'] = sum(s.dropped for s in upstream.subscriptions)
+            snapshot[f"{symbol}@{stream_type}"] = stats
+        return snapshot
+
+    async def close(self):
+        """모든 업스트림 종료 - 대기 중인 소비자도 깨워서 반복 종료"""
+        tasks = [u.task for u in self._upstreams.values() if u.task]
+        for upstream in self._upstreams.values():
+            for subscription in upstream.subscriptions:
+                subscription._wake_closed()
+        self._upstreams.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._archive is not None:
+            await self._archive.close()
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import logging
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from domain.ports.Clock import Clock, SystemClock
+from infrastructure.messaging.Framing import FRAME_HEADER, encode_frame
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Section holding the clock time of the latest write
+SAVED_AT = "__saved_at__"
+
+
+class SnapshotStore:
+    """
+    Single-file, append-only store of named state sections.
+
+    Each record is a length-prefixed frame (messaging.Framing) of a pickled
+    (section, zlib-compressed pickle) pair; a None payload deletes the
+    section, and on load the last record of a section wins. write() only
+    appends the sections whose contents changed since the previous write,
+    so a snapshot of mostly idle state costs a few bytes. Once the file
+    holds more than `compact_ratio` times the live data, it is rewritten
+    with only the live records to a temporary file that atomically replaces
+    it. A torn record at the end (crash mid-append) is ignored on load and
+    truncated by the next write.
+    """
+
+    def __init__(self, path: str, compact_ratio: float = 3.0, min_compact_bytes: int = 1 << 20):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self._records: Dict[str, bytes] = {}
+        self._digests: Dict[str, bytes] = {}
+        self._size = 0
+
+    @property
+    def live_bytes(self) -> int:
+        return sum(map(len, self._records.values()))
+
+    def load(self) -> Dict[str, Any]:
+        """Reads every live section. A missing file is an empty snapshot."""
+        self._records, self._digests, self._size = {}, {}, 0
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+
+        blobs: Dict[str, bytes] = {}
+        offset = 0
+        while offset + FRAME_HEADER.size <= len(data):
+            (length,) = FRAME_HEADER.unpack_from(data, offset)
+            end = offset + FRAME_HEADER.size + length
+            if end > len(data):
+                break
+            try:
+                section, blob = pickle.loads(data[offset + FRAME_HEADER.size:end])
+            except Exception:
+                break
+            if blob is None:
+                blobs.pop(section, None)
+                self._records.pop(section, None)
+            else:
+                blobs[section] = blob
+                self._records[section] = data[offset:end]
+            offset = end
+        if offset != len(data):
+            logger.warning(f"Ignoring {len(data) - offset} bytes of torn snapshot records in {self.path}")
+        self._size = offset
+
+        sections = {}
+        for section, blob in blobs.items():
+            raw = zlib.decompress(blob)
+            self._digests[section] = hashlib.blake2b(raw, digest_size=16).digest()
+            sections[section] = pickle.loads(raw)
+        return sections
+
+    def write(self, sections: Dict[str, Any]) -> int:
+        """Appends the sections that changed (and deletes the missing ones). Returns records written."""
+        frames = []
+        for section, state in sections.items():
+            raw = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            if self._digests.get(section) == digest:
+                continue
+            frame = encode_frame(pickle.dumps((section, zlib.compress(raw, 1)), pickle.HIGHEST_PROTOCOL))
+            self._records[section] = frame
+            self._digests[section] = digest
+            frames.append(frame)
+        for section in [s for s in self._records if s not in sections]:
+            del self._records[section]
+            del self._digests[section]
+            frames.append(encode_frame(pickle.dumps((section, None), pickle.HIGHEST_PROTOCOL)))
+        if not frames:
+            return 0
+
+        appended = sum(map(len, frames))
+        if self._size + appended > max(self.min_compact_bytes, self.compact_ratio * self.live_bytes):
+            self._compact()
+        else:
+            with open(self.path, 'ab') as f:
+                if f.tell() != self._size:
+                    f.truncate(self._size)
+                f.write(b"".join(frames))
+                f.flush()
+                os.fsync(f.fileno())
+            self._size += appended
+        return len(frames)
+
+    def _compact(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(b"".join(self._records.values()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._size = self.live_bytes
+
+
+class StateSnapshotter:
+    """
+    Periodically saves the state of the detectors, zone entities and candle
+    histories so that a restart resumes warm instead of waiting hours for
+    buffers to refill.
+
+    Providers expose snapshot_state() -> {key: picklable state} and an async
+    restore_state(sections). Capturing runs on the event loop, synchronously
+    across all providers, so the snapshot is one consistent instant; it only
+    copies plain values (entity __getstate__ records, deque contents, ring
+    buffer rows). Pickling, diffing and the file write run in the default
+    executor while the loop keeps going.
+    """
+
+    def __init__(self, path: str, providers: Dict[str, Any], interval: float = 30.0,
+                 clock: Optional[Clock] = None):
+        self.store = SnapshotStore(path)
+        self.providers = providers
+        self.interval = interval
+        self.clock = clock or SystemClock()
+        self.snapshots_written = 0
+        self._lock = asyncio.Lock()
+
+    def capture(self) -> Dict[str, Any]:
+        sections = {SAVED_AT: self.clock.time()}
+        for name, provider in self.providers.items():
+            for key, state in provider.snapshot_state().items():
+                sections[f"{name}:{key}"] = state
+        return sections
+
+    async def snapshot(self) -> int:
+        """Captures now and writes the changed sections off the loop. Returns records written."""
+        async with self._lock:
+            started = time.perf_counter()
+            sections = self.capture()
+            captured = time.perf_counter() - started
+            loop = asyncio.get_running_loop()
+            records = await loop.run_in_executor(None, self.store.write, sections)
+            self.snapshots_written += 1
+            logger.debug(f"State snapshot: {records} records written, capture {captured * 1000:.1f}ms on loop")
+            return records
+
+    async def restore(self) -> int:
+        """Loads the snapshot file and hands each provider its sections. Returns sections restored."""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            sections = await loop.run_in_executor(None, self.store.load)
+        except Exception as e:
+            logger.error(f"Unreadable state snapshot {self.store.path}, starting cold: {e}")
+            return 0
+        saved_at = sections.pop(SAVED_AT, None)
+        if saved_at is None:
+            logger.info("No state snapshot found, starting cold.")
+            return 0
+
+        by_provider: Dict[str, Dict[str, Any]] = {}
+        for section, state in sections.items():
+            name, key = section.split(":", 1)
+            by_provider.setdefault(name, {})[key] = state
+        # 등록 순서대로 복원 (존 모니터의 마지막 가격은 존 등록 이후에)
+        for name, provider in self.providers.items():
+            if name in by_provider:
+                try:
+                    await provider.restore_state(by_provider[name])
+                except Exception as e:
+                    logger.error(f"Failed to restore {name} state: {e}")
+        logger.info(f"Restored {len(sections)} state sections saved {self.clock.time() - saved_at:.0f}s ago "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return len(sections)
+
+    async def run(self):
+        """주기적 스냅샷 (백그라운드 코루틴)"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.snapshot()
+            except Exception as e:
+                logger.error(f"State snapshot failed: {e}")
@@ -0,0 +1,118 @@
+import json
+import struct
+from typing import Any, Hashable, Iterator, Optional, Tuple
+
+from infrastructure.messaging.EventCodec import Buffer, CodecError, SchemaRegistry, default_registry
+from infrastructure.messaging.Framing import encode_frame
+
+
+class BrokerMessage:
+    HELLO = "hello"        # client -> broker: client_id
+    SUBSCRIBE = "sub"      # client -> broker: topic pattern
+    UNSUBSCRIBE = "unsub"  # client -> broker: topic pattern
+    PUBLISH = "pub"        # client -> broker: (seq, entries)
+    ACK = "ack"            # broker -> client: highest seq routed so far
+    EVENTS = "events"      # broker -> client: entries
+    INTEREST = "interest"  # broker -> client: patterns subscribed by the other clients
+
+
+# Every message is one kind byte followed by its body: a sequence number for
+# ACK, a sequence number and entries for PUBLISH, entries for EVENTS and
+# compact JSON for the control messages. Nothing on the wire is unpickled.
+_KIND_CODES = {
+    BrokerMessage.HELLO: 1, BrokerMessage.SUBSCRIBE: 2, BrokerMessage.UNSUBSCRIBE: 3,
+    BrokerMessage.PUBLISH: 4, BrokerMessage.ACK: 5, BrokerMessage.EVENTS: 6, BrokerMessage.INTEREST: 7,
+}
+_KINDS = {code: kind for kind, code in _KIND_CODES.items()}
+KIND = struct.Struct("!B")
+SEQUENCE = struct.Struct("!Q")
+
+# Entry: priority (255 = the event class's lane), coalescing key tag, key, codec record
+ENTRY_HEADER = struct.Struct("!BB")
+NO_PRIORITY = 255
+KEY_NONE, KEY_INT, KEY_STR = 0, 1, 2
+INT_KEY = struct.Struct("!Q")
+STR_KEY_LENGTH = struct.Struct("!H")
+
+
+def encode_entry(event: Any, coalesce_key: Optional[Hashable] = None, priority: Optional[int] = None,
+                 registry: SchemaRegistry = default_registry) -> bytes:
+    """
+    One published event with its routing metadata. Coalescing keys that cross
+    hosts must be None, an unsigned 64-bit int (entity ids) or a string.
+    Raises CodecError for events or keys the wire format cannot carry.
+    """
+    if coalesce_key is None:
+        key_tag, key = KEY_NONE, b""
+    elif isinstance(coalesce_key, int) and 0 <= coalesce_key < 1 << 64:
+        key_tag, key = KEY_INT, INT_KEY.pack(coalesce_key)
+    elif isinstance(coalesce_key, str):
+        data = coalesce_key.encode("utf-8")
+        key_tag, key = KEY_STR, STR_KEY_LENGTH.pack(len(data)) + data
+    else:
+        raise CodecError(f"Coalescing key {coalesce_key!r} cannot cross hosts")
+    header = ENTRY_HEADER.pack(NO_PRIORITY if priority is None else priority, key_tag)
+    return header + key + registry.encode(event)
+
+
+def iter_entries(buffer: Buffer, registry: SchemaRegistry = default_registry
+                 ) -> Iterator[Tuple[Any, Optional[Hashable], Optional[int], memoryview]]:
+    """Decodes back-to-back entries into (event, coalesce_key, priority, raw entry)."""
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    offset = 0
+    while offset < len(view):
+        start = offset
+        priority, key_tag = ENTRY_HEADER.unpack_from(view, offset)
+        offset += ENTRY_HEADER.size
+        if key_tag == KEY_NONE:
+            key = None
+        elif key_tag == KEY_INT:
+            (key,) = INT_KEY.unpack_from(view, offset)
+            offset += INT_KEY.size
+        elif key_tag == KEY_STR:
+            (size,) = STR_KEY_LENGTH.unpack_from(view, offset)
+            offset += STR_KEY_LENGTH.size
+            key = str(view[offset:offset + size], "utf-8")
+            offset += size
+        else:
+            raise CodecError(f"Unknown coalescing key tag {key_tag}")
+        event, offset = registry.decode_from(view, offset)
+        yield event, key, None if priority == NO_PRIORITY else priority, view[start:offset]
+
+
+def encode_message(kind: str, payload: Any = None) -> bytes:
+    """
+    Frames a message. PUBLISH takes (seq, encoded entries), EVENTS a list of
+    encoded entries (see encode_entry), ACK a sequence number and the control
+    messages a JSON-serializable payload.
+    """
+    code = KIND.pack(_KIND_CODES[kind])
+    if kind == BrokerMessage.PUBLISH:
+        seq, entries = payload
+        return encode_frame(b"".join([code, SEQUENCE.pack(seq), *entries]))
+    if kind == BrokerMessage.EVENTS:
+        return encode_frame(b"".join([code, *payload]))
+    if kind == BrokerMessage.ACK:
+        return encode_frame(code + SEQUENCE.pack(payload))
+    return encode_frame(code + json.dumps(payload, separators=(",", ":")).encode())
+
+
+def decode_message(frame: bytes) -> Tuple[str, Any]:
+    """
+    Inverse of encode_message. Entries are returned undecoded, as a
+    memoryview for iter_entries(): PUBLISH gives (seq, entries) and EVENTS
+    the entries.
+    """
+    view = memoryview(frame)
+    (code,) = KIND.unpack_from(view)
+    kind = _KINDS.get(code)
+    if kind is None:
+        raise CodecError(f"Unknown broker message kind {code}")
+    body = view[KIND.size:]
+    if kind == BrokerMessage.PUBLISH:
+        return kind, (SEQUENCE.unpack_from(body)[0], body[SEQUENCE.size:])
+    if kind == BrokerMessage.EVENTS:
+        return kind, body
+    if kind == BrokerMessage.ACK:
+        return kind, SEQUENCE.unpack_from(body)[0]
+    return kind, json.loads(bytes(body)) if body else None
@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import ipaddress
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from domain.ports.EventBus import OverflowPolicy
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import split_topic, topic_matches
+from infrastructure.messaging.BrokerProtocol import BrokerMessage, encode_message, decode_message, iter_entries
+from infrastructure.messaging.Framing import read_frame
+from infrastructure.messaging.Mailbox import Mailbox
+from infrastructure.messaging.RouteCache import RouteCache
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+class _BrokerConnection:
+    def __init__(self, writer: asyncio.StreamWriter, outbox_size: int):
+        self.client_id: Optional[str] = None
+        self.writer = writer
+        self.patterns: Dict[str, Tuple[str, ...]] = {}
+        # Drop-oldest so one stalled node never blocks routing to the others
+        self.outbox = Mailbox(outbox_size, OverflowPolicy.DROP_OLDEST)
+        self.task: Optional[asyncio.Task] = None
+        # 드롭 경고 빈도 제한
+        self.reported_drops = 0
+        self.last_drop_warning = 0.0
+
+    @property
+    def peer(self) -> str:
+        return self.client_id or str(self.writer.get_extra_info('peername'))
+
+
+class EventBroker:
+    """
+    Routes events between RemoteEventBus nodes over TCP. Each published batch
+    is forwarded to every other connection with a matching topic pattern and
+    then acked by sequence number. Sequence numbers are remembered per
+    client id, so batches resent after a reconnect are acked but not routed
+    twice.
+
+    Every connection has its own outbox (a Mailbox, so priority lanes and
+    coalescing apply across hosts too) and writer task that sends everything
+    pending in one frame of up to `max_batch` events. A full outbox drops its
+    oldest events; drops are counted per connection and logged at most every
+    `drop_warning_interval` seconds. Events travel as EventCodec records;
+    the broker decodes them only to route and forwards the bytes it received.
+
+    A freshly started broker has no subscriptions, so frames that nodes
+    resend after a broker restart would be routed to nobody and acked. For
+    the first `resubscribe_grace` seconds after start(), published frames
+    are therefore held, neither routed nor acked, while nodes reconnect and
+    resubscribe; they are routed in arrival order once the grace period ends.
+
+    Connections are not authenticated, so the broker only listens on a
+    loopback address unless `allow_remote` is set (behind a trusted network).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7400,
+                 max_batch: int = 256, outbox_size: int = 10000, route_cache_size: int = 4096,
+                 drop_warning_interval: float = 10.0, allow_remote: bool = False,
+                 resubscribe_grace: float = 5.0):
+        if not allow_remote and not _is_loopback(host):
+            raise ValueError(f"Refusing to listen on non-loopback address {host!r} without allow_remote")
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.outbox_size = outbox_size
+        self.drop_warning_interval = drop_warning_interval
+        self.resubscribe_grace = resubscribe_grace
+        self._connections: Set[_BrokerConnection] = set()
+        self._routes: RouteCache[Tuple[_BrokerConnection, ...]] = RouteCache(route_cache_size)
+        self._last_seq: Dict[str, int] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        # 재구독 유예 중 받은 (송신자, seq, 항목) - 유예가 끝나면 None
+        self._held: Optional[List[Tuple[_BrokerConnection, int, bytes]]] = None
+        self._grace_task: Optional[asyncio.Task] = None
+        self.events_routed = 0
+        self.duplicates = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # port=0 picks a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.resubscribe_grace > 0:
+            self._held = []
+            self._grace_task = asyncio.create_task(self._end_grace())
+        logger.info(f"Event broker listening on {self.host}:{self.port}")
+
+    async def _end_grace(self):
+        await asyncio.sleep(self.resubscribe_grace)
+        held, self._held = self._held, None
+        for sender, seq, entries in held:
+            # 끊긴 노드는 재연결 후 미확인 프레임을 다시 보냄
+            if sender in self._connections:
+                await self._on_publish(sender, seq, memoryview(entries))
+        if held:
+            logger.info(f"Routed {len(held)} frames held while nodes resubscribed")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._grace_task is not None:
+            self._grace_task.cancel()
+        for connection in list(self._connections):
+            connection.writer.close()
+        tasks = [c.task for c in self._connections if c.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = _BrokerConnection(writer, self.outbox_size)
+        connection.task = asyncio.create_task(self._write_loop(connection))
+        self._connections.add(connection)
+        try:
+            while True:
+                kind, payload = decode_message(await read_frame(reader))
+                if kind == BrokerMessage.PUBLISH:
+                    if self._held is not None:
+                        seq, entries = payload
+                        self._held.append((connection, seq, bytes(entries)))
+                    else:
+                        await self._on_publish(connection, *payload)
+                elif kind == BrokerMessage.SUBSCRIBE:
+                    connection.patterns[payload] = split_topic(payload)
+                    self._subscriptions_changed()
+                elif kind == BrokerMessage.UNSUBSCRIBE:
+                    connection.patterns.pop(payload, None)
+                    self._subscriptions_changed()
+                elif kind == BrokerMessage.HELLO:
+                    connection.client_id = payload
+                    logger.info(f"Node {connection.peer} connected to broker")
+                    writer.write(encode_message(BrokerMessage.INTEREST, self._interest_for(connection)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.error(f"Broker connection error for {connection.peer}: {e}")
+        finally:
+            self._connections.discard(connection)
+            if connection.patterns:
+                self._subscriptions_changed()
+            connection.task.cancel()
+            writer.close()
+            logger.info(f"Node {connection.peer} disconnected from broker")
+
+    async def _on_publish(self, sender: _BrokerConnection, seq: int, entries: memoryview):
+        client_id = sender.peer
+        if seq <= self._last_seq.get(client_id, 0):
+            self.duplicates += 1
+        else:
+            routed = 0
+            for event, coalesce_key, priority, raw in iter_entries(entries):
+                routed += 1
+                # 디코딩은 라우팅용 - 전달은 받은 바이트 그대로
+                entry = bytes(raw)
+                event_type = getattr(event, 'event_type', None)
+                key = (event_type, coalesce_key) if coalesce_key is not None else None
+                if priority is None:
+                    priority = getattr(event, 'priority', EventPriority.ANALYTICS)
+                topic = getattr(event, 'topic', None) or event_type
+                for connection in self._route(topic):
+                    if connection is not sender:
+                        connection.outbox.offer(entry, key, priority)
+                        if connection.outbox.dropped != connection.reported_drops:
+                            self._warn_dropped(connection)
+            self._last_seq[client_id] = seq
+            self.events_routed += routed
+        sender.writer.write(encode_message(BrokerMessage.ACK, seq))
+
+    def _warn_dropped(self, connection: _BrokerConnection):
+        now = time.monotonic()
+        if now - connection.last_drop_warning < self.drop_warning_interval:
+            return
+        dropped = connection.outbox.dropped
+        logger.warning(f"Outbox of node {connection.peer} is full: {dropped - connection.reported_drops} "
+                       f"events dropped ({dropped} total)")
+        connection.reported_drops = dropped
+        connection.last_drop_warning = now
+
+    def _route(self, topic: str) -> Tuple[_BrokerConnection, ...]:
+        connections = self._routes.get(topic)
+        if connections is None:
+            segments = split_topic(topic)
+            connections = self._routes.put(topic, tuple(
+                connection for connection in self._connections
+                if any(topic_matches(pattern, segments) for pattern in connection.patterns.values())
+            ))
+        return connections
+
+    def _interest_for(self, connection: _BrokerConnection) -> list:
+        return sorted({
+            pattern
+            for other in self._connections if other is not connection
+            for pattern in other.patterns
+        })
+
+    def _subscriptions_changed(self):
+        self._routes.clear()
+        # Nodes only ship events that some other node subscribed to
+        for connection in self._connections:
+            if not connection.writer.is_closing():
+                connection.writer.write(encode_message(BrokerMessage.INTEREST, self._interest_for(connection)))
+
+    async def _write_loop(self, connection: _BrokerConnection):
+        outbox = connection.outbox
+        while True:
+            entry, _ = await outbox.get()
+            batch = [entry]
+            while outbox.qsize() and len(batch) < self.max_batch:
+                batch.append((await outbox.get())[0])
+            connection.writer.write(encode_message(BrokerMessage.EVENTS, batch))
+            await connection.writer.drain()
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            connection.peer: {
+                'patterns': len(connection.patterns),
+                'backlog': connection.outbox.qsize(),
+                'dropped': connection.outbox.dropped,
+                'coalesced': connection.outbox.coalesced,
+            }
+            for connection in self._connections
+        }
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def run_event_broker(host: str = "127.0.0.1", port: int = 7400, allow_remote: bool = False,
+                     resubscribe_grace: float = 5.0):
+    """Process entry point of a standalone broker."""
+    try:
+        asyncio.run(EventBroker(host, port, allow_remote=allow_remote,
+                                resubscribe_grace=resubscribe_grace).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event broker for RemoteEventBus nodes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7400)
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Listen on a non-loopback address (connections are not authenticated)")
+    parser.add_argument("--resubscribe-grace", type=float, default=5.0,
+                        help="Seconds after start during which published frames wait for nodes to resubscribe")
+    args = parser.parse_args()
+    run_event_broker(args.host, args.port, args.allow_remote, args.resubscribe_grace)
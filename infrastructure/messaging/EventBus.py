@@ -1,77 +1,300 @@
 import asyncio
 import logging
-from typing import Dict, List, Callable, Any
+import time
+from typing import Dict, List, Callable, Any, Hashable, Optional, Tuple
 
-from domain.ports.EventBus import EventBus
+from domain.ports.EventBus import EventBus, OverflowPolicy
+from domain.events.EventPriority import EventPriority
+from domain.events.Topic import split_topic, topic_matches
+from infrastructure.messaging.Mailbox import Mailbox
+from infrastructure.messaging.EventBusMetrics import EventBusMetrics
+from infrastructure.messaging.RouteCache import RouteCache
 
 # Basic logger setup
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+class Subscription:
+    """A handler bound to its own mailbox; at most one delivery of it runs at a time."""
+
+    def __init__(self, event_type: str, handler: Callable, mailbox: Mailbox):
+        self.event_type = event_type
+        self.pattern = split_topic(event_type)
+        self.handler = handler
+        self.mailbox = mailbox
+        self.name = f"{getattr(handler, '__qualname__', repr(handler))}@{event_type}"
+        # 진행 중인 전달 태스크, 디스패처 준비 레인 (대기 중이 아니면 None)
+        self.task: Optional[asyncio.Task] = None
+        self.lane: Optional[int] = None
+        # 드롭 경고 빈도 제한
+        self.reported_drops = 0
+        self.last_drop_warning = 0.0
+
+    def qsize(self) -> int:
+        return self.mailbox.qsize()
+
+
 class AsyncEventBus(EventBus):
-    def __init__(self):
-        self.subscribers: Dict[str, List[Callable]] = {}
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+    """
+    Every subscriber has its own bounded, lane-split mailbox. One dispatcher
+    decides which subscriber's next event is delivered, across all of them:
+    the idle subscriber whose next event is in the highest lane goes first
+    (round robin within a lane), so an EXECUTION event overtakes ANALYTICS
+    backlogs queued for other subscribers too. Each delivery runs as its own
+    task, at most one per subscriber, so a slow handler only delays its own
+    mailbox. A lane passed over `starvation_limit` times in a row gets one
+    delivery.
+    """
+
+    def __init__(self, metrics_log_interval: float = 60.0, drop_warning_interval: float = 10.0,
+                 starvation_limit: int = 32, route_cache_size: int = 4096):
+        self.subscribers: Dict[str, List[Subscription]] = {}
+        # topic -> matching subscriptions, rebuilt lazily after (un)subscribe
+        self._routes: RouteCache[Tuple[Subscription, ...]] = RouteCache(route_cache_size)
+        self.metrics = EventBusMetrics()
+        self.metrics_log_interval = metrics_log_interval
+        self.drop_warning_interval = drop_warning_interval
+        self.starvation_limit = starvation_limit
+        # 레인별 전달 대기 구독자 (삽입 순서 = 라운드 로빈 순서)
+        self._ready: List[Dict[Subscription, None]] = [{} for _ in EventPriority.LANES]
+        self._passed_over = [0] * len(EventPriority.LANES)
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
         self._is_running = False
+        self._stopped = asyncio.Event()
 
-    async def publish(self, event: Any):
+    async def publish(self, event: Any, coalesce_key: Optional[Hashable] = None,
+                      priority: Optional[int] = None):
         """
-        Publishes an event to the event queue.
+        Publishes an event into the mailbox of every subscriber whose pattern
+        matches the event's topic (or its bare event_type). The event goes
+        into the lane given by `priority`, or the lane its class declares.
+        With a coalesce_key, a pending event for the same (event_type, key)
+        is replaced in place instead of queueing another one.
         """
-        if self._is_running:
-            await self.event_queue.put(event)
-        else:
+        if not self._is_running:
             logger.warning("Event bus is not running. Event not published.")
+            return
+
+        # Assumes event objects have an 'event_type' attribute.
+        event_type = getattr(event, 'event_type', None)
+        key = (event_type, coalesce_key) if coalesce_key is not None else None
+        if priority is None:
+            priority = getattr(event, 'priority', EventPriority.ANALYTICS)
+        self.metrics.record_publish(event_type)
 
-    async def subscribe(self, event_type: str, handler: Callable):
+        topic = getattr(event, 'topic', None) or event_type
+        subscriptions = self._routes.get(topic)
+        if subscriptions is None:
+            subscriptions = self._resolve_route(topic)
+        # 메일박스에 대기 없이 넣음 - BLOCK 정책 구독자만 (동시에) 기다림
+        blocked = []
+        for subscription in subscriptions:
+            mailbox = subscription.mailbox
+            if mailbox.offer(event, key, priority) is None:
+                blocked.append(mailbox.put(event, key, priority))
+            elif mailbox.dropped != subscription.reported_drops:
+                self._warn_dropped(subscription)
+        if blocked:
+            await asyncio.gather(*blocked)
+
+    def _warn_dropped(self, subscription: Subscription):
+        now = time.monotonic()
+        if now - subscription.last_drop_warning < self.drop_warning_interval:
+            return
+        dropped = subscription.mailbox.dropped
+        logger.warning(f"Mailbox of {subscription.name} is full: {dropped - subscription.reported_drops} "
+                       f"events dropped ({dropped} total)")
+        subscription.reported_drops = dropped
+        subscription.last_drop_warning = now
+
+    def _resolve_route(self, topic: str) -> Tuple[Subscription, ...]:
+        segments = split_topic(topic)
+        subscriptions = tuple(
+            subscription
+            for handlers in self.subscribers.values()
+            for subscription in handlers
+            if topic_matches(subscription.pattern, segments)
+        )
+        return self._routes.put(topic, subscriptions)
+
+    async def subscribe(self, event_type: str, handler: Callable,
+                        maxsize: int = 1000, overflow: str = OverflowPolicy.DROP_OLDEST) -> Subscription:
         """
-        Subscribes a handler to a specific event type.
-        The handler must be an async function (coroutine).
+        Subscribes a handler to an event type or a topic pattern such as
+        "NEW_FVG_DETECTED.BTCUSDT" or "*.BTCUSDT.5m" (see domain.events.Topic).
+        The handler must be an async function (coroutine). It gets its own
+        bounded mailbox and receives its events one at a time, concurrently
+        with every other handler. When the mailbox is full the `overflow`
+        policy applies; publishers only wait for subscribers that chose BLOCK.
         """
+        subscription = Subscription(event_type, handler, Mailbox(maxsize, overflow))
+        subscription.mailbox.on_ready = lambda: self._mark_ready(subscription)
         if event_type not in self.subscribers:
             self.subscribers[event_type] = []
-        self.subscribers[event_type].append(handler)
+        self.subscribers[event_type].append(subscription)
+        self._routes.clear()
         logger.info(f"Handler {handler.__name__} subscribed to {event_type}")
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        handlers = self.subscribers.get(subscription.event_type, [])
+        if subscription in handlers:
+            handlers.remove(subscription)
+            self._routes.clear()
+        subscription.mailbox.on_ready = None
+        self._unready(subscription)
+        if subscription.task and not subscription.task.done():
+            subscription.task.cancel()
+            await asyncio.gather(subscription.task, return_exceptions=True)
+
+    def _unready(self, subscription: Subscription):
+        if subscription.lane is not None:
+            self._ready[subscription.lane].pop(subscription, None)
+            subscription.lane = None
+
+    def _mark_ready(self, subscription: Subscription):
+        """구독자가 유휴 상태이고 대기 이벤트가 있으면 다음 이벤트의 레인에 등록"""
+        lane = subscription.mailbox.next_lane() if subscription.task is None else None
+        if lane == subscription.lane:
+            return
+        self._unready(subscription)
+        if lane is not None:
+            self._ready[lane][subscription] = None
+            subscription.lane = lane
+            self._wakeup.set()
+
+    def _next_ready(self) -> Optional[Subscription]:
+        # 상위 레인 우선, 단 계속 밀린 하위 레인에는 한 건 양보
+        chosen = None
+        for lane, ready in enumerate(self._ready):
+            if not ready:
+                continue
+            if chosen is None:
+                chosen = lane
+            elif self._passed_over[lane] >= self.starvation_limit:
+                chosen = lane
+                break
+        if chosen is None:
+            return None
+        for lane in range(chosen + 1, len(self._ready)):
+            if self._ready[lane]:
+                self._passed_over[lane] += 1
+        self._passed_over[chosen] = 0
+        subscription = next(iter(self._ready[chosen]))
+        self._unready(subscription)
+        return subscription
 
-    async def _dispatch_event(self, event: Any):
+    async def _dispatch(self):
+        """Starts deliveries in lane order across all subscribers."""
+        while True:
+            subscription = self._next_ready()
+            if subscription is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            event, enqueued_at = subscription.mailbox.get_nowait()
+            subscription.task = asyncio.create_task(self._deliver(subscription, event, enqueued_at))
+            # 전달 하나마다 양보 - 새로 들어온 상위 레인 이벤트가 곧바로 다음 순서
+            await asyncio.sleep(0)
+
+    async def _deliver(self, subscription: Subscription, event: Any, enqueued_at: float):
+        started_at = time.perf_counter()
+        failed = False
+        try:
+            # Handlers are coroutines, so they need to be awaited
+            await subscription.handler(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failed = True
+            logger.error(f"Error in event handler {subscription.handler.__name__} for {subscription.event_type}: {e}")
+        finally:
+            subscription.task = None
+            if subscription.mailbox.on_ready is not None:
+                self._mark_ready(subscription)
+        self.metrics.record_delivery(
+            getattr(event, 'event_type', subscription.event_type), subscription.name,
+            queue_wait=started_at - enqueued_at,
+            handle_time=time.perf_counter() - started_at,
+            failed=failed,
+        )
+
+    def queue_depths(self) -> Dict[str, int]:
         """
-        Dispatches an event to all subscribed handlers.
+        Pending events per subscriber.
         """
-        # Assumes event objects have an 'event_type' attribute.
-        event_type = getattr(event, 'event_type', None)
-        if event_type and event_type in self.subscribers:
-            handlers = self.subscribers[event_type]
-            for handler in handlers:
-                try:
-                    # Handlers are coroutines, so they need to be awaited
-                    await handler(event)
-                except Exception as e:
-                    logger.error(f"Error in event handler {handler.__name__} for {event_type}: {e}")
+        return {
+            subscription.name: subscription.qsize()
+            for handlers in self.subscribers.values()
+            for subscription in handlers
+        }
+
+    def lane_depths(self) -> Dict[str, List[int]]:
+        """
+        Pending events per subscriber, per priority lane.
+        """
+        return {
+            subscription.name: subscription.mailbox.lane_sizes()
+            for handlers in self.subscribers.values()
+            for subscription in handlers
+        }
+
+    def backlog(self) -> int:
+        return sum(self.queue_depths().values())
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Queue wait / handler time histograms per event type and per handler,
+        plus current mailbox depths.
+        """
+        snapshot = self.metrics.snapshot()
+        snapshot['queue_depths'] = self.queue_depths()
+        snapshot['dropped'] = {
+            subscription.name: subscription.mailbox.dropped
+            for handlers in self.subscribers.values()
+            for subscription in handlers
+        }
+        return snapshot
+
+    def _log_metrics_summary(self):
+        lines = self.metrics.summary_lines()
+        if lines:
+            logger.info(f"Event bus summary (backlog={self.backlog()}):\n  " + "\n  ".join(lines))
 
     async def process_events(self):
         """
-        The main event processing loop.
+        Runs the bus: starts the dispatcher and keeps it alive until the bus
+        is stopped or this task is cancelled, logging a metrics summary every
+        `metrics_log_interval` seconds.
         This should be run as a background task.
         """
         self._is_running = True
+        self._stopped.clear()
+        self._dispatcher = asyncio.create_task(self._dispatch())
         logger.info("Event bus is running.")
-        while self._is_running:
-            try:
-                event = await self.event_queue.get()
-                await self._dispatch_event(event)
-                self.event_queue.task_done()
-            except asyncio.CancelledError:
-                logger.info("Event processing loop cancelled.")
-                break
-            except Exception as e:
-                logger.error(f"Event processing error: {e}")
+
+        try:
+            while not self._stopped.is_set():
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=self.metrics_log_interval)
+                except asyncio.TimeoutError:
+                    self._log_metrics_summary()
+        except asyncio.CancelledError:
+            logger.info("Event processing loop cancelled.")
+        finally:
+            self._is_running = False
+            tasks = [self._dispatcher] + [s.task for handlers in self.subscribers.values() for s in handlers if s.task]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._dispatcher = None
 
     def stop(self):
         """
-        Stops the event processing loop.
+        Stops the event processing loop and all in-flight deliveries.
         """
         self._is_running = False
-        # To unblock the queue.get() if it's waiting
-        # A dummy event could be put, or we can rely on task cancellation
+        self._stopped.set()
         logger.info("Event bus stopping.")
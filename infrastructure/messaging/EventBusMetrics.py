@@ -0,0 +1,137 @@
+import bisect
+from typing import Dict, List, Tuple
+
+# Bucket upper bounds in seconds: 10us .. 10s in 1-2-5 steps, plus overflow.
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(
+    mantissa * 10.0 ** exponent
+    for exponent in range(-5, 1)
+    for mantissa in (1, 2, 5)
+) + (10.0,)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram. Recording is a bisect and two adds."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0 < q <= 1)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(LATENCY_BUCKETS[i], self.max) if i < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
+
+
+class HandlerMetrics:
+    __slots__ = ('queue_wait', 'handle_time', 'errors')
+
+    def __init__(self):
+        self.queue_wait = LatencyHistogram()
+        self.handle_time = LatencyHistogram()
+        self.errors = 0
+
+
+class EventTypeMetrics:
+    __slots__ = ('published', 'queue_wait', 'handle_time', 'errors')
+
+    def __init__(self):
+        self.published = 0
+        self.queue_wait = LatencyHistogram()
+        self.handle_time = LatencyHistogram()
+        self.errors = 0
+
+
+class EventBusMetrics:
+    """Publish-to-handle latency and handler timing, per event type and per handler."""
+
+    def __init__(self):
+        self.event_types: Dict[str, EventTypeMetrics] = {}
+        self.handlers: Dict[str, HandlerMetrics] = {}
+
+    def _event_type(self, event_type: str) -> EventTypeMetrics:
+        metrics = self.event_types.get(event_type)
+        if metrics is None:
+            metrics = self.event_types[event_type] = EventTypeMetrics()
+        return metrics
+
+    def _handler(self, handler_name: str) -> HandlerMetrics:
+        metrics = self.handlers.get(handler_name)
+        if metrics is None:
+            metrics = self.handlers[handler_name] = HandlerMetrics()
+        return metrics
+
+    def record_publish(self, event_type: str):
+        self._event_type(event_type).published += 1
+
+    def record_delivery(self, event_type: str, handler_name: str,
+                        queue_wait: float, handle_time: float, failed: bool):
+        by_type = self._event_type(event_type)
+        by_handler = self._handler(handler_name)
+        by_type.queue_wait.record(queue_wait)
+        by_type.handle_time.record(handle_time)
+        by_handler.queue_wait.record(queue_wait)
+        by_handler.handle_time.record(handle_time)
+        if failed:
+            by_type.errors += 1
+            by_handler.errors += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        return {
+            'event_types': {
+                name: {
+                    'published': m.published,
+                    'errors': m.errors,
+                    'queue_wait': m.queue_wait.snapshot(),
+                    'handle_time': m.handle_time.snapshot(),
+                }
+                for name, m in self.event_types.items()
+            },
+            'handlers': {
+                name: {
+                    'errors': m.errors,
+                    'queue_wait': m.queue_wait.snapshot(),
+                    'handle_time': m.handle_time.snapshot(),
+                }
+                for name, m in self.handlers.items()
+            },
+        }
+
+    def summary_lines(self, top: int = 5) -> List[str]:
+        """Handlers ranked by total time spent, the usual source of backlog."""
+        ranked = sorted(self.handlers.items(), key=lambda item: item[1].handle_time.total, reverse=True)
+        lines = []
+        for name, m in ranked[:top]:
+            lines.append(
+                f"{name}: n={m.handle_time.count} errors={m.errors} "
+                f"wait p50={m.queue_wait.percentile(0.5) * 1000:.2f}ms p99={m.queue_wait.percentile(0.99) * 1000:.2f}ms "
+                f"handle p50={m.handle_time.percentile(0.5) * 1000:.2f}ms p99={m.handle_time.percentile(0.99) * 1000:.2f}ms "
+                f"total={m.handle_time.total:.3f}s"
+            )
+        return lines
@@ -0,0 +1,248 @@
+import datetime
+import json
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Type, Union
+
+from domain.events.FVGEvent import FVGEvent
+from domain.events.OrderBlockEvent import OrderBlockEvent
+from domain.events.LiquidityEvent import LiquidityEvent
+from domain.events.MarketEvents import MarketStructureEvent
+from domain.events.OrderEvent import OrderEvent
+from domain.events.RiskEvent import RiskEvent
+from domain.events.KillZoneEvent import KillZoneEvent
+from domain.events.MacroTimeEvent import MacroTimeEvent
+from domain.events.TimeBasedSignalEvent import TimeBasedSignalEvent
+from domain.entities.ZoneRecords import FairValueGapRecord, OrderBlockRecord, LiquidityPoolRecord
+
+# Every record: total length (header included) and schema type id, then the
+# schema's fixed-size primitive fields, then its length-prefixed UTF-8 strings.
+RECORD_HEADER = struct.Struct("!HH")
+STRING_LENGTH = struct.Struct("!H")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class CodecError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class EventSchema:
+    """
+    Wire layout of one event class: `numeric` holds its fixed-size primitive
+    fields (including the stable entity id of the zone it carries), followed by
+    `string_count` variable-length strings. `to_fields` flattens an event into
+    (numbers, strings); `from_fields` rebuilds it.
+    """
+    type_id: int
+    event_class: Type
+    numeric: struct.Struct
+    string_count: int
+    to_fields: Callable[[Any], Tuple[tuple, Sequence[str]]]
+    from_fields: Callable[[tuple, List[str]], Any]
+
+
+class SchemaRegistry:
+    """Maps type ids to event classes and encodes/decodes registered events."""
+
+    def __init__(self):
+        self._by_id: Dict[int, EventSchema] = {}
+        self._by_class: Dict[Type, EventSchema] = {}
+        # Length-prefixed encodings of recurring strings (event types, symbols, timeframes)
+        self._string_cache: Dict[str, bytes] = {}
+
+    def register(self, schema: EventSchema):
+        if schema.type_id in self._by_id:
+            raise CodecError(f"Type id {schema.type_id} already registered for {self._by_id[schema.type_id].event_class.__name__}")
+        self._by_id[schema.type_id] = schema
+        self._by_class[schema.event_class] = schema
+
+    def supports(self, event: Any) -> bool:
+        return type(event) in self._by_class
+
+    def encode(self, event: Any) -> bytes:
+        schema = self._by_class.get(type(event))
+        if schema is None:
+            raise CodecError(f"No schema registered for {type(event).__name__}")
+        try:
+            numbers, strings = schema.to_fields(event)
+            body = schema.numeric.pack(*numbers) + b"".join(map(self._encode_string, strings))
+        except CodecError:
+            raise
+        except (struct.error, TypeError, ValueError, AttributeError) as e:
+            # 범위를 벗어난 숫자, 65535바이트를 넘는 문자열, 문자열이 아닌 필드 등
+            raise CodecError(f"{type(event).__name__} cannot be encoded: {e}") from e
+        length = RECORD_HEADER.size + len(body)
+        if length > 0xFFFF:
+            raise CodecError(f"{type(event).__name__} record of {length} bytes exceeds limit")
+        return RECORD_HEADER.pack(length, schema.type_id) + body
+
+    def _encode_string(self, text: str) -> bytes:
+        encoded = self._string_cache.get(text)
+        if encoded is None:
+            data = text.encode("utf-8")
+            encoded = STRING_LENGTH.pack(len(data)) + data
+            if len(data) <= 32 and len(self._string_cache) < 4096:
+                self._string_cache[text] = encoded
+        return encoded
+
+    def encode_many(self, events: Sequence[Any]) -> bytes:
+        return b"".join(self.encode(event) for event in events)
+
+    def decode_from(self, buffer: Buffer, offset: int = 0) -> Tuple[Any, int]:
+        """
+        Decodes the record at `offset` and returns it with the offset of the
+        next record. Fields are read in place (struct.unpack_from on a
+        memoryview); no intermediate bytes slices are made.
+        """
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        length, type_id = RECORD_HEADER.unpack_from(view, offset)
+        schema = self._by_id.get(type_id)
+        if schema is None:
+            raise CodecError(f"Unknown event type id {type_id}")
+        position = offset + RECORD_HEADER.size
+        numbers = schema.numeric.unpack_from(view, position)
+        position += schema.numeric.size
+        strings = []
+        for _ in range(schema.string_count):
+            (size,) = STRING_LENGTH.unpack_from(view, position)
+            position += STRING_LENGTH.size
+            strings.append(str(view[position:position + size], "utf-8"))
+            position += size
+        if position != offset + length:
+            raise CodecError(f"Malformed {schema.event_class.__name__} record")
+        return schema.from_fields(numbers, strings), position
+
+    def decode(self, buffer: Buffer) -> Any:
+        return self.decode_from(buffer)[0]
+
+    def iter_decode(self, buffer: Buffer) -> Iterator[Any]:
+        """Decodes a buffer of back-to-back records."""
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        offset = 0
+        while offset < len(view):
+            event, offset = self.decode_from(view, offset)
+            yield event
+
+
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), default=lambda o: getattr(o, "__dict__", str(o)))
+
+
+def _dump(value: Any) -> str:
+    """Free-form payloads (dicts, placeholder result objects) travel as compact JSON."""
+    if value is None:
+        return ""
+    return _JSON_ENCODER.encode(value)
+
+
+def _load(text: str) -> Any:
+    return json.loads(text) if text else None
+
+
+def _posix(moment: datetime.datetime) -> Tuple[float, bool]:
+    """Datetime as (POSIX seconds, timezone-aware); aware datetimes come back in UTC."""
+    return moment.timestamp(), moment.tzinfo is not None
+
+
+def _datetime(seconds: float, aware: bool) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc if aware else None)
+
+
+# --- Schemas of the events that cross process and host boundaries ---
+
+def _fvg_fields(event: FVGEvent):
+    gap = event.gap
+    if gap is None:
+        zone = (0, 0.0, 0.0, 0.0, 0.0, False)
+    else:
+        zone = (gap.entity_id, gap.gap_high, gap.gap_low, gap.creation_time, gap.fill_percentage, gap.is_filled)
+    return (event.timestamp, event.fill_percentage) + zone, (event.event_type, event.symbol, event.timeframe)
+
+
+def _fvg_event(numbers, strings):
+    timestamp, fill_percentage, entity_id, high, low, created, gap_fill, is_filled = numbers
+    event_type, symbol, timeframe = strings
+    gap = FairValueGapRecord(entity_id, high, low, created, gap_fill, is_filled, symbol, timeframe) if entity_id else None
+    return FVGEvent(event_type, gap, symbol, timeframe, fill_percentage, timestamp)
+
+
+def _order_block_fields(event: OrderBlockEvent):
+    block = event.order_block
+    if block is None:
+        zone, block_type = (0, 0.0, 0.0, 0.0, 0.0, 0, False), ""
+    else:
+        zone = (block.entity_id, block.high, block.low, block.creation_time,
+                block.validity_score, block.touch_count, block.is_invalidated)
+        block_type = block.block_type
+    return (event.timestamp,) + zone, (event.event_type, event.symbol, event.timeframe, block_type, _dump(event.data))
+
+
+def _order_block_event(numbers, strings):
+    timestamp, entity_id, high, low, created, validity, touches, invalidated = numbers
+    event_type, symbol, timeframe, block_type, data = strings
+    block = OrderBlockRecord(entity_id, high, low, block_type, created, validity, touches, invalidated,
+                             symbol, timeframe) if entity_id else None
+    return OrderBlockEvent(event_type, block, _load(data) or {}, symbol, timeframe, timestamp)
+
+
+def _liquidity_fields(event: LiquidityEvent):
+    pool = event.pool
+    if pool is None:
+        zone, pool_type = (0, 0.0, 0.0, False), ""
+    else:
+        zone, pool_type = (pool.entity_id, pool.price_level, pool.importance_score, pool.is_swept), pool.pool_type
+    strings = (event.event_type, event.symbol, pool_type, _dump(event.correlation_data), _dump(event.sweep_data))
+    return (event.timestamp,) + zone, strings
+
+
+def _liquidity_event(numbers, strings):
+    timestamp, entity_id, price_level, importance, is_swept = numbers
+    event_type, symbol, pool_type, correlation, sweep = strings
+    pool = LiquidityPoolRecord(entity_id, price_level, pool_type, importance, is_swept, symbol) if entity_id else None
+    return LiquidityEvent(event_type, pool, _load(correlation), _load(sweep), symbol, timestamp)
+
+
+FVG_SCHEMA = EventSchema(
+    1, FVGEvent, struct.Struct("!ddQdddd?"), 3, _fvg_fields, _fvg_event)
+ORDER_BLOCK_SCHEMA = EventSchema(
+    2, OrderBlockEvent, struct.Struct("!dQddddI?"), 5, _order_block_fields, _order_block_event)
+LIQUIDITY_SCHEMA = EventSchema(
+    3, LiquidityEvent, struct.Struct("!dQdd?"), 5, _liquidity_fields, _liquidity_event)
+MARKET_STRUCTURE_SCHEMA = EventSchema(
+    4, MarketStructureEvent, struct.Struct("!d"), 4,
+    lambda e: ((e.timestamp,), (e.event_type, e.symbol, e.timeframe, _dump(e.data))),
+    lambda n, s: MarketStructureEvent(s[1], s[2], s[0], _load(s[3]), n[0]))
+ORDER_SCHEMA = EventSchema(
+    5, OrderEvent, struct.Struct("!d"), 4,
+    lambda e: ((e.timestamp,), (e.event_type, e.symbol, e.order_id, _dump(e.data))),
+    lambda n, s: OrderEvent(s[0], s[1], s[2], _load(s[3]), n[0]))
+RISK_SCHEMA = EventSchema(
+    6, RiskEvent, struct.Struct("!d"), 3,
+    lambda e: ((e.timestamp,), (e.event_type, e.symbol, _dump(e.data))),
+    lambda n, s: RiskEvent(s[0], s[1], _load(s[2]), n[0]))
+
+KILL_ZONE_SCHEMA = EventSchema(
+    7, KillZoneEvent, struct.Struct("!d?"), 3,
+    lambda e: (_posix(e.timestamp), (e.event_type, e.zone_name, _dump(e.new_state))),
+    lambda n, s: KillZoneEvent(s[0], s[1], _load(s[2]), _datetime(*n)))
+MACRO_TIME_SCHEMA = EventSchema(
+    8, MacroTimeEvent, struct.Struct("!d?"), 3,
+    lambda e: (_posix(e.timestamp), (e.event_type, _dump(e.cycle_position), _dump(e.analysis))),
+    lambda n, s: MacroTimeEvent(s[0], _load(s[1]), _load(s[2]), _datetime(*n)))
+TIME_SIGNAL_SCHEMA = EventSchema(
+    9, TimeBasedSignalEvent, struct.Struct("!d?"), 2,
+    lambda e: (_posix(e.timestamp), (e.event_type, _dump(e.signal))),
+    lambda n, s: TimeBasedSignalEvent(s[0], _load(s[1]), _datetime(*n)))
+
+
+def create_default_registry() -> SchemaRegistry:
+    registry = SchemaRegistry()
+    for schema in (FVG_SCHEMA, ORDER_BLOCK_SCHEMA, LIQUIDITY_SCHEMA,
+                   MARKET_STRUCTURE_SCHEMA, ORDER_SCHEMA, RISK_SCHEMA,
+                   KILL_ZONE_SCHEMA, MACRO_TIME_SCHEMA, TIME_SIGNAL_SCHEMA):
+        registry.register(schema)
+    return registry
+
+
+default_registry = create_default_registry()
@@ -0,0 +1,96 @@
+import argparse
+import dataclasses
+import json
+import pickle
+import time
+from typing import Any, Callable, Dict, List
+
+from domain.entities.MarketData import Candle
+from domain.entities.FairValueGap import AsyncFairValueGap, FVGData
+from domain.entities.OrderBlock import AsyncOrderBlock, OrderBlockType
+from domain.entities.LiquidityPool import AsyncLiquidityPool, LiquidityType
+from domain.events.FVGEvent import FVGEvent
+from domain.events.OrderBlockEvent import OrderBlockEvent
+from domain.events.LiquidityEvent import LiquidityEvent
+from domain.events.OrderEvent import OrderEvent
+from infrastructure.messaging.EventCodec import default_registry
+
+
+def sample_events(count: int) -> List[Any]:
+    """Mix of zone events as the detectors publish them, carrying live entities."""
+    events = []
+    for i in range(count):
+        price = 100.0 + (i % 500) * 0.01
+        kind = i % 4
+        if kind == 0:
+            gap = AsyncFairValueGap(FVGData(price + 1.0, price, 1_700_000_000.0 + i), None, "BTCUSDT", "5m")
+            events.append(FVGEvent("FVG_PARTIAL_FILL", gap, "BTCUSDT", "5m", fill_percentage=0.4))
+        elif kind == 1:
+            candle = Candle(high=price + 0.5, low=price - 0.5, timestamp=1_700_000_000.0 + i)
+            block = AsyncOrderBlock(candle, OrderBlockType.BULLISH, None, "ETHUSDT", "15m")
+            events.append(OrderBlockEvent("BLOCK_TOUCHED", block, {'touch_price': price}, "ETHUSDT", "15m"))
+        elif kind == 2:
+            pool = AsyncLiquidityPool(price, LiquidityType.BSL, None, "BTCUSDT")
+            events.append(LiquidityEvent("LIQUIDITY_SWEPT", pool, sweep_data={'sweep_price': price + 0.2}, symbol="BTCUSDT"))
+        else:
+            events.append(OrderEvent("ORDER_FILLED", "BTCUSDT", f"order-{i}", {'qty': 0.01, 'price': price}))
+    return events
+
+
+def _detached(event: Any) -> Any:
+    # JSON baseline gets the same detached state the codec carries
+    return dataclasses.replace(event, **{
+        f.name: getattr(event, f.name).__getstate__()
+        for f in dataclasses.fields(event)
+        if hasattr(getattr(event, f.name), '__getstate__') and hasattr(getattr(event, f.name), 'entity_id')
+    })
+
+
+def _json_encode(event: Any) -> bytes:
+    return json.dumps(dataclasses.asdict(event), separators=(",", ":"), default=str).encode()
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmark(count: int = 20000, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    events = sample_events(count)
+    detached = [_detached(event) for event in events]
+    codecs = {
+        'binary': (lambda: [default_registry.encode(e) for e in events],
+                   lambda blobs: [default_registry.decode(memoryview(b)) for b in blobs]),
+        # Live events, as the transports pickled them (entities detach through __getstate__)
+        'pickle': (lambda: [pickle.dumps(e, protocol=pickle.HIGHEST_PROTOCOL) for e in events],
+                   lambda blobs: [pickle.loads(b) for b in blobs]),
+        'json': (lambda: [_json_encode(e) for e in detached],
+                 lambda blobs: [json.loads(b) for b in blobs]),
+    }
+
+    results = {}
+    for name, (encode, decode) in codecs.items():
+        blobs = encode()
+        encode_time = _time(encode, repeat)
+        decode_time = _time(lambda: decode(blobs), repeat)
+        results[name] = {
+            'encode_per_sec': count / encode_time,
+            'decode_per_sec': count / decode_time,
+            'bytes_per_event': sum(len(b) for b in blobs) / count,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Binary event codec vs pickle/JSON")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'codec':<8}{'encode/s':>14}{'decode/s':>14}{'bytes/event':>14}")
+    for name, result in run_benchmark(args.events, args.repeat).items():
+        print(f"{name:<8}{result['encode_per_sec']:>14,.0f}{result['decode_per_sec']:>14,.0f}{result['bytes_per_event']:>14.1f}")
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from domain.events.EventPriority import EventPriority
+from domain.ports.EventBus import OverflowPolicy
+
+
+class _Entry:
+    __slots__ = ('item', 'key', 'enqueued_at')
+
+    def __init__(self, item: Any, key: Optional[Hashable]):
+        self.item = item
+        self.key = key
+        self.enqueued_at = time.perf_counter()
+
+
+class Mailbox:
+    """
+    Bounded queue owned by a single subscriber, split into priority lanes.
+    A slow subscriber only backs up its own mailbox; what happens when a lane
+    is full is decided by its OverflowPolicy (by default the oldest pending
+    event is dropped and counted). Each lane is bounded separately,
+    so a flood of analytics events never blocks or evicts execution events.
+
+    Higher lanes are always drained first. To keep lower lanes from starving,
+    a waiting lane that has been passed over `starvation_limit` times in a row
+    gets one event delivered.
+
+    Items put with a coalescing key replace a still-pending item with the
+    same key in place, so a backlog holds at most one entry per key.
+
+    `on_ready`, when set, is called after every item is queued (the event
+    bus's dispatcher uses it to learn which subscribers have work).
+    """
+
+    def __init__(self, maxsize: int = 1000, overflow: str = OverflowPolicy.DROP_OLDEST, starvation_limit: int = 32):
+        if maxsize <= 0:
+            raise ValueError("Mailbox maxsize must be positive")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.starvation_limit = starvation_limit
+        self.dropped = 0
+        self.coalesced = 0
+        self._lanes: List[Deque[_Entry]] = [deque() for _ in EventPriority.LANES]
+        self._pending: Dict[Hashable, _Entry] = {}
+        self._size = 0
+        self._passed_over = [0] * len(self._lanes)
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self.on_ready: Optional[Callable[[], None]] = None
+
+    def qsize(self) -> int:
+        return self._size
+
+    def lane_sizes(self) -> List[int]:
+        return [len(lane) for lane in self._lanes]
+
+    def full(self, priority: int = EventPriority.ANALYTICS) -> bool:
+        return len(self._lanes[priority]) >= self.maxsize
+
+    def offer(self, item: Any, key: Optional[Hashable] = None,
+              priority: int = EventPriority.ANALYTICS) -> Optional[bool]:
+        """
+        Queues an item without waiting. Returns False if the item was dropped,
+        None if its lane is full and the policy is BLOCK.
+        """
+        if key is not None and self._coalesce(item, key):
+            return True
+
+        lane = self._lanes[priority]
+        if len(lane) >= self.maxsize:
+            if self.overflow == OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return False
+            if self.overflow != OverflowPolicy.DROP_OLDEST:
+                return None
+            self._release(lane.popleft())
+            self._size -= 1
+            self.dropped += 1
+
+        entry = _Entry(item, key)
+        if key is not None:
+            self._pending[key] = entry
+        if not lane:
+            self._passed_over[priority] = 0
+        lane.append(entry)
+        self._size += 1
+        self._not_empty.set()
+        if self.on_ready is not None:
+            self.on_ready()
+        return True
+
+    async def put(self, item: Any, key: Optional[Hashable] = None,
+                  priority: int = EventPriority.ANALYTICS) -> bool:
+        """Returns False if the item was dropped; waits for room under BLOCK."""
+        while True:
+            # 대기 중 같은 키의 항목이 들어왔을 수 있으므로 매번 병합부터 시도
+            queued = self.offer(item, key, priority)
+            if queued is not None:
+                return queued
+            self._not_full.clear()
+            await self._not_full.wait()
+
+    async def get(self) -> Tuple[Any, float]:
+        """Returns the next item and its enqueue time (time.perf_counter)."""
+        while not self._size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> Tuple[Any, float]:
+        """Like get(); the mailbox must not be empty."""
+        entry = self._pop()
+        self._size -= 1
+        self._release(entry)
+        self._not_full.set()
+        return entry.item, entry.enqueued_at
+
+    def next_lane(self) -> Optional[int]:
+        """Lane the next get() takes from, or None when empty."""
+        # 상위 레인 우선, 단 계속 밀린 하위 레인에는 한 건 양보
+        chosen = None
+        for priority, lane in enumerate(self._lanes):
+            if not lane:
+                continue
+            if chosen is None:
+                chosen = priority
+            elif self._passed_over[priority] >= self.starvation_limit:
+                return priority
+        return chosen
+
+    def _pop(self) -> _Entry:
+        chosen = self.next_lane()
+        for priority in range(chosen + 1, len(self._lanes)):
+            if self._lanes[priority]:
+                self._passed_over[priority] += 1
+        self._passed_over[chosen] = 0
+        return self._lanes[chosen].popleft()
+
+    def _coalesce(self, item: Any, key: Hashable) -> bool:
+        entry = self._pending.get(key)
+        if entry is None:
+            return False
+        entry.item = item
+        entry.enqueued_at = time.perf_counter()
+        self.coalesced += 1
+        return True
+
+    def _release(self, entry: _Entry):
+        if entry.key is not None:
+            self._pending.pop(entry.key, None)
@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from domain.ports.EventBus import OverflowPolicy
+from domain.events.Topic import split_topic, topic_matches
+from infrastructure.messaging.EventBus import AsyncEventBus, Subscription
+from infrastructure.messaging.BrokerProtocol import (BrokerMessage, encode_entry, encode_message, decode_message,
+                                                     iter_entries)
+from infrastructure.messaging.EventCodec import CodecError
+from infrastructure.messaging.Framing import read_frame
+from infrastructure.messaging.RouteCache import RouteCache
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+class RemoteEventBus(AsyncEventBus):
+    """
+    AsyncEventBus whose events also travel between hosts through an
+    EventBroker. Local subscribers are served exactly as by AsyncEventBus;
+    published events are additionally shipped to the broker when another node
+    subscribed to a matching pattern, and events received from the broker are
+    delivered to the local mailboxes.
+
+    Outgoing events are batched into one numbered frame per loop iteration (or
+    every `max_batch` events). Frames are pipelined up to `max_inflight`
+    unacked frames; past that (a slow or unreachable broker) events spill
+    into a buffer of `max_spill` events that is sent as acks open the window.
+    Publishers never wait: a full spill buffer drops its oldest events, counted
+    and logged. After a reconnect the node resubscribes and resends every
+    unacked frame; the broker drops the ones it already routed.
+
+    Events are encoded with the EventCodec when published; events without a
+    registered schema (or with a coalescing key that is neither an int nor a
+    string) are delivered locally only, with a warning per event class.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7400, client_id: Optional[str] = None,
+                 max_batch: int = 256, max_inflight: int = 64, max_spill: int = 10000,
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 10.0, **kwargs):
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.client_id = client_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.max_batch = max_batch
+        self.max_inflight = max_inflight
+        self.max_spill = max_spill
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._remote_patterns: Dict[str, int] = {}
+        self._interest: List[Tuple[str, ...]] = []
+        self._interest_routes: RouteCache[bool] = RouteCache(self._routes.capacity)
+        # 인코딩된 항목 (BrokerProtocol.encode_entry)
+        self._outgoing: List[bytes] = []
+        self._flush_scheduled = False
+        self._inflight: "OrderedDict[int, bytes]" = OrderedDict()
+        self._next_seq = 1
+        # 전송 창이 가득 찬 동안 밀린 이벤트 (가득 차면 오래된 것부터 버림)
+        self._spill: Deque[bytes] = deque()
+        self._unsupported: Set[type] = set()
+        self._reported_drops = 0
+        self._last_drop_warning = 0.0
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+        self.frames_sent = 0
+        self.frames_resent = 0
+        self.events_sent = 0
+        self.events_received = 0
+        self.events_dropped = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._writer is not None
+
+    async def publish(self, event: Any, coalesce_key: Optional[Hashable] = None,
+                      priority: Optional[int] = None):
+        await super().publish(event, coalesce_key, priority)
+        if not self._is_running:
+            return
+
+        topic = getattr(event, 'topic', None) or getattr(event, 'event_type', None)
+        if not self._has_remote_interest(topic):
+            return
+        try:
+            entry = encode_entry(event, coalesce_key, priority)
+        except CodecError as e:
+            if type(event) not in self._unsupported:
+                self._unsupported.add(type(event))
+                logger.warning(f"{type(event).__name__} is not sent to the broker: {e}")
+            return
+        if self._spill or len(self._inflight) >= self.max_inflight:
+            # 이미 묶인 이벤트를 먼저 보내 순서 유지
+            self._flush()
+            self._spill_entry(entry)
+            return
+
+        self._outgoing.append(entry)
+        if len(self._outgoing) >= self.max_batch:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _has_remote_interest(self, topic: str) -> bool:
+        interested = self._interest_routes.get(topic)
+        if interested is None:
+            segments = split_topic(topic)
+            interested = self._interest_routes.put(topic, any(
+                topic_matches(pattern, segments) for pattern in self._interest
+            ))
+        return interested
+
+    def _spill_entry(self, entry: bytes):
+        if len(self._spill) >= self.max_spill:
+            self._spill.popleft()
+            self.events_dropped += 1
+            now = time.monotonic()
+            if now - self._last_drop_warning >= self.drop_warning_interval:
+                logger.warning(f"Broker {self.host}:{self.port} is not acking; "
+                               f"{self.events_dropped - self._reported_drops} outgoing events dropped "
+                               f"({self.events_dropped} total)")
+                self._reported_drops = self.events_dropped
+                self._last_drop_warning = now
+        self._spill.append(entry)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if not self._outgoing:
+            return
+        batch, self._outgoing = self._outgoing, []
+        self._send_batch(batch)
+
+    def _send_batch(self, batch: List[bytes]):
+        seq = self._next_seq
+        self._next_seq += 1
+        frame = encode_message(BrokerMessage.PUBLISH, (seq, batch))
+        self._inflight[seq] = frame
+        self.events_sent += len(batch)
+        # While disconnected the frame waits in _inflight and goes out on reconnect
+        if self._writer is not None:
+            self._writer.write(frame)
+            self.frames_sent += 1
+
+    def _on_ack(self, seq: int):
+        while self._inflight:
+            oldest = next(iter(self._inflight))
+            if oldest > seq:
+                break
+            del self._inflight[oldest]
+        # 열린 창만큼 밀린 이벤트 전송
+        while self._spill and len(self._inflight) < self.max_inflight:
+            count = min(self.max_batch, len(self._spill))
+            self._send_batch([self._spill.popleft() for _ in range(count)])
+
+    async def subscribe(self, event_type: str, handler: Callable,
+                        maxsize: int = 1000, overflow: str = OverflowPolicy.DROP_OLDEST) -> Subscription:
+        subscription = await super().subscribe(event_type, handler, maxsize, overflow)
+        count = self._remote_patterns.get(event_type, 0)
+        self._remote_patterns[event_type] = count + 1
+        if count == 0:
+            self._send_control(BrokerMessage.SUBSCRIBE, event_type)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        await super().unsubscribe(subscription)
+        count = self._remote_patterns.get(subscription.event_type, 0)
+        if count <= 1:
+            self._remote_patterns.pop(subscription.event_type, None)
+            self._send_control(BrokerMessage.UNSUBSCRIBE, subscription.event_type)
+        else:
+            self._remote_patterns[subscription.event_type] = count - 1
+
+    def _send_control(self, kind: str, payload: Any):
+        if self._writer is not None:
+            self._writer.write(encode_message(kind, payload))
+
+    async def _maintain_connection(self):
+        """브로커 연결 유지 - 끊기면 지수 백오프로 재연결 후 재구독/재전송"""
+        delay = self.reconnect_delay
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                logger.warning(f"Broker {self.host}:{self.port} unreachable ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            delay = self.reconnect_delay
+            try:
+                writer.write(encode_message(BrokerMessage.HELLO, self.client_id))
+                for pattern in self._remote_patterns:
+                    writer.write(encode_message(BrokerMessage.SUBSCRIBE, pattern))
+                for frame in self._inflight.values():
+                    writer.write(frame)
+                    self.frames_resent += 1
+                self._writer = writer
+                await writer.drain()
+                logger.info(f"Connected to event broker {self.host}:{self.port} as {self.client_id}")
+                await self._read_loop(reader)
+                logger.warning("Event broker closed the connection.")
+            except (asyncio.IncompleteReadError, ConnectionError, OSError, CodecError) as e:
+                logger.warning(f"Event broker connection lost: {e}")
+            finally:
+                self._writer = None
+                writer.close()
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            try:
+                frame = await read_frame(reader)
+            except asyncio.IncompleteReadError:
+                return
+            kind, payload = decode_message(frame)
+            if kind == BrokerMessage.ACK:
+                self._on_ack(payload)
+            elif kind == BrokerMessage.EVENTS:
+                for event, coalesce_key, priority, _ in iter_entries(payload):
+                    self.events_received += 1
+                    # Local delivery only; never echoed back to the broker
+                    await AsyncEventBus.publish(self, event, coalesce_key, priority)
+            elif kind == BrokerMessage.INTEREST:
+                self._interest = [split_topic(pattern) for pattern in payload]
+                self._interest_routes.clear()
+
+    async def process_events(self):
+        connection = asyncio.create_task(self._maintain_connection())
+        try:
+            await super().process_events()
+        finally:
+            connection.cancel()
+            await asyncio.gather(connection, return_exceptions=True)
+
+    def remote_stats(self) -> Dict[str, Any]:
+        return {
+            'connected': self.is_connected,
+            'inflight': len(self._inflight),
+            'spilled': len(self._spill),
+            'dropped': self.events_dropped,
+            'frames_sent': self.frames_sent,
+            'frames_resent': self.frames_resent,
+            'events_sent': self.events_sent,
+            'events_received': self.events_received,
+        }
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        snapshot = super().metrics_snapshot()
+        snapshot['remote'] = self.remote_stats()
+        return snapshot
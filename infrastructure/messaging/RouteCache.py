@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+V = TypeVar('V')
+
+
+class RouteCache(Generic[V]):
+    """
+    LRU of resolved routes per topic. Topics carry symbols and timeframes, so
+    the set of distinct topics is open-ended; only the `capacity` most
+    recently used stay cached and the rest are resolved again on demand.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._routes: "OrderedDict[str, V]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def get(self, topic: str) -> Optional[V]:
+        route = self._routes.get(topic)
+        if route is not None:
+            self._routes.move_to_end(topic)
+        return route
+
+    def put(self, topic: str, route: V) -> V:
+        self._routes[topic] = route
+        if len(self._routes) > self.capacity:
+            self._routes.popitem(last=False)
+        return route
+
+    def clear(self):
+        self._routes.clear()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import logging
+import socket
+import struct
+from typing import Any, AsyncIterator, List, Tuple
+
+from infrastructure.messaging.EventCodec import CodecError, SchemaRegistry, default_registry
+from infrastructure.messaging.Framing import encode_frame, read_frame
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+class ShardMessage:
+    EVENTS = "events"   # worker -> main: batch of events to republish
+    HEALTH = "health"   # worker -> main: periodic worker statistics
+    BAR = "bar"         # worker -> main: a closed bar for the cross-symbol correlator
+    STOP = "stop"       # main -> worker: shut down
+
+
+# One kind byte, then EventCodec records (EVENTS) or compact JSON
+_KIND_CODES = {ShardMessage.EVENTS: 1, ShardMessage.HEALTH: 2, ShardMessage.STOP: 3, ShardMessage.BAR: 4}
+_KINDS = {code: kind for kind, code in _KIND_CODES.items()}
+KIND = struct.Struct("!B")
+
+
+class ShardChannel:
+    """
+    Framed message channel between the main process and one shard worker,
+    carried over a local socketpair. Outgoing events are batched: everything
+    queued within one loop iteration (up to `max_batch`) goes out in a
+    single frame. Once more than `high_water` bytes are waiting in the
+    socket's write buffer, send_event() waits for the peer to catch up
+    instead of buffering without bound.
+
+    Events are encoded with the EventCodec as they are queued; an event
+    without a registered schema is logged and not forwarded.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_batch: int = 256,
+                 high_water: int = 1024 * 1024, registry: SchemaRegistry = default_registry):
+        self._reader = reader
+        self._writer = writer
+        self._max_batch = max_batch
+        self._high_water = high_water
+        self._registry = registry
+        # drain()은 쓰기 버퍼가 high_water를 넘었을 때만 대기
+        writer.transport.set_write_buffer_limits(high=high_water)
+        # 인코딩된 이벤트 레코드
+        self._batch: List[bytes] = []
+        self._flush_scheduled = False
+        self.frames_sent = 0
+        self.events_sent = 0
+
+    @classmethod
+    async def open(cls, sock: socket.socket, **kwargs) -> "ShardChannel":
+        reader, writer = await asyncio.open_connection(sock=sock)
+        return cls(reader, writer, **kwargs)
+
+    def _send(self, kind: str, body: bytes):
+        self._writer.write(encode_frame(KIND.pack(_KIND_CODES[kind]) + body))
+        self.frames_sent += 1
+
+    async def send(self, kind: str, payload: Any = None):
+        """Sends a control message after the queued events; the payload must be JSON-serializable."""
+        self._flush()
+        self._send(kind, json.dumps(payload, separators=(",", ":")).encode())
+        await self._writer.drain()
+
+    async def send_event(self, event: Any):
+        """
+        Queues an event; the batch is flushed at the end of the current loop
+        iteration. Waits while the write buffer is past the high-water mark.
+        """
+        try:
+            self._batch.append(self._registry.encode(event))
+        except CodecError as e:
+            logger.error(f"Event {getattr(event, 'event_type', event)} not forwarded: {e}")
+            return
+        if len(self._batch) >= self._max_batch:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        if self._writer.transport.get_write_buffer_size() >= self._high_water:
+            await self._writer.drain()
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if not self._batch or self._writer.is_closing():
+            return
+        batch, self._batch = self._batch, []
+        self._send(ShardMessage.EVENTS, b"".join(batch))
+        self.events_sent += len(batch)
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        while True:
+            try:
+                frame = await read_frame(self._reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            view = memoryview(frame)
+            (code,) = KIND.unpack_from(view)
+            kind = _KINDS.get(code)
+            if kind is None:
+                raise CodecError(f"Unknown shard message kind {code}")
+            body = view[KIND.size:]
+            if kind == ShardMessage.EVENTS:
+                yield kind, list(self._registry.iter_decode(body))
+            else:
+                yield kind, json.loads(bytes(body))
+
+    async def close(self):
+        self._flush()
+        if not self._writer.is_closing():
+            self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
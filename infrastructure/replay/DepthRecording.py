@@ -0,0 +1,171 @@
+import asyncio
+import json
+import logging
+import random
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from domain.ports.Clock import Clock
+from domain.ports.MarketDataFeed import MarketStream
+from domain.ports.OrderBook import BookSide
+from domain.services.PriceTicks import tick_scale
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# A depth snapshot as returned by GET /api/v3/depth and the depthUpdate
+# events recorded from the <symbol>@depth@100ms stream after it
+DepthRecordingData = Tuple[dict, List[dict]]
+
+
+def load_depth_recording(path: str) -> DepthRecordingData:
+    """Reads a JSON-lines depth recording: the snapshot on the first line, then one event per line."""
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty depth recording: {path}")
+    return lines[0], lines[1:]
+
+
+def save_depth_recording(path: str, snapshot: dict, events: List[dict]):
+    with open(path, 'w') as f:
+        for message in [snapshot, *events]:
+            f.write(json.dumps(message, separators=(",", ":")) + "\n")
+
+
+def synthetic_depth(symbol: str, count: int, price: float = 100.0, levels: int = 1000,
+                    start_ms: int = 1_700_000_000_000, seed: int = 0) -> DepthRecordingData:
+    """
+    Seeded random-walk book: a snapshot with `levels` levels a side, then
+    `count` 100 ms diffs that resize, add and remove levels near the mid and
+    clear the levels the mid moves through. Update ids advance by a random
+    step per event, like the exchange's.
+    """
+    rng = random.Random(seed)
+    scale = tick_scale(symbol)
+    fmt = f"{{:.{scale.decimals}f}}"
+    mid = scale.to_ticks(price)
+    book = {BookSide.BID: {mid - 1 - i: round(rng.uniform(0.1, 5.0), 3) for i in range(levels)},
+            BookSide.ASK: {mid + 1 + i: round(rng.uniform(0.1, 5.0), 3) for i in range(levels)}}
+
+    def encode(levels_by_tick: Dict[int, float]) -> List[List[str]]:
+        return [[fmt.format(scale.to_price(tick)), f"{size:.3f}"] for tick, size in levels_by_tick.items()]
+
+    update_id = 1000
+    snapshot = {'lastUpdateId': update_id,
+                'bids': encode(dict(sorted(book[BookSide.BID].items(), reverse=True))),
+                'asks': encode(dict(sorted(book[BookSide.ASK].items())))}
+
+    events = []
+    for i in range(count):
+        changes = {BookSide.BID: {}, BookSide.ASK: {}}
+        previous, mid = mid, mid + rng.choice((-2, -1, 0, 0, 1, 2))
+        # 중간가가 지나간 레벨은 반대편 체결로 소진
+        for tick in range(mid, previous):
+            if tick in book[BookSide.BID]:
+                changes[BookSide.BID][tick] = 0.0
+        for tick in range(previous + 1, mid + 1):
+            if tick in book[BookSide.ASK]:
+                changes[BookSide.ASK][tick] = 0.0
+        for _ in range(rng.randint(1, 8)):
+            side = rng.choice((BookSide.BID, BookSide.ASK))
+            distance = 1 + int(rng.expovariate(0.05))
+            tick = mid - distance if side == BookSide.BID else mid + distance
+            changes[side][tick] = 0.0 if rng.random() < 0.2 else round(rng.uniform(0.1, 5.0), 3)
+        for side, side_changes in changes.items():
+            for tick, size in side_changes.items():
+                if size > 0:
+                    book[side][tick] = size
+                else:
+                    book[side].pop(tick, None)
+
+        first_id = update_id + 1
+        update_id += rng.randint(1, 5)
+        event_time = start_ms + 100 * (i + 1)
+        events.append({'e': 'depthUpdate', 'E': event_time, 's': symbol, 'U': first_id, 'u': update_id,
+                       'b': encode(changes[BookSide.BID]), 'a': encode(changes[BookSide.ASK])})
+    return snapshot, events
+
+
+class DepthReplay:
+    """
+    Snapshot fetcher and RawSource for OrderBookManager that play depth
+    recordings back. A reference book follows every recorded event, so
+    fetch_snapshot() answers with the book as of the last delivered event,
+    like the exchange, and reference() gives the state a correctly
+    synchronized local book must end in. With `drop_every`, every Nth event
+    is applied to the reference but not delivered, forcing sequence gaps.
+
+    With a clock, events are delivered at their recorded event times (cheap
+    on a virtual-time loop); without one, back to back.
+    """
+
+    def __init__(self, recordings: Dict[str, DepthRecordingData], clock: Optional[Clock] = None,
+                 drop_every: int = 0):
+        self.recordings = recordings
+        self.clock = clock
+        self.drop_every = drop_every
+        self.dropped = 0
+        self.snapshots_served = 0
+        self._books: Dict[str, Dict[str, Dict[int, Tuple[str, float]]]] = {}
+        self._last_ids: Dict[str, int] = {}
+        self._finished: Dict[str, asyncio.Event] = {}
+        for symbol, (snapshot, _) in recordings.items():
+            self._books[symbol] = {BookSide.BID: {}, BookSide.ASK: {}}
+            self._last_ids[symbol] = snapshot['lastUpdateId']
+            self._apply(symbol, snapshot['bids'], snapshot['asks'])
+
+    def _apply(self, symbol: str, bids: List[List[str]], asks: List[List[str]]):
+        scale = tick_scale(symbol)
+        for side, levels in ((BookSide.BID, bids), (BookSide.ASK, asks)):
+            book = self._books[symbol][side]
+            for price, size in levels:
+                tick = scale.to_ticks(float(price))
+                if float(size) > 0:
+                    book[tick] = (price, float(size))
+                else:
+                    book.pop(tick, None)
+
+    def _event(self, symbol: str) -> asyncio.Event:
+        event = self._finished.get(symbol)
+        if event is None:
+            event = self._finished[symbol] = asyncio.Event()
+        return event
+
+    async def finished(self, symbol: str):
+        """Waits until every event of the symbol's recording was played."""
+        await self._event(symbol).wait()
+
+    def reference(self, symbol: str) -> Dict[str, List[Tuple[int, float]]]:
+        """(tick, size) levels per side in ascending price order, as of the last played event."""
+        return {side: [(tick, size) for tick, (_, size) in sorted(levels.items())]
+                for side, levels in self._books[symbol].items()}
+
+    async def fetch_snapshot(self, symbol: str, limit: Optional[int] = None) -> dict:
+        await asyncio.sleep(0)  # 요청 왕복 동안 스트림이 진행
+        self.snapshots_served += 1
+        book = self._books[symbol]
+        bids = sorted(book[BookSide.BID].items(), reverse=True)[:limit]
+        asks = sorted(book[BookSide.ASK].items())[:limit]
+        return {'lastUpdateId': self._last_ids[symbol],
+                'bids': [[price, f"{size}"] for _, (price, size) in bids],
+                'asks': [[price, f"{size}"] for _, (price, size) in asks]}
+
+    async def source(self, symbol: str, stream_type: str) -> AsyncIterator[dict]:
+        if stream_type != MarketStream.DEPTH or symbol not in self.recordings:
+            logger.warning(f"No depth recording for {symbol} {stream_type}; stream stays idle.")
+            await asyncio.get_running_loop().create_future()
+
+        for i, event in enumerate(self.recordings[symbol][1]):
+            if self.clock is not None:
+                await asyncio.sleep(max(event['E'] / 1000 - self.clock.time(), 0))
+            else:
+                await asyncio.sleep(0)
+            self._apply(symbol, event['b'], event['a'])
+            self._last_ids[symbol] = event['u']
+            if self.drop_every and i and i % self.drop_every == 0:
+                self.dropped += 1
+                continue
+            yield event
+
+        self._event(symbol).set()
+        await asyncio.get_running_loop().create_future()  # 기록 종료 - 재연결 없이 대기
@@ -0,0 +1,204 @@
+import asyncio
+import csv
+import logging
+import math
+import os
+import random
+from typing import AsyncIterator, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from domain.ports.Clock import Clock
+from domain.ports.MarketDataFeed import MarketStream
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# (open time ms, open, high, low, close, volume, close time ms)
+KlineRow = Tuple[int, float, float, float, float, float, int]
+# (trade time ms, price, quantity)
+TradeRow = Tuple[int, float, float]
+
+# On-disk layout of a kline dataset: one <SYMBOL>.npy of these rows per symbol
+KLINE_DTYPE = np.dtype([('open_time', np.int64), ('open', np.float64), ('high', np.float64),
+                        ('low', np.float64), ('close', np.float64), ('volume', np.float64),
+                        ('close_time', np.int64)])
+
+
+def _millis(value: str) -> int:
+    # Binance public data switched to microsecond timestamps for newer files
+    stamp = int(value)
+    return stamp // 1000 if stamp > 10 ** 14 else stamp
+
+
+def load_binance_klines(path: str) -> List[KlineRow]:
+    """Reads a kline CSV as published on data.binance.vision (header row optional)."""
+    rows = []
+    with open(path, newline='') as f:
+        for record in csv.reader(f):
+            if not record or not record[0].isdigit():
+                continue
+            rows.append((_millis(record[0]), float(record[1]), float(record[2]), float(record[3]),
+                         float(record[4]), float(record[5]), _millis(record[6])))
+    return rows
+
+
+def load_binance_agg_trades(path: str) -> List[TradeRow]:
+    """Reads an aggTrades CSV as published on data.binance.vision (header row optional)."""
+    rows = []
+    with open(path, newline='') as f:
+        for record in csv.reader(f):
+            if not record or not record[0].isdigit():
+                continue
+            rows.append((_millis(record[5]), float(record[1]), float(record[2])))
+    return rows
+
+
+def synthetic_klines(start_ms: int, count: int, price: float = 100.0, seed: int = 0) -> List[KlineRow]:
+    """Seeded random-walk 1m klines, for trying the replay without downloaded data."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        open_time = start_ms + i * 60000
+        close = max(price * math.exp(rng.gauss(0, 0.001)), 0.01)
+        high = max(price, close) * (1 + abs(rng.gauss(0, 0.0005)))
+        low = min(price, close) * (1 - abs(rng.gauss(0, 0.0005)))
+        rows.append((open_time, price, high, low, close, rng.uniform(1, 100), open_time + 59999))
+        price = close
+    return rows
+
+
+class MarketRecording:
+    """
+    Recorded 1m klines, and optionally trades, per symbol.
+
+    Symbols without recorded trades get four synthetic trades per candle:
+    open, the nearer extreme, the farther extreme, close. That is enough to
+    drive zone touches and fills, though not intrabar order.
+
+    Klines are either row lists or KLINE_DTYPE arrays, which may be
+    read-only memory maps of a dataset shared between processes.
+    """
+
+    def __init__(self):
+        self.klines: Dict[str, Sequence[KlineRow]] = {}
+        self.trades: Dict[str, List[TradeRow]] = {}
+
+    def add_klines(self, symbol: str, rows: List[KlineRow]):
+        self.klines.setdefault(symbol, []).extend(rows)
+        self.klines[symbol].sort()
+
+    def add_kline_array(self, symbol: str, rows: np.ndarray):
+        """Uses a KLINE_DTYPE array sorted by open time as is (no copy)."""
+        self.klines[symbol] = rows
+
+    def add_trades(self, symbol: str, rows: List[TradeRow]):
+        self.trades.setdefault(symbol, []).extend(rows)
+        self.trades[symbol].sort()
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self.klines)
+
+    @property
+    def start_time(self) -> float:
+        """Open time (seconds) of the earliest recorded candle."""
+        return min(int(rows[0][0]) for rows in self.klines.values() if len(rows)) / 1000
+
+    @property
+    def end_time(self) -> float:
+        """Event time (seconds) of the last recorded message."""
+        last = [int(rows[-1][6]) for rows in self.klines.values() if len(rows)]
+        last += [rows[-1][0] for rows in self.trades.values() if rows]
+        return max(last) / 1000
+
+    def kline_messages(self, symbol: str) -> Iterator[dict]:
+        for open_time, o, h, l, c, v, close_time in self._kline_rows(symbol):
+            yield {'e': 'kline', 'E': close_time, 's': symbol, 'k': {
+                't': open_time, 'T': close_time, 's': symbol, 'i': '1m',
+                'o': o, 'c': c, 'h': h, 'l': l, 'v': v, 'x': True,
+            }}
+
+    def trade_messages(self, symbol: str) -> Iterator[dict]:
+        if symbol in self.trades:
+            rows = self.trades[symbol]
+        else:
+            rows = self._synthetic_trades(symbol)
+        for trade_time, price, quantity in rows:
+            yield {'e': 'aggTrade', 'E': trade_time, 's': symbol, 'p': price, 'q': quantity, 'T': trade_time}
+
+    def _kline_rows(self, symbol: str) -> Iterator[KlineRow]:
+        rows = self.klines.get(symbol, ())
+        if isinstance(rows, np.ndarray):
+            # 청크 단위로 Python 값으로 변환 (메모리 맵은 필요한 페이지만 읽음)
+            for start in range(0, len(rows), 4096):
+                yield from rows[start:start + 4096].tolist()
+        else:
+            yield from rows
+
+    def _synthetic_trades(self, symbol: str) -> Iterator[TradeRow]:
+        for open_time, o, h, l, c, v, close_time in self._kline_rows(symbol):
+            first, second = (l, h) if c >= o else (h, l)
+            quantity = v / 4
+            yield open_time, o, quantity
+            yield open_time + 15000, first, quantity
+            yield open_time + 30000, second, quantity
+            yield open_time + 45000, c, quantity
+
+
+def save_kline_dataset(recording: MarketRecording, directory: str):
+    """Writes the recording's klines as one KLINE_DTYPE .npy file per symbol."""
+    os.makedirs(directory, exist_ok=True)
+    for symbol, rows in recording.klines.items():
+        array = np.asarray(rows, dtype=KLINE_DTYPE) if isinstance(rows, np.ndarray) \
+            else np.array([tuple(row) for row in rows], dtype=KLINE_DTYPE)
+        np.save(os.path.join(directory, f"{symbol}.npy"), array)
+
+
+def load_kline_dataset(directory: str, symbols: Sequence[str] = ()) -> MarketRecording:
+    """
+    Opens a dataset written by save_kline_dataset as read-only memory maps:
+    processes replaying the same dataset share its pages through the OS
+    page cache instead of each holding a copy.
+    """
+    recording = MarketRecording()
+    names = symbols or sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".npy"))
+    for symbol in names:
+        recording.add_kline_array(symbol, np.load(os.path.join(directory, f"{symbol}.npy"), mmap_mode='r'))
+    return recording
+
+
+class ReplayFeed:
+    """
+    RawSource for MarketDataHub that plays a MarketRecording back on the
+    injected clock: each message is delivered at its recorded event time.
+    Like a live stream, a stream opened mid-replay starts at the current
+    time rather than at the start of the recording. On a virtual-time loop
+    the waits cost nothing, so replay runs as fast as the consumers keep up.
+    Exhausted streams stay open and idle, so the hub does not reconnect them.
+    """
+
+    def __init__(self, recording: MarketRecording, clock: Clock):
+        self.recording = recording
+        self.clock = clock
+        self.messages_sent = 0
+
+    async def source(self, symbol: str, stream_type: str) -> AsyncIterator[dict]:
+        if stream_type == MarketStream.TRADE:
+            messages = self.recording.trade_messages(symbol)
+        elif stream_type == MarketStream.kline("1m"):
+            messages = self.recording.kline_messages(symbol)
+        else:
+            logger.warning(f"No recording for {symbol} {stream_type}; stream stays idle.")
+            messages = iter(())
+
+        opened_at = self.clock.time() * 1000
+        for message in messages:
+            if message['E'] < opened_at:
+                continue
+            # 같은 시각의 메시지도 한 번씩 양보해 소비자 큐가 넘치지 않게 함
+            await asyncio.sleep(max(message['E'] / 1000 - self.clock.time(), 0))
+            self.messages_sent += 1
+            yield message
+
+        await asyncio.get_running_loop().create_future()  # 기록 종료 - 재연결 없이 대기
@@ -0,0 +1,152 @@
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import datetime
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from application.orchestration.TradingParameters import TradingParameters
+from infrastructure.replay.MarketRecording import (
+    MarketRecording, load_binance_klines, load_kline_dataset, save_kline_dataset, synthetic_klines,
+)
+from infrastructure.replay.ReplayEngine import ReplayEngine
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def parameter_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the grid's values, as TradingParameters overrides."""
+    unknown = set(grid) - set(TradingParameters.names())
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def sweep_metrics(counts: Dict[str, int]) -> Dict[str, Any]:
+    """Per-run summary derived from a replay's event counts."""
+    def rate(numerator: str, denominator: str) -> float:
+        return round(counts.get(numerator, 0) / counts[denominator], 4) if counts.get(denominator) else 0.0
+
+    return {
+        'fvgs': counts.get('NEW_FVG_DETECTED', 0),
+        'fvg_fill_rate': rate('FVG_FILLED', 'NEW_FVG_DETECTED'),
+        'fvg_updates': counts.get('FVG_PARTIAL_FILL', 0),
+        'order_blocks': counts.get('NEW_ORDER_BLOCK', 0),
+        'validity_updates': counts.get('VALIDITY_UPDATED', 0),
+        'pools': counts.get('NEW_POOL_DETECTED', 0),
+        'sweep_rate': rate('LIQUIDITY_SWEPT', 'NEW_POOL_DETECTED'),
+        'structure_breaks': counts.get('BOS_DETECTED', 0) + counts.get('CHOCH_DETECTED', 0),
+        'time_signals': counts.get('HIGH_PROBABILITY_TIME', 0),
+    }
+
+
+def _evaluate(dataset_dir: str, symbols: List[str], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker: replays the memory-mapped dataset with one parameter combination."""
+    logging.getLogger().setLevel(logging.WARNING)
+    started = time.perf_counter()
+    engine = ReplayEngine(load_kline_dataset(dataset_dir, symbols),
+                          parameters=TradingParameters(**overrides), keep_entries=False)
+    # 존 엔티티의 placeholder print 출력은 버림
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        engine.run()
+    row = dict(overrides)
+    row.update(sweep_metrics(engine.log.event_counts))
+    row['wall_seconds'] = round(time.perf_counter() - started, 1)
+    return row
+
+
+def run_sweep(dataset_dir: str, grid: Dict[str, Sequence[Any]], symbols: Sequence[str] = (),
+              workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Replays the dataset once per grid combination across a process pool and
+    returns one result row per combination, in grid order. Workers open the
+    dataset as read-only memory maps, so it is read from disk once and shared
+    through the page cache however many workers run.
+    """
+    combinations = parameter_grid(grid)
+    workers = min(workers or os.cpu_count() or 1, len(combinations))
+    logger.info(f"Sweeping {len(combinations)} combinations on {workers} workers")
+
+    results: Dict[int, Dict[str, Any]] = {}
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(workers, mp_context=context) as pool:
+        futures = {
+            pool.submit(_evaluate, dataset_dir, list(symbols), overrides): i
+            for i, overrides in enumerate(combinations)
+        }
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                logger.error(f"Sweep run {combinations[i]} failed: {e}")
+                results[i] = dict(combinations[i], error=str(e))
+            logger.info(f"{len(results)}/{len(combinations)} runs done")
+    return [results[i] for i in range(len(combinations))]
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    cells = [[str(row.get(column, "")) for column in columns] for row in rows]
+    widths = [max([len(column)] + [len(line[i]) for line in cells]) for i, column in enumerate(columns)]
+    lines = ["  ".join(column.rjust(width) for column, width in zip(columns, widths))]
+    lines += ["  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells]
+    return "\n".join(lines)
+
+
+def write_csv(rows: List[Dict[str, Any]], path: str):
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _parse_grid(specs: List[str]) -> Dict[str, List[float]]:
+    grid = {}
+    for spec in specs:
+        name, values = spec.split("=", 1)
+        grid[name] = [float(value) for value in values.split(",")]
+    return grid
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a kline dataset once per parameter combination across a process pool")
+    parser.add_argument("--dataset", required=True, help="Directory of <SYMBOL>.npy kline arrays (created if importing)")
+    parser.add_argument("--klines", nargs="*", default=[], metavar="SYMBOL=PATH",
+                        help="Import Binance 1m kline CSVs into the dataset first")
+    parser.add_argument("--synthetic", nargs="*", default=[], metavar="SYMBOL",
+                        help="Write seeded random-walk klines into the dataset first")
+    parser.add_argument("--days", type=float, default=30, help="Length of synthetic data")
+    parser.add_argument("--start", default="2024-01-01", help="Start date of synthetic data (UTC)")
+    parser.add_argument("--symbols", nargs="*", default=[], help="Dataset symbols to replay (default: all)")
+    parser.add_argument("--grid", nargs="+", required=True, metavar="NAME=V1,V2,...",
+                        help=f"Values per parameter; one of {', '.join(TradingParameters.names())}")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--sort", help="Sort the table by this column, descending")
+    parser.add_argument("--csv", help="Also write the results table to this CSV file")
+    args = parser.parse_args()
+
+    if args.klines or args.synthetic:
+        recording = MarketRecording()
+        for spec in args.klines:
+            symbol, path = spec.split("=", 1)
+            recording.add_klines(symbol, load_binance_klines(path))
+        start = datetime.datetime.fromisoformat(args.start).replace(tzinfo=datetime.timezone.utc)
+        for seed, symbol in enumerate(args.synthetic):
+            recording.add_klines(symbol, synthetic_klines(int(start.timestamp() * 1000), int(args.days * 1440), seed=seed))
+        save_kline_dataset(recording, args.dataset)
+
+    rows = run_sweep(args.dataset, _parse_grid(args.grid), args.symbols, args.workers)
+    if args.sort:
+        rows.sort(key=lambda row: row.get(args.sort, 0), reverse=True)
+    if args.csv:
+        write_csv(rows, args.csv)
+    print(format_table(rows))
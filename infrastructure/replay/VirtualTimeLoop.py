@@ -0,0 +1,129 @@
+import asyncio
+import selectors
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from domain.ports.Clock import Clock
+
+T = TypeVar("T")
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when the replay loop advances it."""
+
+    def __init__(self, start: float):
+        self.start = float(start)
+        self.elapsed = 0.0
+
+    def time(self) -> float:
+        return self.start + self.elapsed
+
+    def advance(self, seconds: float):
+        self.elapsed += seconds
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """
+    Wraps the loop's real selector. Whenever the loop would block until its
+    next timer, pending I/O is polled without waiting and, if there is none,
+    the clock jumps straight to the timer instead.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self._clock = clock
+        self._selector = selectors.DefaultSelector()
+
+    def register(self, fileobj, events, data=None):
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self._selector.modify(fileobj, events, data)
+
+    def get_key(self, fileobj):
+        return self._selector.get_key(fileobj)
+
+    def get_map(self):
+        return self._selector.get_map()
+
+    def close(self):
+        self._selector.close()
+
+    def select(self, timeout: Optional[float] = None):
+        if timeout is None:
+            # No timers left: only real I/O can wake the loop
+            return self._selector.select(None)
+        events = self._selector.select(0)
+        if not events and timeout > 0:
+            self._clock.advance(timeout)
+        return events
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop on virtual time, for historical replay.
+
+    loop.time() reads the VirtualClock, so asyncio.sleep, call_later and
+    timeouts all run on it, and time advances to the next timer as soon as
+    nothing is ready to run: a 60 s sleep costs one loop iteration. Callbacks
+    due at the same virtual time run in scheduling order.
+
+    run_in_executor(None, ...) calls the function inline, so work offloaded
+    to the default executor completes at the virtual instant it was submitted
+    and cannot reorder events between runs.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        super().__init__(_VirtualTimeSelector(clock))
+        # Timers due within this margin run together; it must exceed the
+        # float spacing of loop.time() or a timer due "now" is never popped
+        self._clock_resolution = 1e-6
+
+    def time(self) -> float:
+        # Elapsed rather than Unix time keeps float precision for scheduling
+        return self.clock.elapsed
+
+    def run_in_executor(self, executor, func: Callable[..., T], *args) -> asyncio.Future:
+        if executor is not None:
+            return super().run_in_executor(executor, func, *args)
+        future = self.create_future()
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def run_virtual(main: Callable[[VirtualTimeEventLoop], Awaitable[T]], start: float) -> T:
+    """
+    Runs `main(loop)` to completion on a new VirtualTimeEventLoop whose clock
+    starts at Unix time `start`, then cancels whatever tasks are left (like
+    asyncio.run).
+    """
+    loop = VirtualTimeEventLoop(VirtualClock(start))
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(main(loop))
+    finally:
+        try:
+            _cancel_all_tasks(loop)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop):
+    tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            loop.call_exception_handler({
+                'message': 'unhandled exception during replay shutdown',
+                'exception': task.exception(),
+                'task': task,
+            })
@@ -0,0 +1,115 @@
+import asyncio
+
+import numpy as np
+
+from application.analysis.AsyncFVGDetector import AsyncFVGDetector
+from application.analysis.AsyncOrderBlockDetector import AsyncOrderBlockDetector
+from application.analysis.AsyncZoneMonitor import AsyncZoneMonitor
+from domain.entities.MarketStructure import AsyncMarketStructure
+from domain.ports.MarketDataFeed import MarketDataFeed
+from domain.services.BatchDetectors import (BEARISH, BULLISH, detect_fvgs, detect_order_blocks, detect_swings,
+                                            label_structure, structure_state)
+from domain.services.ColumnarRingBuffer import CandleRingBuffer, CandleWindow
+from domain.services.MarketStructureEngine import BOS, MarketStructureEngine
+from domain.services.PriceTicks import tick_scale
+from domain.services.SwingPointDetector import SwingPointDetector, SwingType
+from infrastructure.replay.MarketRecording import synthetic_klines
+
+SYMBOL = "BTCUSDT"
+
+
+def _candles(count: int = 3000, seed: int = 7) -> CandleWindow:
+    rows = np.array(synthetic_klines(1760000000000, count, seed=seed), dtype=np.float64)
+    return CandleWindow({'open': rows[:, 1], 'high': rows[:, 2], 'low': rows[:, 3], 'close': rows[:, 4],
+                         'volume': rows[:, 5], 'timestamp': rows[:, 0].astype(np.int64)})
+
+
+class _IdleFeed(MarketDataFeed):
+    async def stream(self, symbol, stream_type):
+        await asyncio.get_running_loop().create_future()
+        yield
+
+    def candle_history(self, symbol, timeframe):
+        return CandleRingBuffer()
+
+
+def test_swings_match_the_streaming_detector():
+    candles = _candles()
+    timestamps = candles.timestamp / 1000
+    detector = SwingPointDetector(2)
+    streamed = [(swing.index, swing.kind, swing.price)
+                for high, low, timestamp in zip(candles.high.tolist(), candles.low.tolist(), timestamps.tolist())
+                for swing in detector.update(high, low, timestamp)]
+
+    batch = detect_swings(candles.high, candles.low, timestamps, 2)
+    assert [(row['index'], SwingType.HIGH if row['direction'] == BULLISH else SwingType.LOW, row['price'])
+            for row in batch] == streamed
+
+
+def test_structure_labels_and_state_match_the_streaming_engine():
+    candles = _candles(3500)
+    columns = [column.tolist() for column in (candles.high, candles.low, candles.close, candles.timestamp / 1000)]
+    history = [np.array(column[:3000]) for column in columns]
+    engine = MarketStructureEngine(2)
+    streamed = [(isinstance(b, BOS), b.direction, b.level, b.timestamp)
+                for row in zip(*(column[:3000] for column in columns)) for b in engine.update(*row)]
+
+    labels = label_structure(*history, strength=2)
+    assert len(labels) > 10
+    directions = {BULLISH: "BULLISH", BEARISH: "BEARISH"}
+    assert [(not row['is_choch'], directions[row['direction']], row['level'], row['timestamp'])
+            for row in labels] == streamed
+
+    # 배치로 구성한 엔진은 스트리밍 엔진과 같은 상태에서 이어감
+    seeded = MarketStructureEngine.from_state(structure_state(*history, strength=2), 2)
+    assert seeded.state() == engine.state()
+    for row in zip(*(column[3000:] for column in columns)):
+        assert seeded.update(*row) == engine.update(*row)
+
+
+def test_fvgs_match_the_streaming_detector():
+    candles = _candles()
+    scale = tick_scale(SYMBOL)
+    detector = AsyncFVGDetector(None, _IdleFeed(), None)
+
+    async def stream():
+        found = []
+        for end in range(3, len(candles) + 1):
+            window = CandleWindow({name: getattr(candles, name)[end - 3:end] for name in CandleWindow.__slots__})
+            gap = await detector._detect_three_candle_fvg(window, scale)
+            if gap is not None:
+                found.append((gap.high, gap.low, gap.timestamp))
+        return found
+
+    batch = detect_fvgs(candles.high, candles.low, candles.timestamp / 1000, scale)
+    assert len(batch) > 10
+    assert [(row['high'], row['low'], row['timestamp']) for row in batch] == asyncio.run(stream())
+
+
+def test_seeding_registers_open_gaps_and_order_blocks():
+    candles = _candles(500)
+
+    async def seed():
+        monitor = AsyncZoneMonitor(_IdleFeed())
+        fvgs = AsyncFVGDetector(None, monitor.market_data, monitor)
+        blocks = AsyncOrderBlockDetector(None, monitor.market_data, monitor)
+        await fvgs.seed_history(SYMBOL, "1m", candles)
+        await blocks.seed_history(SYMBOL, "1m", candles)
+        await monitor.stop()
+        return fvgs.active_gaps[f"{SYMBOL}_1m"], blocks.active_blocks[f"{SYMBOL}_1m"]
+
+    gaps, order_blocks = asyncio.run(seed())
+    detected = detect_fvgs(candles.high, candles.low, candles.timestamp / 1000, tick_scale(SYMBOL))
+    assert 0 < len(gaps) < len(detected)
+    for gap in gaps:
+        # 생성 이후 어떤 캔들도 채움 임계 가격까지 갭 안을 지나지 않음
+        later = candles.timestamp / 1000 > gap.creation_time
+        fill_price = gap.gap_low + gap.gap_size * gap.fill_threshold
+        assert not np.any((candles.high[later] >= fill_price) & (candles.low[later] <= gap.gap_high))
+
+    # 이후 캔들이 하단 아래로 관통한 블록은 무효라 등록되지 않음
+    detected = detect_order_blocks(candles.high, candles.low, candles.timestamp)
+    ticks = np.rint(candles.low / tick_scale(SYMBOL).tick_size)
+    unbroken = [row['timestamp'] / 1000 for row in detected if not np.any(ticks[row['index'] + 1:] < ticks[row['index']])]
+    assert 0 < len(order_blocks) < len(detected)
+    assert [block.creation_time for block in order_blocks] == unbroken
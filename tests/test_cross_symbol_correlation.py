@@ -0,0 +1,105 @@
+import asyncio
+
+import numpy as np
+
+from application.analysis.CrossSymbolCorrelation import CrossSymbolCorrelation
+from domain.services.RollingCorrelation import CorrelationRegime, CorrelationRegimeTracker, RollingCorrelation
+
+
+class _RecordingBus:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event, coalesce_key=None):
+        self.events.append(event)
+
+
+def test_bar_commits_once_every_symbol_reported_it():
+    async def scenario():
+        correlation = CrossSymbolCorrelation(_RecordingBus())
+        correlation.track(["A", "B", "C"])
+        await correlation.observe("A", 60.0, 100.0, None)
+        await correlation.observe("B", 60.0, 200.0, 1.0)
+        assert correlation.rows_committed == 0
+        await correlation.observe("C", 60.0, 300.0, None)
+        assert correlation.rows_committed == 1
+        return correlation
+
+    correlation = asyncio.run(scenario())
+    assert correlation.stats() == {'symbols': 3, 'rows': 1, 'late_bars': 0, 'pending_bars': 0}
+
+
+def test_incomplete_bar_commits_behind_two_newer_bars_and_late_bars_are_counted():
+    async def scenario():
+        correlation = CrossSymbolCorrelation(_RecordingBus())
+        correlation.track(["A", "B"])
+        await correlation.observe("A", 60.0, 100.0, None)
+        await correlation.observe("A", 120.0, 101.0, None)
+        assert correlation.rows_committed == 0
+        await correlation.observe("A", 180.0, 102.0, None)
+        # 60 is missing B but has two newer bars pending
+        assert correlation.rows_committed == 1
+        await correlation.observe("B", 60.0, 50.0, None)
+        assert correlation.late_bars == 1
+
+        # 늦게 도착한 B가 120을 완성하면 그 막대까지 순서대로 반영
+        await correlation.observe("B", 120.0, 51.0, None)
+        assert correlation.rows_committed == 2
+        await correlation.observe("B", 180.0, 52.0, None)
+        assert correlation.rows_committed == 3
+        return correlation
+
+    correlation = asyncio.run(scenario())
+    assert correlation.stats()['pending_bars'] == 0
+
+
+def test_bars_arriving_out_of_order_commit_in_time_order():
+    async def scenario():
+        correlation = CrossSymbolCorrelation(_RecordingBus())
+        correlation.track(["A", "B"])
+        committed = []
+        original = correlation._commit
+
+        async def record(timestamp, observed):
+            committed.append(timestamp)
+            await original(timestamp, observed)
+
+        correlation._commit = record
+        for symbol, timestamp in [("A", 120.0), ("A", 60.0), ("B", 60.0), ("B", 120.0)]:
+            await correlation.observe(symbol, timestamp, 100.0, None)
+        return committed
+
+    assert asyncio.run(scenario()) == [60.0, 120.0]
+
+
+def test_regime_tracker_applies_hysteresis():
+    tracker = CorrelationRegimeTracker(enter=0.7, exit=0.5)
+    names = ["A", "B"]
+
+    def step(value: float):
+        corr = np.array([[1.0, value], [value, 1.0]])
+        return [(previous, regime) for _, _, previous, regime, _ in tracker.update(corr, names)]
+
+    H, N, I = CorrelationRegime.HIGH, CorrelationRegime.NEUTRAL, CorrelationRegime.INVERSE
+    assert step(0.65) == []
+    assert step(0.72) == [(N, H)]
+    # 진입 임계 아래여도 이탈 임계 이상이면 유지
+    assert step(0.55) == []
+    assert step(0.69) == []
+    assert step(0.45) == [(H, N)]
+    assert step(-0.75) == [(N, I)]
+    assert step(-0.5) == []
+    assert step(float('nan')) == [(I, N)]
+
+
+def test_rolling_correlation_matches_corrcoef_over_the_window():
+    rng = np.random.default_rng(3)
+    base = rng.normal(size=(300, 1))
+    rows = np.hstack([base + rng.normal(scale=s, size=(300, 1)) for s in (0.1, 0.5, 2.0)])
+    engine = RollingCorrelation(window=50)
+    for name in ("A", "B", "C"):
+        engine.index(name)
+    for i, row in enumerate(rows):
+        engine.update(row)
+        if i >= 49 and i % 37 == 0:
+            assert np.allclose(engine.matrix(), np.corrcoef(rows[i - 49:i + 1].T))
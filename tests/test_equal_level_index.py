@@ -0,0 +1,61 @@
+import math
+
+from domain.services.EqualLevelIndex import EqualLevelIndex
+
+
+def test_level_is_reported_from_its_second_touch_at_a_fixed_price():
+    index = EqualLevelIndex(tolerance_percent=0.1)
+    assert index.add(100.0, 1.0) is None
+    level = index.add(100.05, 2.0)
+    assert level is not None and level.touches == 2
+    assert level.price == 100.05
+
+    # 이후 터치도 같은 레벨을 보고하되 가격은 처음 두 터치에서 고정
+    assert index.add(100.08, 3.0) is level
+    assert level.touches == 3 and level.price == 100.05 and level.last_seen == 3.0
+    assert len(index) == 1
+
+
+def test_equal_lows_take_the_lower_touch():
+    index = EqualLevelIndex(tolerance_percent=0.1, use_high=False)
+    index.add(100.0, 1.0)
+    assert index.add(99.95, 2.0).price == 99.95
+
+
+def test_prices_outside_tolerance_start_new_levels():
+    index = EqualLevelIndex(tolerance_percent=0.1)
+    index.add(100.0, 1.0)
+    assert index.add(100.2, 2.0) is None
+    assert len(index) == 2
+
+
+def test_touches_straddling_a_bucket_edge_match():
+    index = EqualLevelIndex(tolerance_percent=0.1)
+    edge = math.exp(1000 * index._bucket_width)
+    below, above = edge * (1 - index.tolerance / 4), edge * (1 + index.tolerance / 4)
+    assert index._bucket(below) != index._bucket(above)
+
+    index.add(below, 1.0)
+    level = index.add(above, 2.0)
+    assert level is not None and level.anchor == below
+
+
+def test_oldest_levels_expire_past_max_levels():
+    index = EqualLevelIndex(tolerance_percent=0.1, max_levels=2)
+    index.add(100.0, 1.0)
+    index.add(110.0, 2.0)
+    index.add(120.0, 3.0)
+    assert len(index) == 2
+    # 만료된 레벨은 다시 첫 터치부터
+    assert index.add(100.0, 4.0) is None
+    assert index.add(120.0, 5.0) is not None
+
+
+def test_state_round_trip_keeps_levels_and_touches():
+    index = EqualLevelIndex(tolerance_percent=0.1)
+    index.add(100.0, 1.0)
+    index.add(100.05, 2.0)
+    index.add(90.0, 3.0)
+    restored = EqualLevelIndex.from_state(index.state(), tolerance_percent=0.1)
+    assert restored.state() == index.state()
+    assert restored.add(100.02, 4.0).touches == 3
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+from domain.events.LiquidityEvent import LiquidityEvent
+from infrastructure.messaging.EventBroker import EventBroker
+from infrastructure.messaging.RemoteEventBus import RemoteEventBus
+
+SWEPT = "LIQUIDITY_SWEPT.BTCUSDT"
+
+
+async def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def _start_broker(port: int = 0, grace: float = 0.0) -> EventBroker:
+    broker = EventBroker(port=port, resubscribe_grace=grace)
+    await broker.start()
+    return broker
+
+
+def _node(port: int, reconnect_delay: float = 0.05, **kwargs) -> RemoteEventBus:
+    return RemoteEventBus(port=port, reconnect_delay=reconnect_delay, max_reconnect_delay=reconnect_delay, **kwargs)
+
+
+async def _subscriber(node: RemoteEventBus, pattern: str):
+    received = []
+
+    async def handler(event):
+        received.append(event)
+
+    await node.subscribe(pattern, handler, maxsize=100000)
+    return received
+
+
+def _run_nodes(scenario):
+    """Runs scenario(tasks) with the nodes it starts cancelled afterwards."""
+    async def main():
+        tasks = []
+        try:
+            await scenario(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def _sweep(i: int, symbol: str = "BTCUSDT") -> LiquidityEvent:
+    return LiquidityEvent(event_type="LIQUIDITY_SWEPT", symbol=symbol, sweep_data={'i': i})
+
+
+def test_broker_routes_only_to_matching_subscribers():
+    async def scenario(tasks):
+        broker = await _start_broker()
+        subscriber, publisher = _node(broker.port), _node(broker.port)
+        received = await _subscriber(subscriber, "LIQUIDITY_SWEPT.*")
+        tasks += [asyncio.create_task(subscriber.process_events()), asyncio.create_task(publisher.process_events())]
+        await _wait_for(lambda: publisher._has_remote_interest(SWEPT))
+
+        await publisher.publish(_sweep(1))
+        await publisher.publish(_sweep(2, "ETHUSDT"))
+        await publisher.publish(LiquidityEvent(event_type="NEW_POOL_DETECTED", symbol="BTCUSDT"))
+        await _wait_for(lambda: len(received) == 2)
+        await asyncio.sleep(0.1)
+
+        assert [(e.symbol, e.sweep_data['i']) for e in received] == [("BTCUSDT", 1), ("ETHUSDT", 2)]
+        assert broker.events_routed == 2
+        await broker.close()
+
+    _run_nodes(scenario)
+
+
+def test_pipelined_frames_are_acked_and_delivered_in_order():
+    async def scenario(tasks):
+        broker = await _start_broker()
+        subscriber = _node(broker.port)
+        publisher = _node(broker.port, max_batch=10, max_inflight=2)
+        received = await _subscriber(subscriber, SWEPT)
+        tasks += [asyncio.create_task(subscriber.process_events()), asyncio.create_task(publisher.process_events())]
+        await _wait_for(lambda: publisher._has_remote_interest(SWEPT))
+
+        for i in range(500):
+            await publisher.publish(_sweep(i))
+        await _wait_for(lambda: len(received) == 500)
+
+        assert [e.sweep_data['i'] for e in received] == list(range(500))
+        stats = publisher.remote_stats()
+        assert stats['inflight'] == 0 and stats['spilled'] == 0 and stats['dropped'] == 0
+        assert stats['frames_sent'] >= 50
+        await broker.close()
+
+    _run_nodes(scenario)
+
+
+def test_unreachable_broker_spills_without_blocking_publishers():
+    async def scenario(tasks):
+        broker = await _start_broker()
+        subscriber = _node(broker.port)
+        publisher = _node(broker.port, max_batch=1, max_inflight=2, max_spill=10)
+        await _subscriber(subscriber, SWEPT)
+        tasks += [asyncio.create_task(subscriber.process_events()), asyncio.create_task(publisher.process_events())]
+        await _wait_for(lambda: publisher._has_remote_interest(SWEPT))
+        await broker.close()
+        await _wait_for(lambda: not publisher.is_connected)
+
+        started = time.monotonic()
+        for i in range(100):
+            await publisher.publish(_sweep(i))
+        await asyncio.sleep(0)
+        assert time.monotonic() - started < 1.0
+
+        stats = publisher.remote_stats()
+        assert stats['spilled'] == 10
+        assert stats['dropped'] == 100 - 10 - stats['inflight']
+
+    _run_nodes(scenario)
+
+
+def test_events_published_while_broker_restarts_reach_subscribers():
+    async def scenario(tasks):
+        broker = await _start_broker()
+        port = broker.port
+        # 구독자가 발행자보다 늦게 재연결되는 경우
+        subscriber, publisher = _node(port, reconnect_delay=0.3), _node(port)
+        received = await _subscriber(subscriber, SWEPT)
+        tasks += [asyncio.create_task(subscriber.process_events()), asyncio.create_task(publisher.process_events())]
+        await _wait_for(lambda: publisher._has_remote_interest(SWEPT))
+
+        await broker.close()
+        await _wait_for(lambda: not publisher.is_connected and not subscriber.is_connected)
+        for i in range(5):
+            await publisher.publish(_sweep(i))
+
+        # 새 브로커는 구독이 없는 채로 시작 - 재구독 유예 동안 재전송 프레임을 보류
+        broker = await _start_broker(port, grace=1.0)
+        await _wait_for(lambda: len(received) == 5)
+
+        assert [e.sweep_data['i'] for e in received] == list(range(5))
+        assert publisher.remote_stats()['inflight'] == 0
+        await broker.close()
+
+    _run_nodes(scenario)
@@ -0,0 +1,54 @@
+import asyncio
+
+from domain.events.EventPriority import EventPriority
+from infrastructure.messaging.EventBus import AsyncEventBus
+
+
+class _Event:
+    def __init__(self, event_type: str, priority: int):
+        self.event_type = event_type
+        self.priority = priority
+
+
+def test_order_event_overtakes_analytics_backlog():
+    subscribers, backlog = 20, 200
+    delivered = []
+
+    async def scenario():
+        bus = AsyncEventBus()
+        order_seen = asyncio.Event()
+
+        def analytics_handler(i):
+            async def handle(event):
+                # 중단 없이 CPU 작업만 하는 핸들러
+                sum(range(2000))
+                delivered.append(i)
+            handle.__name__ = f"analytics_{i}"
+            return handle
+
+        async def on_order(event):
+            delivered.append("order")
+            order_seen.set()
+
+        for i in range(subscribers):
+            await bus.subscribe("ZONE_TOUCHED", analytics_handler(i), maxsize=backlog)
+        await bus.subscribe("ORDER_FILLED", on_order)
+
+        runner = asyncio.create_task(bus.process_events())
+        await asyncio.sleep(0)
+        for _ in range(backlog):
+            await bus.publish(_Event("ZONE_TOUCHED", EventPriority.ANALYTICS))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        await bus.publish(_Event("ORDER_FILLED", EventPriority.EXECUTION))
+        await asyncio.wait_for(order_seen.wait(), 5)
+
+        bus.stop()
+        await runner
+
+    asyncio.run(scenario())
+
+    before_order = delivered.index("order")
+    # 주문 이벤트는 구독자마다 쌓인 분석 백로그 전체를 기다리지 않음
+    assert 0 < before_order < 2 * subscribers
+    assert before_order < subscribers * backlog // 10
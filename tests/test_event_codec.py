@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+
+from domain.entities.ZoneRecords import FairValueGapRecord, LiquidityPoolRecord, OrderBlockRecord
+from domain.events.FVGEvent import FVGEvent
+from domain.events.KillZoneEvent import KillZoneEvent
+from domain.events.LiquidityEvent import LiquidityEvent
+from domain.events.MacroTimeEvent import MacroTimeEvent
+from domain.events.MarketEvents import MarketStructureEvent
+from domain.events.OrderBlockEvent import OrderBlockEvent
+from domain.events.OrderEvent import OrderEvent
+from domain.events.RiskEvent import RiskEvent
+from domain.events.TimeBasedSignalEvent import TimeBasedSignalEvent
+from infrastructure.messaging.EventCodec import CodecError, create_default_registry, default_registry
+
+MOMENT = datetime.datetime(2026, 10, 17, 9, 30, 15, 250000)
+
+EVENTS = [
+    FVGEvent("FVG_PARTIAL_FILL", FairValueGapRecord(7, 101.5, 100.25, 1760000000.0, 0.4, False, "BTCUSDT", "5m"),
+             "BTCUSDT", "5m", 0.4, 1760000100.5),
+    FVGEvent("NEW_FVG_DETECTED", None, "ETHUSDT", "1m", 0.0, 1760000000.0),
+    OrderBlockEvent("BLOCK_TOUCHED",
+                    OrderBlockRecord(2 ** 63 + 5, 99.5, 98.75, "BULLISH", 1760000000.0, 0.3, 2, False, "BTCUSDT", "15m"),
+                    {'touch_price': 99.0}, "BTCUSDT", "15m", 1760000200.0),
+    LiquidityEvent("LIQUIDITY_SWEPT", LiquidityPoolRecord(11, 250.5, "BSL", 0.8, True, "SOLUSDT"),
+                   None, {'sweep_price': 251.0}, "SOLUSDT", 1760000300.0),
+    LiquidityEvent("HIGH_CORRELATION_DETECTED", None,
+                   {'mode': 'returns', 'pairs': [{'pair': ["A", "B"], 'correlation': 0.9}]}, None, "", 1.0),
+    MarketStructureEvent("BTCUSDT", "1h", "BOS_DETECTED", {'price': 101.0, 'direction': "bullish"}, 1760000400.0),
+    OrderEvent("ORDER_FILLED", "BTCUSDT", "order-1", {'qty': 0.5}, 1760000500.0),
+    RiskEvent("EMERGENCY_CLOSE", "", {'reason': "limit"}, 1760000600.0),
+    KillZoneEvent("ZONE_STATE_CHANGE", "london", {'active': True}, MOMENT),
+    KillZoneEvent("ZONE_STATE_CHANGE", "ny", "inactive", MOMENT.replace(tzinfo=datetime.timezone.utc)),
+    MacroTimeEvent("MACRO_CYCLE_UPDATE", {'phase': 2}, {'score': 0.75}, MOMENT),
+    TimeBasedSignalEvent("HIGH_PROBABILITY_TIME", {'suitability': 0.9}, MOMENT),
+]
+
+
+@pytest.mark.parametrize("event", EVENTS, ids=lambda e: f"{type(e).__name__}-{e.event_type}")
+def test_round_trip(event):
+    assert default_registry.decode(default_registry.encode(event)) == event
+
+
+def test_every_registered_schema_is_covered():
+    registry = create_default_registry()
+    assert set(registry._by_class) == {type(event) for event in EVENTS}
+
+
+def test_back_to_back_records_decode_in_order():
+    assert list(default_registry.iter_decode(default_registry.encode_many(EVENTS))) == EVENTS
+
+
+@pytest.mark.parametrize("event", [
+    LiquidityEvent(event_type="X" * 70000),
+    OrderBlockEvent("BLOCK_TOUCHED", OrderBlockRecord(-1, 1.0, 0.5, "BULLISH", 0.0)),
+    FVGEvent("NEW_FVG_DETECTED", FairValueGapRecord(2 ** 64, 1.0, 0.5, 0.0)),
+    OrderEvent("ORDER_FILLED", symbol=None),
+    object(),
+], ids=["long-string", "negative-id", "id-overflow", "non-string-field", "unregistered"])
+def test_unencodable_events_raise_codec_error(event):
+    with pytest.raises(CodecError):
+        default_registry.encode(event)
@@ -0,0 +1,68 @@
+import asyncio
+
+import numpy as np
+
+from application.orchestration.AsyncTradingOrchestrator import AsyncTradingOrchestrator
+from domain.services.Timeframe import timeframe_seconds
+from infrastructure.binance.KlineBackfill import (PAGE_LIMIT, BinanceRestClient, KlineBackfill,
+                                                  RequestWeightLimiter)
+from infrastructure.binance.MockBinanceServer import MockBinanceServer
+
+
+def _fetch(server: MockBinanceServer, limiter: RequestWeightLimiter, bars: int):
+    async def scenario():
+        client = BinanceRestClient(server.url, limiter)
+        try:
+            windows = await KlineBackfill(client).fetch(["BTCUSDT"], ["1m"], bars)
+        finally:
+            client.close()
+        return windows[("BTCUSDT", "1m")], client.requests
+
+    return asyncio.run(scenario())
+
+
+def test_backfill_pages_long_ranges():
+    server = MockBinanceServer(latency=0.0).start()
+    try:
+        bars = 2 * PAGE_LIMIT + 500
+        candles, requests = _fetch(server, RequestWeightLimiter(), bars)
+    finally:
+        server.stop()
+
+    assert requests == 3
+    assert len(candles) == bars
+    # 페이지 경계에서 빠지거나 겹치는 봉 없이 연속
+    assert np.all(np.diff(candles.timestamp) == timeframe_seconds("1m") * 1000)
+
+
+def test_backfill_waits_out_the_weight_limit():
+    server = MockBinanceServer(latency=0.0).start()
+    # 분당 두 요청분의 가중치만 허용하는 짧은 창
+    limiter = RequestWeightLimiter(limit=4, window=0.2)
+    try:
+        candles, requests = _fetch(server, limiter, 4 * PAGE_LIMIT)
+    finally:
+        server.stop()
+
+    assert requests == 4
+    assert len(candles) == 4 * PAGE_LIMIT
+    assert limiter.waits > 0
+    assert server.rejected == 0
+
+
+def test_orchestrator_seeds_detectors_from_backfill():
+    server = MockBinanceServer(latency=0.0).start()
+    orchestrator = AsyncTradingOrchestrator(symbols=["BTCUSDT"], order_block_timeframes=["5m"],
+                                            fvg_timeframes=["5m"], structure_timeframes=["5m"],
+                                            rest_url=server.url, backfill_bars=300)
+    try:
+        asyncio.run(orchestrator._backfill_history())
+    finally:
+        orchestrator.backfill.client.close()
+        server.stop()
+
+    history = orchestrator.market_data_hub.candle_history("BTCUSDT", "5m")
+    assert len(history) == 300
+    engine = orchestrator.market_structure_detector.market_structure.engines[("BTCUSDT", "5m")]
+    assert engine.last_timestamp * 1000 == history.last_timestamp
+    assert len(orchestrator.market_data_hub.candle_history("BTCUSDT", "1m")) == 300
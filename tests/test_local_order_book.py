@@ -0,0 +1,55 @@
+import asyncio
+
+from domain.ports.OrderBook import BookSide
+from infrastructure.binance.LocalOrderBook import OrderBookManager, _BookSide
+from infrastructure.replay.DepthRecording import DepthReplay, synthetic_depth
+
+SYMBOL = "BTCUSDT"
+
+
+def _replay(drop_every: int, diffs: int = 3000):
+    async def scenario():
+        replay = DepthReplay({SYMBOL: synthetic_depth(SYMBOL, diffs, levels=200)}, drop_every=drop_every)
+        manager = OrderBookManager(replay.fetch_snapshot, replay.source, resync_delay=0.0)
+        book = manager.track(SYMBOL)
+        await replay.finished(SYMBOL)
+        while not book.synced:
+            await asyncio.sleep(0)
+        await manager.close()
+        return replay, book
+
+    return asyncio.run(scenario())
+
+
+def test_book_resyncs_after_forced_gaps_and_matches_the_reference():
+    replay, book = _replay(drop_every=500)
+    assert replay.dropped == 5
+    assert book.gaps == replay.dropped
+    assert book.snapshots == replay.snapshots_served == 1 + replay.dropped
+
+    expected = replay.reference(SYMBOL)
+    assert book.levels(BookSide.BID) == expected[BookSide.BID]
+    assert book.levels(BookSide.ASK) == expected[BookSide.ASK]
+
+
+def test_size_between_matches_a_sum_over_the_reference_levels():
+    replay, book = _replay(drop_every=0)
+    assert book.gaps == 0 and book.snapshots == 1
+    for side, levels in replay.reference(SYMBOL).items():
+        ticks = [tick for tick, _ in levels]
+        for low, high in ((ticks[0], ticks[-1]), (ticks[10], ticks[60]), (ticks[5] + 1, ticks[5] + 1),
+                          (ticks[-1] + 1, ticks[-1] + 100)):
+            expected = sum(size for tick, size in levels if low <= tick <= high)
+            assert abs(book.size_between(side, low, high) - expected) < 1e-9
+
+
+def test_book_side_keeps_range_sums_across_resizes_inserts_and_deletes():
+    side = _BookSide()
+    side.load([(10, 1.0), (20, 2.0), (30, 3.0)])
+    assert side.size_between(10, 30) == 6.0
+    side.set(20, 5.0)
+    assert side.size_between(15, 25) == 5.0
+    side.set(25, 0.5)
+    side.set(10, 0.0)
+    assert side.size_between(0, 100) == 8.5
+    assert side.size_between(11, 19) == 0.0
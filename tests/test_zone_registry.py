@@ -0,0 +1,83 @@
+import asyncio
+
+from application.analysis.AsyncZoneMonitor import AsyncZoneMonitor
+from domain.entities.MarketData import Candle
+from domain.entities.OrderBlock import AsyncOrderBlock, OrderBlockType
+from domain.entities.ZoneLifecycle import ZoneLifecycle
+from domain.ports.MarketDataFeed import MarketDataFeed
+from domain.services.ColumnarRingBuffer import CandleRingBuffer
+from domain.services.ZoneRegistry import ZoneRegistry
+
+SYMBOL = "BTCUSDT"
+
+
+class _RecordingBus:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event, coalesce_key=None):
+        self.events.append(event)
+
+
+class _IdleFeed(MarketDataFeed):
+    async def stream(self, symbol, stream_type):
+        await asyncio.get_running_loop().create_future()
+        yield
+
+    def candle_history(self, symbol, timeframe):
+        return CandleRingBuffer()
+
+
+def _block(bus, timestamp: float, block_type: str = OrderBlockType.BULLISH) -> AsyncOrderBlock:
+    return AsyncOrderBlock(Candle(high=101.0, low=100.0, timestamp=timestamp), block_type, bus, SYMBOL, "5m")
+
+
+def test_closed_zones_are_archived_on_the_next_add():
+    registry = ZoneRegistry(max_zones=10)
+    first, second = _block(None, 1.0), _block(None, 2.0)
+    registry.add(first, 1.0)
+    registry.add(second, 2.0)
+
+    first.lifecycle = ZoneLifecycle.INVALIDATED
+    registry.close(first)
+    registry.add(_block(None, 3.0), 3.0)
+
+    assert first.entity_id not in registry and second.entity_id in registry
+    assert registry.archive.counts() == {ZoneLifecycle.INVALIDATED: 1}
+    assert registry.archive.rows()['closed_at'].tolist() == [3.0]
+
+
+def test_oldest_zones_expire_past_the_caps():
+    registry = ZoneRegistry(max_zones=2, max_age=100.0)
+    blocks = [_block(None, float(t)) for t in (1, 2, 3)]
+    expired = [zone for block in blocks for zone in registry.add(block, block.creation_time)]
+    assert expired == [blocks[0]] and blocks[0].lifecycle == ZoneLifecycle.EXPIRED
+
+    late = _block(None, 150.0)
+    assert registry.add(late, 150.0) == [blocks[1], blocks[2]]
+    assert registry.zones() == [late]
+    assert registry.archive.counts() == {ZoneLifecycle.EXPIRED: 3}
+
+
+def test_broken_order_block_is_invalidated_and_leaves_the_registry():
+    async def scenario():
+        bus = _RecordingBus()
+        monitor = AsyncZoneMonitor(_IdleFeed())
+        registry = ZoneRegistry()
+        bullish, bearish = _block(bus, 1.0), _block(bus, 2.0, OrderBlockType.BEARISH)
+        for block in (bullish, bearish):
+            await monitor.register(SYMBOL, block, registry.close)
+            registry.add(block, block.creation_time)
+
+        await monitor.on_price(SYMBOL, 100.5)
+        await monitor.on_price(SYMBOL, 99.0)
+        registry.evict(3.0)
+        await monitor.stop()
+        return bus.events, bullish, bearish, registry, monitor
+
+    events, bullish, bearish, registry, monitor = asyncio.run(scenario())
+    assert bullish.lifecycle == ZoneLifecycle.INVALIDATED and bullish.is_invalidated
+    assert bearish.is_active
+    assert [event.event_type for event in events][-1] == "BLOCK_INVALIDATED"
+    assert registry.zones() == [bearish]
+    assert monitor.zone_count(SYMBOL) == 1